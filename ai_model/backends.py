@@ -0,0 +1,245 @@
+"""
+FarmX - Detector Backends
+Author: Parth Vishwakarma
+
+Purpose:
+- One detector interface for PyTorch (ultralytics) and ONNX Runtime models
+- ONNX path needs only numpy, cv2 and onnxruntime (no torch at runtime)
+- Shared letterbox pre-processing (also used for INT8 calibration)
+"""
+
+import time
+from typing import List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from ai_model.detector import (
+    COL_BOX,
+    COL_CLS,
+    COL_CONF,
+    COL_IMAGE,
+    CONF_THRESHOLD,
+    DETECTION_COLUMNS
+)
+
+# =========================
+# CONFIG
+# =========================
+IMGSZ = 640                 # export / training input size (args.yaml)
+IOU_THRESHOLD = 0.7         # ultralytics default NMS IoU
+MAX_DETECTIONS = 300
+PAD_VALUE = 114             # letterbox border (ultralytics convention)
+
+# ONNX Runtime execution providers, in order of preference.
+# "OpenVINOExecutionProvider" runs the same model on Intel CPUs / iGPUs.
+ONNX_PROVIDERS = ("CPUExecutionProvider",)
+ONNX_THREADS = 0            # 0 = onnxruntime default (all cores)
+
+# =========================
+# PRE-PROCESSING
+# =========================
+def letterbox(frame: np.ndarray, imgsz: int = IMGSZ) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resizes a BGR frame into an imgsz x imgsz square keeping aspect ratio.
+    Returns (image, scale, (pad_x, pad_y)).
+    """
+
+    height, width = frame.shape[:2]
+    scale = min(imgsz / width, imgsz / height)
+    new_w, new_h = int(round(width * scale)), int(round(height * scale))
+
+    pad_x, pad_y = (imgsz - new_w) // 2, (imgsz - new_h) // 2
+    canvas = np.full((imgsz, imgsz, 3), PAD_VALUE, dtype=np.uint8)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(
+        frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR
+    )
+
+    return canvas, scale, (pad_x, pad_y)
+
+
+def to_tensor(images: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    (B, H, W, 3) BGR uint8 → (B, 3, H, W) RGB float32 in [0, 1].
+    """
+
+    batch = np.stack(images)[..., ::-1].transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(batch, dtype=np.float32) / 255.0
+
+# =========================
+# POST-PROCESSING
+# =========================
+def decode_output(
+    output: np.ndarray,
+    conf: float = CONF_THRESHOLD,
+    iou: float = IOU_THRESHOLD,
+    max_det: int = MAX_DETECTIONS
+) -> np.ndarray:
+    """
+    YOLOv8/11 head output for one image, (4 + classes, anchors), to
+    (N, 6) rows of (cls, conf, x1, y1, x2, y2) in letterbox pixels.
+    """
+
+    preds = output.T
+    scores = preds[:, 4:]
+    cls = scores.argmax(axis=1)
+    best = scores[np.arange(len(scores)), cls]
+
+    keep = best >= conf
+    if not keep.any():
+        return np.empty((0, 6), dtype=np.float32)
+
+    xywh = preds[keep, :4]
+    cls, best = cls[keep], best[keep]
+
+    # Class-aware NMS
+    corner = np.column_stack([xywh[:, 0] - xywh[:, 2] / 2, xywh[:, 1] - xywh[:, 3] / 2, xywh[:, 2:]])
+    idx = cv2.dnn.NMSBoxesBatched(
+        corner.tolist(), best.tolist(), cls.tolist(), conf, iou, top_k=max_det
+    )
+    idx = np.asarray(idx, dtype=np.int64).reshape(-1)[:max_det]
+
+    rows = np.empty((len(idx), 6), dtype=np.float32)
+    rows[:, 0] = cls[idx]
+    rows[:, 1] = best[idx]
+    rows[:, 2:4] = corner[idx, :2]
+    rows[:, 4:6] = corner[idx, :2] + xywh[idx, 2:]
+
+    return rows
+
+# =========================
+# BACKENDS
+# =========================
+class DetectorBackend:
+    """
+    infer(frames, conf) → (N, 7) rows in DETECTION_COLUMNS order,
+    image index counted from 0 within the call.
+    """
+
+    name = "base"
+
+    def infer(self, frames: List[np.ndarray], conf: float = CONF_THRESHOLD) -> np.ndarray:
+        raise NotImplementedError
+
+
+class UltralyticsBackend(DetectorBackend):
+    """
+    PyTorch eager inference through ultralytics (the original path).
+    """
+
+    name = "torch"
+
+    def __init__(self, model_path: str):
+        from ultralytics import YOLO
+        self.model = YOLO(model_path)
+
+    def infer(self, frames: List[np.ndarray], conf: float = CONF_THRESHOLD) -> np.ndarray:
+        from ai_model.detector import detect_batch
+        return detect_batch(self.model, frames, conf=conf)
+
+
+class OnnxBackend(DetectorBackend):
+    """
+    ONNX Runtime inference (FP32 or INT8 QDQ models) without torch.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        onnx_path: str,
+        providers: Sequence[str] = ONNX_PROVIDERS,
+        threads: int = ONNX_THREADS,
+        iou: float = IOU_THRESHOLD
+    ):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        available = set(ort.get_available_providers())
+        chosen = [p for p in providers if p in available] or ["CPUExecutionProvider"]
+
+        self.session = ort.InferenceSession(onnx_path, options, providers=chosen)
+        self.input = self.session.get_inputs()[0]
+        self.iou = iou
+
+        shape = self.input.shape
+        self.imgsz = shape[2] if isinstance(shape[2], int) else IMGSZ
+        self.fixed_batch = shape[0] if isinstance(shape[0], int) else None
+
+        print(f"[INFO] ONNX model loaded: {onnx_path} ({', '.join(chosen)})")
+
+    def _run(self, tensor: np.ndarray) -> np.ndarray:
+        if self.fixed_batch == 1 and len(tensor) > 1:
+            return np.concatenate([self._run(tensor[i:i + 1]) for i in range(len(tensor))])
+        return self.session.run(None, {self.input.name: tensor})[0]
+
+    def infer(self, frames: List[np.ndarray], conf: float = CONF_THRESHOLD) -> np.ndarray:
+        boxed = [letterbox(frame, self.imgsz) for frame in frames]
+        outputs = self._run(to_tensor([image for image, _, _ in boxed]))
+
+        per_image = []
+        for idx, (output, (_, scale, (pad_x, pad_y))) in enumerate(zip(outputs, boxed)):
+            decoded = decode_output(output, conf, self.iou)
+            if len(decoded) == 0:
+                continue
+
+            height, width = frames[idx].shape[:2]
+            rows = np.empty((len(decoded), len(DETECTION_COLUMNS)), dtype=np.float32)
+            rows[:, COL_IMAGE] = idx
+            rows[:, COL_CLS] = decoded[:, 0]
+            rows[:, COL_CONF] = decoded[:, 1]
+
+            # Letterbox pixels → frame pixels
+            boxes = (decoded[:, 2:] - [pad_x, pad_y, pad_x, pad_y]) / scale
+            np.clip(boxes, 0, [width, height, width, height], out=boxes)
+            rows[:, COL_BOX] = boxes
+            per_image.append(rows)
+
+        if not per_image:
+            return np.empty((0, len(DETECTION_COLUMNS)), dtype=np.float32)
+
+        return np.concatenate(per_image)
+
+
+def load_backend(model_path: str, **kwargs) -> DetectorBackend:
+    """
+    Picks the backend from the file extension (.pt → torch, .onnx → onnx).
+    """
+
+    if model_path.endswith(".onnx"):
+        return OnnxBackend(model_path, **kwargs)
+    return UltralyticsBackend(model_path)
+
+
+def timed_load(model_path: str) -> Tuple[DetectorBackend, float]:
+    """
+    Loads a backend and returns it with the load time in seconds
+    (includes the framework import on first use).
+    """
+
+    start = time.perf_counter()
+    backend = load_backend(model_path)
+    return backend, time.perf_counter() - start
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Detector Backends")
+
+    frame = np.zeros((576, 1024, 3), dtype=np.uint8)
+    image, scale, pad = letterbox(frame)
+    print(f"Letterbox: {frame.shape} → {image.shape}, scale {scale:.3f}, pad {pad}")
+
+    # Fake head output: two overlapping class-0 boxes and one class-2 box
+    output = np.zeros((4 + 3, 3), dtype=np.float32)
+    output[:4] = np.array([[100, 100, 40, 40], [102, 101, 40, 40], [300, 300, 20, 20]]).T
+    output[4, :2] = [0.9, 0.8]
+    output[6, 2] = 0.7
+    print("Decoded:", decode_output(output).round(1).tolist())
+
+    print("[DONE] Backends test complete")
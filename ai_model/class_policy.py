@@ -0,0 +1,182 @@
+"""
+FarmX - Class Policy
+Author: Parth Vishwakarma
+
+Purpose:
+- Decide per detected class whether to spray it and for how long
+- Filter a whole detection array in one vectorized step
+- Count detections and herbicide dose per class over a mission
+"""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from ai_model.detector import COL_CLS, DETECTION_COLUMNS
+from ai_model.labels import CLASS_NAMES
+
+# =========================
+# CONFIG
+# =========================
+class ClassAction(NamedTuple):
+    spray: bool             # False = ignore (e.g. crop)
+    spray_time: float       # seconds of spray per target cell
+
+
+CLASS_POLICY: Dict[int, ClassAction] = {
+    0: ClassAction(True, 0.4),      # BroWeed: broadleaf, full dose
+    1: ClassAction(False, 0.0),     # Maize: crop, never spray
+    2: ClassAction(True, 0.3),      # NarWeed: narrow-leaf, lighter dose
+}
+
+# =========================
+# POLICY LOOKUP
+# =========================
+def policy_table(policy: Dict[int, ClassAction] = CLASS_POLICY, num_classes: int = len(CLASS_NAMES)):
+    """
+    Per-class lookup arrays (spray mask, spray time).
+    Classes missing from the policy are ignored.
+    """
+
+    size = max(num_classes, max(policy, default=-1) + 1)
+    spray = np.zeros(size, dtype=bool)
+    spray_time = np.zeros(size, dtype=np.float32)
+
+    for cls, action in policy.items():
+        spray[cls] = action.spray
+        spray_time[cls] = action.spray_time if action.spray else 0.0
+
+    return spray, spray_time
+
+
+class PolicyResult(NamedTuple):
+    targets: np.ndarray         # (M, 7) detection rows to spray
+    spray_time: np.ndarray      # (M,) seconds per target row
+    counts: np.ndarray          # (C,) detections per class (sprayed or not)
+    dose: np.ndarray            # (C,) total spray seconds per class
+
+
+def apply_policy(
+    detections: np.ndarray,
+    policy: Dict[int, ClassAction] = CLASS_POLICY
+) -> PolicyResult:
+    """
+    Applies the class policy to an (N, 7) detection array in one pass.
+    """
+
+    spray, spray_time = policy_table(policy)
+
+    classes = detections[:, COL_CLS].astype(np.int64)
+    known = (classes >= 0) & (classes < len(spray))
+    classes = np.where(known, classes, 0)
+
+    keep = known & spray[classes]
+    times = spray_time[classes[keep]]
+
+    counts = np.bincount(classes[known], minlength=len(spray))
+    dose = np.bincount(classes[keep], weights=times, minlength=len(spray))
+
+    return PolicyResult(detections[keep], times, counts, dose)
+
+
+def empty_result(policy: Dict[int, ClassAction] = CLASS_POLICY) -> PolicyResult:
+    size = len(policy_table(policy)[0])
+    return PolicyResult(
+        np.empty((0, len(DETECTION_COLUMNS)), dtype=np.float32),
+        np.empty(0, dtype=np.float32),
+        np.zeros(size, dtype=np.int64),
+        np.zeros(size, dtype=np.float64)
+    )
+
+# =========================
+# DOSE GROUPS
+# =========================
+def merge_cells(cells: np.ndarray, spray_time: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unique grid cells (K, 2) and their spray times (K,), in first-seen order.
+    A cell hit by several classes gets the longest spray time.
+    """
+
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    spray_time = np.asarray(spray_time, dtype=np.float32).reshape(-1)
+    if len(cells) == 0:
+        return cells, spray_time
+
+    # Longest time first, then keep the first occurrence of each cell
+    order = np.argsort(-spray_time, kind="stable")
+    keys = cells[order, 0] * 65536 + cells[order, 1]
+    _, first = np.unique(keys, return_index=True)
+    chosen = np.sort(order[first])
+
+    return cells[chosen], spray_time[chosen]
+
+
+def group_by_dose(cells: np.ndarray, spray_time: np.ndarray) -> Dict[float, List[tuple]]:
+    """
+    Unique grid cells grouped by spray time, {seconds: [(gx, gy), ...]}.
+    A cell hit by several classes gets the longest spray time.
+    """
+
+    cells, spray_time = merge_cells(cells, spray_time)
+
+    groups: Dict[float, List[tuple]] = {}
+    for t in np.unique(spray_time)[::-1]:
+        groups[float(t)] = [tuple(cell) for cell in cells[spray_time == t].tolist()]
+
+    return groups
+
+# =========================
+# MISSION TALLY
+# =========================
+class PolicyTally:
+    """
+    Running per-class detection counts and spray seconds.
+    """
+
+    def __init__(self, names: Sequence[str] = CLASS_NAMES):
+        self.names = list(names)
+        self.counts = np.zeros(len(self.names), dtype=np.int64)
+        self.dose = np.zeros(len(self.names), dtype=np.float64)
+
+    def update(self, result: PolicyResult):
+        size = min(len(self.names), len(result.counts))
+        self.counts[:size] += result.counts[:size]
+        self.dose[:size] += result.dose[:size]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"count": int(count), "spray_seconds": round(float(dose), 3)}
+            for name, count, dose in zip(self.names, self.counts, self.dose)
+        }
+
+    def print_summary(self):
+        print("[INFO] Detections per class:")
+        for name, stats in self.summary().items():
+            print(f"   {name:10} {stats['count']:6d} detected, {stats['spray_seconds']:.2f} s spray")
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Class Policy")
+
+    detections = np.array([
+        [0, 0, 0.90, 10, 10, 20, 20],
+        [0, 1, 0.95, 30, 30, 90, 90],
+        [0, 2, 0.70, 12, 12, 18, 18],
+        [0, 2, 0.80, 200, 150, 210, 160],
+    ], dtype=np.float32)
+
+    result = apply_policy(detections)
+    print(f"Spray {len(result.targets)} of {len(detections)} detections, times {result.spray_time.tolist()}")
+
+    tally = PolicyTally()
+    tally.update(result)
+    tally.print_summary()
+
+    cells = np.array([(4, 4), (44, 44), (4, 4), (80, 60)])
+    merged, times = merge_cells(cells, [0.4, 0.4, 0.3, 0.3])
+    print("Merged cells:", merged.tolist(), "times:", [round(float(t), 2) for t in times])
+    print("Dose groups:", group_by_dose(cells, [0.4, 0.4, 0.3, 0.3]))
+
+    print("[DONE] Class policy test complete")
@@ -0,0 +1,296 @@
+"""
+FarmX - Dataset Cache
+Author: Parth Vishwakarma
+
+Purpose:
+- Convert a Roboflow split (images + YOLO polygon labels) into a compact
+  memory-mapped store: resized uint8 images plus packed label arrays
+- Zero-copy reads for training, validation and evaluation scripts
+- Incremental: re-running only decodes images that are not cached yet
+
+Layout (one folder per split):
+    images.u8     (N, H, W, 3) uint8, resized to CACHE_WIDTH x CACHE_HEIGHT
+    frames.i64    (N, 4) object start, object count, original width, height
+    objects.i64   (M, 3) class, point start, point count
+    points.f32    (P, 2) normalized polygon vertices (x, y)
+    manifest.json names, sizes and record counts (written last)
+
+Usage:
+    python -m ai_model.dataset_cache train valid test
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from ai_model.labels import DATASET_DIR, label_path_for, read_polygons
+
+# =========================
+# CONFIG
+# =========================
+CACHE_DIR = "ai_model/dataset_cache"
+CACHE_WIDTH = 640           # model imgsz; 16:9 frames keep their aspect
+CACHE_HEIGHT = 360
+DECODE_WORKERS = 8          # cv2 decodes in parallel (releases the GIL)
+CHUNK_SIZE = 64             # images decoded and appended per step
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+_FILES = {
+    "images": ("images.u8", np.uint8),
+    "frames": ("frames.i64", "<i8"),
+    "objects": ("objects.i64", "<i8"),
+    "points": ("points.f32", "<f4"),
+}
+
+# =========================
+# WRITING
+# =========================
+def _read_manifest(cache_path: str) -> Dict:
+    path = os.path.join(cache_path, "manifest.json")
+    if not os.path.exists(path):
+        return {
+            "image_size": [CACHE_WIDTH, CACHE_HEIGHT],
+            "names": [], "sources": {},
+            "counts": {"frames": 0, "objects": 0, "points": 0}
+        }
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(cache_path: str, manifest: Dict):
+    path = os.path.join(cache_path, "manifest.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def _truncate(cache_path: str, manifest: Dict):
+    """
+    Drops bytes appended after the last manifest write (interrupted run).
+    """
+
+    width, height = manifest["image_size"]
+    counts = manifest["counts"]
+    sizes = {
+        "images": counts["frames"] * height * width * 3,
+        "frames": counts["frames"] * 4 * 8,
+        "objects": counts["objects"] * 3 * 8,
+        "points": counts["points"] * 2 * 4,
+    }
+
+    for key, (name, _) in _FILES.items():
+        path = os.path.join(cache_path, name)
+        if os.path.exists(path) and os.path.getsize(path) > sizes[key]:
+            with open(path, "r+b") as f:
+                f.truncate(sizes[key])
+
+
+def _load_item(path: str, size: Tuple[int, int]):
+    image = cv2.imread(path)
+    if image is None:
+        return None
+
+    height, width = image.shape[:2]
+    resized = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    classes, polygons = read_polygons(label_path_for(path))
+
+    return resized, width, height, classes, polygons
+
+
+def build_cache(
+    split: str,
+    dataset_dir: str = DATASET_DIR,
+    cache_dir: str = CACHE_DIR,
+    rebuild: bool = False,
+    workers: int = DECODE_WORKERS
+) -> int:
+    """
+    Adds every image of `split` not cached yet. Returns the number added.
+    """
+
+    image_dir = os.path.join(dataset_dir, split, "images")
+    cache_path = os.path.join(cache_dir, split)
+    os.makedirs(cache_path, exist_ok=True)
+
+    if rebuild:
+        for name, _ in _FILES.values():
+            path = os.path.join(cache_path, name)
+            if os.path.exists(path):
+                os.remove(path)
+        manifest_path = os.path.join(cache_path, "manifest.json")
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+    manifest = _read_manifest(cache_path)
+    _truncate(cache_path, manifest)
+
+    size = tuple(manifest["image_size"])
+    sources = manifest["sources"]
+
+    names = sorted(n for n in os.listdir(image_dir) if n.lower().endswith(IMAGE_EXTENSIONS))
+
+    changed = []
+    for name in names:
+        if name in sources:
+            stat = os.stat(os.path.join(image_dir, name))
+            if sources[name] != [stat.st_size, stat.st_mtime_ns]:
+                changed.append(name)
+    if changed:
+        print(f"[WARNING] {len(changed)} cached image(s) changed on disk; use --rebuild to refresh")
+
+    missing = [n for n in sources if not os.path.exists(os.path.join(image_dir, n))]
+    if missing:
+        print(f"[WARNING] {len(missing)} cached image(s) no longer in {image_dir}")
+
+    new = [n for n in names if n not in sources]
+    if not new:
+        print(f"[INFO] {split}: cache up to date ({len(manifest['names'])} images)")
+        return 0
+
+    counts = manifest["counts"]
+    handles = {
+        key: open(os.path.join(cache_path, name), "ab")
+        for key, (name, _) in _FILES.items()
+    }
+
+    added = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(new), CHUNK_SIZE):
+                chunk = new[start:start + CHUNK_SIZE]
+                paths = [os.path.join(image_dir, n) for n in chunk]
+
+                for name, item in zip(chunk, pool.map(lambda p: _load_item(p, size), paths)):
+                    if item is None:
+                        print(f"[WARNING] Skipping {name} (cannot read)")
+                        continue
+
+                    image, width, height, classes, polygons = item
+                    point_counts = np.array([len(p) for p in polygons], dtype=np.int64)
+                    point_starts = counts["points"] + np.concatenate([[0], np.cumsum(point_counts)[:-1]])
+
+                    objects = np.stack(
+                        [classes, point_starts[:len(classes)], point_counts], axis=1
+                    ) if len(classes) else np.empty((0, 3), dtype=np.int64)
+                    points = np.concatenate(polygons) if polygons else np.empty((0, 2))
+
+                    handles["images"].write(np.ascontiguousarray(image).tobytes())
+                    handles["frames"].write(
+                        np.array([counts["objects"], len(classes), width, height], dtype="<i8").tobytes()
+                    )
+                    handles["objects"].write(objects.astype("<i8").tobytes())
+                    handles["points"].write(points.astype("<f4").tobytes())
+
+                    stat = os.stat(os.path.join(image_dir, name))
+                    sources[name] = [stat.st_size, stat.st_mtime_ns]
+                    manifest["names"].append(name)
+                    counts["frames"] += 1
+                    counts["objects"] += len(classes)
+                    counts["points"] += len(points)
+                    added += 1
+
+                # Commit the chunk: data first, then the manifest that counts it
+                for handle in handles.values():
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                _write_manifest(cache_path, manifest)
+                print(f"[INFO] {split}: {counts['frames']} image(s) cached")
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    return added
+
+# =========================
+# READING
+# =========================
+class DatasetCache:
+    """
+    Read-only, memory-mapped view of one cached split.
+    All accessors return views into the mapped files (no copies).
+    """
+
+    def __init__(self, split: str, cache_dir: str = CACHE_DIR):
+        self.path = os.path.join(cache_dir, split)
+        manifest = _read_manifest(self.path)
+
+        self.names: List[str] = manifest["names"]
+        self.width, self.height = manifest["image_size"]
+        counts = manifest["counts"]
+
+        def mapped(key, shape):
+            name, dtype = _FILES[key]
+            if shape[0] == 0:
+                return np.empty(shape, dtype=dtype)
+            return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=shape)
+
+        self.images = mapped("images", (counts["frames"], self.height, self.width, 3))
+        self.frames = mapped("frames", (counts["frames"], 4))
+        self.objects = mapped("objects", (counts["objects"], 3))
+        self.points = mapped("points", (counts["points"], 2))
+
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self._index[name]
+
+    def image(self, i: int) -> np.ndarray:
+        return self.images[i]
+
+    def original_size(self, i: int) -> Tuple[int, int]:
+        return int(self.frames[i, 2]), int(self.frames[i, 3])
+
+    def classes(self, i: int) -> np.ndarray:
+        start, count = self.frames[i, 0], self.frames[i, 1]
+        return self.objects[start:start + count, 0]
+
+    def polygons(self, i: int) -> List[np.ndarray]:
+        """
+        Normalized (K, 2) polygons of image i (views into points.f32).
+        """
+
+        start, count = self.frames[i, 0], self.frames[i, 1]
+        return [
+            self.points[p_start:p_start + p_count]
+            for _, p_start, p_count in self.objects[start:start + count]
+        ]
+
+    def batches(self, batch_size: int):
+        """
+        Yields (start index, (B, H, W, 3) image view) for sequential passes.
+        """
+
+        for start in range(0, len(self), batch_size):
+            yield start, self.images[start:start + batch_size]
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the memory-mapped dataset cache")
+    parser.add_argument("splits", nargs="*", default=["train", "valid", "test"])
+    parser.add_argument("--dataset", default=DATASET_DIR)
+    parser.add_argument("--out", default=CACHE_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="discard and rebuild the cache")
+    args = parser.parse_args()
+
+    print("[START] Dataset Cache")
+
+    for split in args.splits:
+        added = build_cache(split, args.dataset, args.out, args.rebuild)
+        cache = DatasetCache(split, args.out)
+        print(f"[RESULT] {split}: +{added} new, {len(cache)} total, "
+              f"{len(cache.objects)} objects, {len(cache.points)} points")
+
+    print("[DONE] Dataset cache ready")
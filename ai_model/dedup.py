@@ -0,0 +1,290 @@
+"""
+FarmX - Dataset Deduplication
+Author: Parth Vishwakarma
+
+Purpose:
+- Group the offline-augmented Roboflow variants (0004_blur_jpg, 0004_hsv_jpg, ...)
+  by source ID and perceptual hash
+- Flag groups that leak across train / valid / test
+- Emit a leak-free split (one original image per group) and an on-the-fly
+  augmentation config to replace the baked-in variants
+
+Usage:
+    python -m ai_model.dedup --out ai_model/dedup_split
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from ai_model.labels import CLASS_NAMES, DATASET_DIR
+
+# =========================
+# CONFIG
+# =========================
+SPLITS = ("train", "valid", "test")
+SPLIT_RATIOS = (0.7, 0.15, 0.15)    # train / valid / test share of groups
+SPLIT_SEED = 0
+
+HASH_DISTANCE = 5           # max dHash bits apart for one image (other sources: >= 8)
+HASH_WORKERS = os.cpu_count() or 4
+OUTPUT_DIR = "ai_model/dedup_split"
+
+# Roboflow export names: <source id>_<variant>_jpg.rf.<hash>.jpg
+# (the un-augmented original has no variant: <source id>_jpg.rf.<hash>.jpg)
+NAME_PATTERN = re.compile(r"^(?P<source>\d+)_(?:(?P<variant>[a-z]+)_)?jpg\.rf\.")
+ORIGINAL = "orig"
+
+# On-the-fly replacements for the baked-in variants (Ultralytics train args)
+AUGMENT_CONFIG = {
+    "hsv_h": 0.015,     # hsv
+    "hsv_s": 0.7,       # hsv
+    "hsv_v": 0.4,       # hsv, cont, back (brightness / contrast)
+    "fliplr": 0.5,
+    "flipud": 0.5,      # ver (nadir view: orientation is arbitrary)
+    "degrees": 10.0,
+    "translate": 0.1,
+    "scale": 0.5,
+    "mosaic": 1.0,
+    # blur, clahe and pep (noise) come from Ultralytics' built-in
+    # albumentations pipeline (Blur, MedianBlur, CLAHE, ...) when installed
+}
+
+# =========================
+# NAMES & HASHES
+# =========================
+class ImageRecord(NamedTuple):
+    split: str
+    name: str
+    source: Optional[str]
+    variant: str
+
+
+def parse_name(name: str):
+    """
+    (source id, variant) from a Roboflow export file name.
+    """
+
+    match = NAME_PATTERN.match(name)
+    if match is None:
+        return None, ORIGINAL
+
+    return match.group("source"), match.group("variant") or ORIGINAL
+
+
+def dhash(path: str) -> int:
+    """
+    64-bit difference hash: survives blur, contrast, colour and noise edits.
+    """
+
+    gray = cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if gray is None:
+        return 0
+
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming_matrix(hashes: np.ndarray, block: int = 512):
+    """
+    Yields (row start, (B, N) bit distances) blocks of the pairwise matrix.
+    """
+
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    for start in range(0, len(hashes), block):
+        xor = hashes[start:start + block, None] ^ hashes[None, :]
+        bits = np.unpackbits(xor.view(np.uint8).reshape(xor.shape + (8,)), axis=-1)
+        yield start, bits.sum(axis=-1)
+
+# =========================
+# GROUPING
+# =========================
+def _find(parent: np.ndarray, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent: np.ndarray, a: int, b: int):
+    ra, rb = _find(parent, a), _find(parent, b)
+    if ra != rb:
+        parent[max(ra, rb)] = min(ra, rb)
+
+
+def group_images(records: List[ImageRecord], hashes: np.ndarray, distance: int = HASH_DISTANCE) -> np.ndarray:
+    """
+    Group label per image: same source ID or near-identical hash.
+    """
+
+    parent = np.arange(len(records))
+
+    by_source: Dict[str, int] = {}
+    for i, record in enumerate(records):
+        if record.source is None:
+            continue
+        if record.source in by_source:
+            _union(parent, by_source[record.source], i)
+        else:
+            by_source[record.source] = i
+
+    for start, dist in hamming_matrix(hashes):
+        rows, cols = np.nonzero(dist <= distance)
+        for r, c in zip((rows + start).tolist(), cols.tolist()):
+            if r < c:
+                _union(parent, r, c)
+
+    roots = np.array([_find(parent, i) for i in range(len(records))])
+    _, labels = np.unique(roots, return_inverse=True)
+
+    return labels
+
+
+def assign_splits(num_groups: int, ratios=SPLIT_RATIOS, seed: int = SPLIT_SEED) -> np.ndarray:
+    """
+    Deterministic split index (0 train, 1 valid, 2 test) per group.
+    """
+
+    order = np.random.default_rng(seed).permutation(num_groups)
+    bounds = np.round(np.cumsum(ratios) / np.sum(ratios) * num_groups).astype(int)
+
+    split = np.empty(num_groups, dtype=np.int64)
+    split[order] = np.searchsorted(bounds, np.arange(num_groups), side="right")
+
+    return np.minimum(split, len(ratios) - 1)
+
+# =========================
+# OUTPUT
+# =========================
+def _write_list(path: str, paths: List[str]):
+    with open(path, "w") as f:
+        for p in paths:
+            f.write(os.path.abspath(p) + "\n")
+
+
+def _write_yaml(path: str, values: Dict):
+    with open(path, "w") as f:
+        for key, value in values.items():
+            if isinstance(value, dict):
+                f.write(f"{key}:\n")
+                for k, v in value.items():
+                    f.write(f"  {k}: {v}\n")
+            else:
+                f.write(f"{key}: {value}\n")
+
+
+def deduplicate(
+    dataset_dir: str = DATASET_DIR,
+    output_dir: str = OUTPUT_DIR,
+    workers: int = HASH_WORKERS,
+    keep_variants: bool = False
+) -> Dict:
+    records: List[ImageRecord] = []
+    paths: List[str] = []
+
+    for split in SPLITS:
+        image_dir = os.path.join(dataset_dir, split, "images")
+        if not os.path.isdir(image_dir):
+            continue
+        for name in sorted(os.listdir(image_dir)):
+            source, variant = parse_name(name)
+            records.append(ImageRecord(split, name, source, variant))
+            paths.append(os.path.join(image_dir, name))
+
+    print(f"[INFO] Hashing {len(paths)} image(s) on {workers} process(es)...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = np.array(list(pool.map(dhash, paths, chunksize=32)), dtype=np.uint64)
+
+    labels = group_images(records, hashes)
+    num_groups = int(labels.max()) + 1 if len(labels) else 0
+
+    # Leakage: groups present in more than one original split
+    split_index = {s: i for i, s in enumerate(SPLITS)}
+    presence = np.zeros((num_groups, len(SPLITS)), dtype=bool)
+    presence[labels, [split_index[r.split] for r in records]] = True
+    leaking = np.nonzero(presence.sum(axis=1) > 1)[0]
+    leaked_images = int(np.isin(labels, leaking).sum())
+
+    # New split: one image per group (the un-augmented original when present)
+    new_split = assign_splits(num_groups)
+    chosen: Dict[int, int] = {}
+    for i, record in enumerate(records):
+        group = labels[i]
+        if group not in chosen or (record.variant == ORIGINAL and records[chosen[group]].variant != ORIGINAL):
+            chosen[group] = i
+
+    lists: Dict[str, List[str]] = {s: [] for s in SPLITS}
+    for i in range(len(records)):
+        if keep_variants or chosen[labels[i]] == i:
+            lists[SPLITS[new_split[labels[i]]]].append(paths[i])
+
+    os.makedirs(output_dir, exist_ok=True)
+    for split, split_paths in lists.items():
+        _write_list(os.path.join(output_dir, f"{split}.txt"), split_paths)
+
+    _write_yaml(os.path.join(output_dir, "data.yaml"), {
+        "train": os.path.abspath(os.path.join(output_dir, "train.txt")),
+        "val": os.path.abspath(os.path.join(output_dir, "valid.txt")),
+        "test": os.path.abspath(os.path.join(output_dir, "test.txt")),
+        "names": {i: name for i, name in enumerate(CLASS_NAMES)},
+    })
+    _write_yaml(os.path.join(output_dir, "augment.yaml"), AUGMENT_CONFIG)
+
+    variants: Dict[str, int] = {}
+    for record in records:
+        variants[record.variant] = variants.get(record.variant, 0) + 1
+
+    report = {
+        "images": len(records),
+        "groups": num_groups,
+        "variants": variants,
+        "leaking_groups": len(leaking),
+        "leaked_images": leaked_images,
+        "original_splits": {s: sum(r.split == s for r in records) for s in SPLITS},
+        "dedup_splits": {s: len(p) for s, p in lists.items()},
+        "leaks": [
+            {
+                "group": int(g),
+                "images": [f"{records[i].split}/{records[i].name}" for i in np.nonzero(labels == g)[0]]
+            }
+            for g in leaking
+        ]
+    }
+
+    with open(os.path.join(output_dir, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    return report
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Augmentation-aware dataset deduplication")
+    parser.add_argument("--dataset", default=DATASET_DIR)
+    parser.add_argument("--out", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=HASH_WORKERS)
+    parser.add_argument("--keep-variants", action="store_true",
+                        help="keep every variant, only regroup splits to remove leakage")
+    args = parser.parse_args()
+
+    print("[START] Dataset Deduplication")
+
+    report = deduplicate(args.dataset, args.out, args.workers, args.keep_variants)
+
+    print(f"[RESULT] {report['images']} images → {report['groups']} source groups")
+    print(f"[RESULT] {report['leaking_groups']} group(s) leak across splits "
+          f"({report['leaked_images']} images)")
+    print(f"[RESULT] Original splits: {report['original_splits']}")
+    print(f"[RESULT] Deduplicated splits: {report['dedup_splits']}")
+    print(f"[INFO] Split lists, data.yaml, augment.yaml and report.json written to {args.out}")
+
+    print("[DONE] Deduplication complete")
@@ -0,0 +1,167 @@
+"""
+FarmX - Weed Detector
+Author: Parth Vishwakarma
+
+Purpose:
+- Run YOLO weed detection on many frames per forward pass
+- Return detections as one contiguous NumPy array per batch
+- Replace per-box tensor indexing with a single copy per image
+- Run PyTorch (.pt) or exported ONNX (.onnx) models through one API
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+MODEL_PATH = "my_model.pt"
+CONF_THRESHOLD = 0.58
+BATCH_SIZE = 8          # frames per forward pass
+DEVICE = "cpu"          # field laptops have no GPU
+
+# =========================
+# DETECTION ARRAY FORMAT
+# =========================
+# One row per box, float32:
+# (image_index, class, confidence, x1, y1, x2, y2)
+# image_index counts frames from the start of the stream.
+DETECTION_COLUMNS = ("image", "cls", "conf", "x1", "y1", "x2", "y2")
+
+COL_IMAGE = 0
+COL_CLS = 1
+COL_CONF = 2
+COL_BOX = slice(3, 7)
+
+# =========================
+# MODEL
+# =========================
+def load_model(model_path: str = MODEL_PATH):
+    """
+    Loads the trained YOLO model.
+    .onnx files run on ONNX Runtime without importing torch / ultralytics.
+    """
+
+    if model_path.endswith(".onnx"):
+        from ai_model.backends import OnnxBackend
+        return OnnxBackend(model_path)
+
+    from ultralytics import YOLO
+    return YOLO(model_path)
+
+# =========================
+# BATCHED INFERENCE
+# =========================
+def detect_batch(
+    model,
+    frames: List[np.ndarray],
+    conf: float = CONF_THRESHOLD,
+    image_offset: int = 0
+) -> np.ndarray:
+    """
+    Runs one forward pass over a list of BGR frames.
+    Returns an (N, 7) float32 array in DETECTION_COLUMNS order.
+    `model` is an ultralytics YOLO or a backend from ai_model.backends.
+    """
+
+    if not frames:
+        return np.empty((0, len(DETECTION_COLUMNS)), dtype=np.float32)
+
+    if hasattr(model, "infer"):
+        rows = model.infer(frames, conf=conf)
+        rows[:, COL_IMAGE] += image_offset
+        return rows
+
+    results = model(frames, conf=conf, device=DEVICE, verbose=False)
+
+    per_image = []
+    for idx, result in enumerate(results):
+        # boxes.data rows: x1, y1, x2, y2, conf, cls
+        data = result.boxes.data.cpu().numpy()
+        if len(data) == 0:
+            continue
+
+        rows = np.empty((len(data), len(DETECTION_COLUMNS)), dtype=np.float32)
+        rows[:, COL_IMAGE] = image_offset + idx
+        rows[:, COL_CLS] = data[:, 5]
+        rows[:, COL_CONF] = data[:, 4]
+        rows[:, COL_BOX] = data[:, :4]
+        per_image.append(rows)
+
+    if not per_image:
+        return np.empty((0, len(DETECTION_COLUMNS)), dtype=np.float32)
+
+    return np.concatenate(per_image)
+
+
+def detect_frames(
+    model,
+    frames: Iterable[np.ndarray],
+    batch_size: int = BATCH_SIZE,
+    conf: float = CONF_THRESHOLD
+) -> Iterator[np.ndarray]:
+    """
+    Runs a list or iterator of frames through the model in batches.
+    Yields one detection array per batch; image indexes are global.
+    """
+
+    frames = iter(frames)
+    offset = 0
+
+    while True:
+        batch = list(islice(frames, batch_size))
+        if not batch:
+            break
+
+        yield detect_batch(model, batch, conf=conf, image_offset=offset)
+        offset += len(batch)
+
+# =========================
+# HELPERS
+# =========================
+def split_by_image(
+    detections: np.ndarray,
+    num_images: int,
+    image_offset: int = 0
+) -> List[np.ndarray]:
+    """
+    Splits a batch detection array into one array per image.
+    Rows must be grouped by image index (as detect_batch returns them).
+    """
+
+    index = detections[:, COL_IMAGE].astype(np.int64) - image_offset
+    bounds = np.searchsorted(index, np.arange(num_images + 1))
+
+    return [detections[bounds[i]:bounds[i + 1]] for i in range(num_images)]
+
+
+def filter_classes(detections: np.ndarray, classes: Iterable[int]) -> np.ndarray:
+    """
+    Keeps only rows whose class is in `classes`.
+    """
+    return detections[np.isin(detections[:, COL_CLS], list(classes))]
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    import sys
+    import cv2
+
+    print("[TEST] Weed Detector")
+
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python ai_model/detector.py <image> [<image> ...]")
+        sys.exit(1)
+
+    model = load_model()
+    frames = (cv2.imread(path) for path in paths)
+
+    for detections in detect_frames(model, frames):
+        print(f"[RESULT] {len(detections)} detection(s)")
+        print(detections)
+
+    print("[DONE] Detection complete")
@@ -0,0 +1,293 @@
+"""
+FarmX - Detector Service
+Author: Parth Vishwakarma
+
+Purpose:
+- Long-lived local process that keeps the detector loaded and warmed up
+- Serves batched detection over a Unix socket (one model, many clients)
+- Mission and CLI entry points connect in milliseconds instead of paying
+  the torch / model load on every run; they fall back to a local model
+  when no service is running
+
+Protocol (per message, both directions):
+    4-byte big-endian header length | JSON header | raw payload
+    detect → header {"op", "conf", "shapes"}, payload = uint8 frames back to back
+           ← header {"ok", "rows"}, payload = (rows, 7) float32 detections
+
+Usage:
+    python -m ai_model.detector_service --model my_model.pt     # start
+    python -m ai_model.detector_service --ping                   # status
+    python -m ai_model.detector_service --stop                   # shut down
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai_model.detector import CONF_THRESHOLD, DETECTION_COLUMNS, MODEL_PATH, detect_batch, load_model
+
+# =========================
+# CONFIG
+# =========================
+SOCKET_PATH = os.environ.get("FARMX_DETECTOR_SOCKET", "/tmp/farmx_detector.sock")
+CONNECT_TIMEOUT = 0.5       # seconds to wait for a running service
+WARMUP_SHAPE = (576, 1024, 3)   # dataset frame size
+WARMUP_RUNS = 2
+
+_HEADER = struct.Struct(">I")
+
+# =========================
+# WIRE FORMAT
+# =========================
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Detector service connection closed")
+        received += n
+    return buffer
+
+
+def send_message(sock: socket.socket, header: Dict, payload: bytes = b""):
+    encoded = json.dumps(header).encode()
+    sock.sendall(_HEADER.pack(len(encoded)) + encoded)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_message(sock: socket.socket, payload_size=None) -> Tuple[Dict, bytearray]:
+    """
+    Reads one message. `payload_size(header)` gives the payload length.
+    """
+
+    (length,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, length))
+    size = payload_size(header) if payload_size else 0
+
+    return header, _recv_exact(sock, size) if size else bytearray()
+
+
+def _frames_size(header: Dict) -> int:
+    return sum(int(np.prod(shape)) for shape in header.get("shapes", []))
+
+
+def _rows_size(header: Dict) -> int:
+    return header.get("rows", 0) * len(DETECTION_COLUMNS) * 4
+
+# =========================
+# SERVER
+# =========================
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        service = self.server.service
+        while True:
+            try:
+                header, payload = recv_message(self.request, _frames_size)
+            except (ConnectionError, OSError, ValueError):
+                return
+
+            op = header.get("op")
+            if op == "detect":
+                frames, offset = [], 0
+                for shape in header["shapes"]:
+                    size = int(np.prod(shape))
+                    frames.append(np.frombuffer(payload, np.uint8, size, offset).reshape(shape))
+                    offset += size
+
+                try:
+                    rows = service.detect(frames, header.get("conf", CONF_THRESHOLD))
+                except Exception as exc:
+                    send_message(self.request, {"ok": False, "error": str(exc)})
+                    continue
+
+                rows = np.ascontiguousarray(rows, dtype="<f4")
+                send_message(self.request, {"ok": True, "rows": len(rows)}, rows.tobytes())
+
+            elif op == "ping":
+                send_message(self.request, {"ok": True, **service.status()})
+
+            elif op == "shutdown":
+                send_message(self.request, {"ok": True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+            else:
+                send_message(self.request, {"ok": False, "error": f"Unknown op: {op}"})
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DetectorService:
+    """
+    One resident model; requests from all clients run one at a time.
+    """
+
+    def __init__(self, model_path: str = MODEL_PATH, socket_path: str = SOCKET_PATH):
+        self.model_path = model_path
+        self.socket_path = socket_path
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.requests = 0
+
+        start = time.perf_counter()
+        self.model = load_model(model_path)
+        self.load_seconds = time.perf_counter() - start
+
+        warmup = np.zeros(WARMUP_SHAPE, dtype=np.uint8)
+        for _ in range(WARMUP_RUNS):
+            detect_batch(self.model, [warmup])
+
+        self.started = time.time()
+        print(f"[INFO] Detector warm: {model_path} (loaded in {self.load_seconds:.2f}s)")
+
+    def detect(self, frames: List[np.ndarray], conf: float) -> np.ndarray:
+        with self.lock:
+            rows = detect_batch(self.model, frames, conf=conf)
+            self.frames += len(frames)
+            self.requests += 1
+        return rows
+
+    def status(self) -> Dict:
+        return {
+            "model": self.model_path,
+            "pid": os.getpid(),
+            "load_seconds": round(self.load_seconds, 3),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "frames": self.frames
+        }
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            if connect_detector(self.socket_path) is not None:
+                raise RuntimeError(f"A detector service is already running on {self.socket_path}")
+            os.remove(self.socket_path)     # stale socket from a crashed service
+
+        server = _Server(self.socket_path, _Handler)
+        server.service = self
+        print(f"[INFO] Detector service listening on {self.socket_path}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            print(f"[INFO] Detector service stopped ({self.requests} requests, {self.frames} frames)")
+
+# =========================
+# CLIENT
+# =========================
+class DetectorClient:
+    """
+    Drop-in for a loaded model: detect_batch(client, frames) works unchanged.
+    """
+
+    name = "service"
+
+    def __init__(self, socket_path: str = SOCKET_PATH, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self.lock = threading.Lock()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+        self.sock.settimeout(None)
+
+    def _request(self, header: Dict, payload: bytes = b"", payload_size=None) -> Tuple[Dict, bytearray]:
+        with self.lock:
+            send_message(self.sock, header, payload)
+            reply, data = recv_message(self.sock, payload_size)
+        if not reply.get("ok"):
+            raise RuntimeError(f"Detector service error: {reply.get('error')}")
+        return reply, data
+
+    def infer(self, frames: List[np.ndarray], conf: float = CONF_THRESHOLD) -> np.ndarray:
+        frames = [np.ascontiguousarray(f, dtype=np.uint8) for f in frames]
+        header = {"op": "detect", "conf": conf, "shapes": [list(f.shape) for f in frames]}
+
+        reply, data = self._request(header, b"".join(f.data for f in frames), _rows_size)
+
+        rows = np.frombuffer(data, dtype="<f4").reshape(reply["rows"], len(DETECTION_COLUMNS))
+        return rows.astype(np.float32)
+
+    def ping(self) -> Dict:
+        return self._request({"op": "ping"})[0]
+
+    def shutdown(self):
+        self._request({"op": "shutdown"})
+        self.close()
+
+    def close(self):
+        self.sock.close()
+
+
+def connect_detector(socket_path: str = SOCKET_PATH, timeout: float = CONNECT_TIMEOUT) -> Optional[DetectorClient]:
+    """
+    Client for a running service, or None when nothing is listening.
+    """
+
+    if not os.path.exists(socket_path):
+        return None
+
+    try:
+        return DetectorClient(socket_path, timeout)
+    except OSError:
+        return None
+
+
+def load_detector(model_path: str = MODEL_PATH, use_service: bool = True, socket_path: str = SOCKET_PATH):
+    """
+    Entry-point helper: the warm service when available, else a local model.
+    """
+
+    if use_service:
+        client = connect_detector(socket_path)
+        if client is not None:
+            served = client.ping()["model"]
+            print(f"[INFO] Using detector service on {socket_path} ({served})")
+            if os.path.basename(served) != os.path.basename(model_path):
+                print(f"[WARNING] Service model {served} differs from requested {model_path}")
+            return client
+        print("[INFO] No detector service running; loading the model locally")
+
+    return load_model(model_path)
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm detector service")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--ping", action="store_true", help="print the running service status")
+    parser.add_argument("--stop", action="store_true", help="shut the running service down")
+    args = parser.parse_args()
+
+    if args.ping or args.stop:
+        client = connect_detector(args.socket)
+        if client is None:
+            print(f"[WARNING] No detector service on {args.socket}")
+        elif args.stop:
+            client.shutdown()
+            print("[DONE] Detector service stopped")
+        else:
+            print(json.dumps(client.ping(), indent=2))
+            client.close()
+    else:
+        print("[START] Detector Service")
+        DetectorService(args.model, args.socket).serve_forever()
@@ -0,0 +1,274 @@
+"""
+FarmX - Model Export & Backend Report
+Author: Parth Vishwakarma
+
+Purpose:
+- Export the trained YOLO model (.pt) to ONNX
+- Optional INT8 post-training quantization, calibrated on the valid/ split
+- Accuracy vs latency report comparing backends on the same test/ frames
+
+Usage:
+    python -m ai_model.export_model --int8
+    python -m ai_model.export_model --compare my_model.pt my_model.onnx my_model.int8.onnx
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from ai_model.backends import IMGSZ, letterbox, load_backend, to_tensor
+from ai_model.detector import CONF_THRESHOLD, MODEL_PATH, detect_batch
+from ai_model.labels import DATASET_DIR, label_path_for, polygon_boxes, read_polygons
+from ai_model.sliced_benchmark import match_detections
+
+# =========================
+# CONFIG
+# =========================
+OPSET = 17
+DYNAMIC_BATCH = True
+CALIBRATION_SPLIT = "valid"
+CALIBRATION_IMAGES = 200    # frames fed to the INT8 calibrator
+CALIBRATION_METHOD = "MinMax"   # "MinMax", "Entropy" or "Percentile"
+REPORT_SPLIT = "test"         # held out from INT8 calibration (valid/)
+REPORT_IMAGES = 100
+WARMUP_RUNS = 3
+
+# =========================
+# EXPORT
+# =========================
+def export_onnx(
+    pt_path: str = MODEL_PATH,
+    imgsz: int = IMGSZ,
+    dynamic: bool = DYNAMIC_BATCH,
+    opset: int = OPSET
+) -> str:
+    """
+    Exports a .pt model to ONNX next to it. Returns the .onnx path.
+    NMS stays outside the graph (done in ai_model.backends).
+    """
+
+    from ultralytics import YOLO
+
+    onnx_path = YOLO(pt_path).export(
+        format="onnx", imgsz=imgsz, dynamic=dynamic, opset=opset, simplify=True
+    )
+    print(f"[INFO] ONNX model exported: {onnx_path}")
+
+    return str(onnx_path)
+
+
+def calibration_paths(split: str = CALIBRATION_SPLIT, limit: int = CALIBRATION_IMAGES) -> List[str]:
+    """
+    Evenly spaced images of a split, so every augmentation variant is seen.
+    """
+
+    image_dir = os.path.join(DATASET_DIR, split, "images")
+    names = sorted(os.listdir(image_dir))
+    if limit and len(names) > limit:
+        names = [names[i] for i in np.linspace(0, len(names) - 1, limit).astype(int)]
+
+    return [os.path.join(image_dir, n) for n in names]
+
+
+def quantize_int8(
+    onnx_path: str,
+    output_path: str = None,
+    split: str = CALIBRATION_SPLIT,
+    num_images: int = CALIBRATION_IMAGES,
+    method: str = CALIBRATION_METHOD
+) -> str:
+    """
+    Static INT8 quantization (QDQ, per-channel weights) with activation
+    ranges calibrated on real frames, pre-processed exactly as at runtime.
+    """
+
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    output_path = output_path or onnx_path.replace(".onnx", ".int8.onnx")
+    paths = calibration_paths(split, num_images)
+
+    import onnx
+    graph_input = onnx.load(onnx_path, load_external_data=False).graph.input[0]
+    input_name = graph_input.name
+    imgsz = graph_input.type.tensor_type.shape.dim[2].dim_value or IMGSZ
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.paths = iter(paths)
+
+        def get_next(self):
+            for path in self.paths:
+                frame = cv2.imread(path)
+                if frame is not None:
+                    return {input_name: to_tensor([letterbox(frame, imgsz)[0]])}
+            return None
+
+    # Shape inference + graph cleanup recommended before static quantization
+    prepared = onnx_path.replace(".onnx", ".prep.onnx")
+    quant_pre_process(onnx_path, prepared)
+
+    print(f"[INFO] Calibrating INT8 on {len(paths)} {split} image(s) ({method})...")
+    quantize_static(
+        prepared,
+        output_path,
+        FrameReader(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=getattr(CalibrationMethod, method)
+    )
+    os.remove(prepared)
+
+    print(f"[INFO] INT8 model written: {output_path}")
+    return output_path
+
+# =========================
+# REPORT
+# =========================
+def cold_load_seconds(model_path: str) -> float:
+    """
+    Import + load time in a fresh interpreter (what a mission start pays).
+    """
+
+    code = (
+        "import time; start = time.perf_counter();"
+        "from ai_model.backends import load_backend;"
+        f"load_backend({model_path!r});"
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    if result.returncode != 0:
+        print(f"[WARNING] Cold load failed for {model_path}: {result.stderr.strip().splitlines()[-1:]}")
+        return float("nan")
+
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def agreement(a: np.ndarray, b: np.ndarray, gt_classes: np.ndarray, gt_boxes: np.ndarray) -> int:
+    """
+    Ground-truth objects both backends found or both missed.
+    """
+
+    return int((match_detections(a, gt_classes, gt_boxes) == match_detections(b, gt_classes, gt_boxes)).sum())
+
+
+def compare_backends(
+    model_paths: List[str],
+    split: str = REPORT_SPLIT,
+    limit: int = REPORT_IMAGES,
+    conf: float = CONF_THRESHOLD
+) -> Dict:
+    """
+    Runs every backend on the same frames. The first model is the reference
+    for the agreement column.
+    """
+
+    paths = calibration_paths(split, limit)
+    frames, truths = [], []
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+        height, width = frame.shape[:2]
+        gt_classes, polygons = read_polygons(label_path_for(path))
+        frames.append(frame)
+        truths.append((gt_classes, polygon_boxes(polygons, width, height)))
+
+    total = sum(len(boxes) for _, boxes in truths)
+    report = {"split": split, "images": len(frames), "objects": total, "backends": {}}
+    reference = None
+
+    for model_path in model_paths:
+        print(f"[INFO] Benchmarking {model_path}...")
+        cold = cold_load_seconds(model_path)
+        backend = load_backend(model_path)
+
+        for frame in frames[:WARMUP_RUNS]:
+            detect_batch(backend, [frame], conf=conf)
+
+        latencies, outputs = [], []
+        found = predictions = 0
+        for frame, (gt_classes, gt_boxes) in zip(frames, truths):
+            start = time.perf_counter()
+            detections = detect_batch(backend, [frame], conf=conf)
+            latencies.append(time.perf_counter() - start)
+
+            found += int(match_detections(detections, gt_classes, gt_boxes).sum())
+            predictions += len(detections)
+            outputs.append(detections)
+
+        if reference is None:
+            reference = outputs
+        same = sum(agreement(a, b, *truth) for a, b, truth in zip(reference, outputs, truths))
+
+        ms = np.asarray(latencies) * 1000
+        report["backends"][model_path] = {
+            "backend": backend.name,
+            "size_mb": round(os.path.getsize(model_path) / 1e6, 2),
+            "cold_load_seconds": round(cold, 3),
+            "latency_ms_mean": round(float(ms.mean()), 2) if len(ms) else 0.0,
+            "latency_ms_p50": round(float(np.percentile(ms, 50)), 2) if len(ms) else 0.0,
+            "latency_ms_p95": round(float(np.percentile(ms, 95)), 2) if len(ms) else 0.0,
+            "recall": round(found / max(total, 1), 4),
+            "precision": round(found / max(predictions, 1), 4),
+            "agreement": round(same / max(total, 1), 4)
+        }
+
+    return report
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export, quantize and compare detector backends")
+    parser.add_argument("--model", default=MODEL_PATH, help=".pt model to export")
+    parser.add_argument("--int8", action="store_true", help="also build an INT8 model")
+    parser.add_argument("--calib-images", type=int, default=CALIBRATION_IMAGES)
+    parser.add_argument("--compare", nargs="+", help="skip export, compare these model files")
+    parser.add_argument("--split", default=REPORT_SPLIT)
+    parser.add_argument("--limit", type=int, default=REPORT_IMAGES, help="report images (0 = all)")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    print("[START] Model Export")
+
+    models = args.compare
+    if not models:
+        onnx_path = export_onnx(args.model)
+        models = [args.model, onnx_path]
+        if args.int8:
+            models.append(quantize_int8(onnx_path, num_images=args.calib_images))
+
+    report = compare_backends(models, args.split, args.limit)
+
+    print(f"[INFO] {report['images']} image(s), {report['objects']} object(s) from {report['split']}/")
+    for path, r in report["backends"].items():
+        print(f"[{r['backend'].upper():5}] {os.path.basename(path)}: {r['size_mb']:.1f} MB | "
+              f"load {r['cold_load_seconds']:.2f} s | {r['latency_ms_mean']:.1f} ms/frame "
+              f"(p95 {r['latency_ms_p95']:.1f}) | recall {r['recall']:.3f} | "
+              f"precision {r['precision']:.3f} | agreement {r['agreement']:.3f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Report written to {args.json}")
+
+    print("[DONE] Export complete")
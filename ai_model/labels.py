@@ -0,0 +1,96 @@
+"""
+FarmX - Dataset Labels
+Author: Parth Vishwakarma
+
+Purpose:
+- Read the Roboflow YOLO polygon labels (class x1 y1 x2 y2 ... normalized)
+- Convert polygons to pixel bounding boxes for evaluation
+"""
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+DATASET_DIR = "ai_model/training_dataset"
+CLASS_NAMES = ("BroWeed", "Maize", "NarWeed")
+
+# =========================
+# LABEL FILES
+# =========================
+def label_path_for(image_path: str) -> str:
+    """
+    <split>/images/name.jpg → <split>/labels/name.txt
+    """
+
+    split_dir = os.path.dirname(os.path.dirname(image_path))
+    name = os.path.splitext(os.path.basename(image_path))[0]
+
+    return os.path.join(split_dir, "labels", name + ".txt")
+
+
+def read_polygons(label_path: str) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Returns (classes (N,), polygons [(K, 2) normalized x, y]).
+    Plain YOLO box rows (class cx cy w h) are turned into 4-point polygons.
+    """
+
+    classes, polygons = [], []
+
+    if not os.path.exists(label_path):
+        return np.empty(0, dtype=np.int64), polygons
+
+    with open(label_path) as f:
+        for line in f:
+            values = line.split()
+            if len(values) < 5:
+                continue
+
+            coords = np.asarray(values[1:], dtype=np.float64)
+            if len(coords) == 4:
+                cx, cy, w, h = coords
+                coords = np.array([
+                    cx - w / 2, cy - h / 2, cx + w / 2, cy - h / 2,
+                    cx + w / 2, cy + h / 2, cx - w / 2, cy + h / 2
+                ])
+
+            classes.append(int(values[0]))
+            polygons.append(coords[:len(coords) // 2 * 2].reshape(-1, 2))
+
+    return np.asarray(classes, dtype=np.int64), polygons
+
+
+def polygon_boxes(polygons: List[np.ndarray], width: int, height: int) -> np.ndarray:
+    """
+    Pixel (N, 4) xyxy bounding boxes of normalized polygons.
+    """
+
+    if not polygons:
+        return np.empty((0, 4), dtype=np.float32)
+
+    boxes = np.array(
+        [np.concatenate([poly.min(axis=0), poly.max(axis=0)]) for poly in polygons],
+        dtype=np.float64
+    )
+    boxes[:, [0, 2]] *= width
+    boxes[:, [1, 3]] *= height
+
+    return boxes.astype(np.float32)
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Dataset Labels")
+
+    image_dir = os.path.join(DATASET_DIR, "valid", "images")
+    name = sorted(os.listdir(image_dir))[0]
+
+    classes, polygons = read_polygons(label_path_for(os.path.join(image_dir, name)))
+    print(f"{name}: {len(classes)} object(s)")
+    print(polygon_boxes(polygons, 1024, 576)[:3])
+
+    print("[DONE] Labels test complete")
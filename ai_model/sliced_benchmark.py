@@ -0,0 +1,183 @@
+"""
+FarmX - Sliced Inference Benchmark
+Author: Parth Vishwakarma
+
+Purpose:
+- Compare whole-frame and sliced inference on a labelled split (valid/ by default)
+- Report recall (all objects and small objects), precision and latency per frame
+- Optionally upscale frames to emulate 4K survey cameras
+
+Usage:
+    python -m ai_model.sliced_benchmark --upscale 3.75 --limit 50
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from ai_model.detector import COL_BOX, COL_CLS, COL_CONF, detect_batch, load_model
+from ai_model.labels import DATASET_DIR, label_path_for, polygon_boxes, read_polygons
+from ai_model.sliced_inference import (
+    TILE_BATCH_SIZE,
+    TILE_OVERLAP,
+    TILE_SIZE,
+    box_overlap,
+    detect_sliced
+)
+
+# =========================
+# CONFIG
+# =========================
+MATCH_IOU = 0.5             # a prediction counts when IoU >= this
+SMALL_FRACTION = 1 / 40     # "small" = longest side under this share of frame width
+
+# =========================
+# MATCHING
+# =========================
+def match_detections(
+    detections: np.ndarray,
+    gt_classes: np.ndarray,
+    gt_boxes: np.ndarray,
+    iou: float = MATCH_IOU
+) -> np.ndarray:
+    """
+    Greedy one-to-one matching, highest confidence first.
+    Returns a bool mask over ground-truth objects: True = found.
+    """
+
+    found = np.zeros(len(gt_boxes), dtype=bool)
+    if len(gt_boxes) == 0 or len(detections) == 0:
+        return found
+
+    for row in detections[np.argsort(-detections[:, COL_CONF])]:
+        candidates = (~found) & (gt_classes == int(row[COL_CLS]))
+        if not candidates.any():
+            continue
+
+        overlap = np.where(candidates, box_overlap(row[COL_BOX], gt_boxes), 0.0)
+        best = int(np.argmax(overlap))
+        if overlap[best] >= iou:
+            found[best] = True
+
+    return found
+
+# =========================
+# BENCHMARK
+# =========================
+class ModeStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.found = 0
+        self.small_found = 0
+        self.predictions = 0
+
+    def summary(self, total: int, small_total: int) -> Dict:
+        lat = np.asarray(self.latencies) * 1000
+        return {
+            "recall": self.found / max(total, 1),
+            "small_recall": self.small_found / max(small_total, 1),
+            "precision": self.found / max(self.predictions, 1),
+            "latency_ms_mean": float(lat.mean()) if len(lat) else 0.0,
+            "latency_ms_p95": float(np.percentile(lat, 95)) if len(lat) else 0.0
+        }
+
+
+def run_benchmark(
+    model,
+    split: str = "valid",
+    limit: int = 0,
+    upscale: float = 1.0,
+    tile_size: int = TILE_SIZE,
+    overlap: float = TILE_OVERLAP,
+    batch_size: int = TILE_BATCH_SIZE
+) -> Dict:
+    image_dir = os.path.join(DATASET_DIR, split, "images")
+    names = sorted(os.listdir(image_dir))
+    if limit:
+        names = names[:limit]
+
+    stats = {"whole": ModeStats(), "sliced": ModeStats()}
+    total = small_total = 0
+
+    for name in names:
+        path = os.path.join(image_dir, name)
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+        if upscale != 1.0:
+            frame = cv2.resize(frame, None, fx=upscale, fy=upscale, interpolation=cv2.INTER_CUBIC)
+
+        height, width = frame.shape[:2]
+        gt_classes, polygons = read_polygons(label_path_for(path))
+        gt_boxes = polygon_boxes(polygons, width, height)
+
+        sides = np.maximum(gt_boxes[:, 2] - gt_boxes[:, 0], gt_boxes[:, 3] - gt_boxes[:, 1])
+        small = sides < width * SMALL_FRACTION
+        total += len(gt_boxes)
+        small_total += int(small.sum())
+
+        for mode, mode_stats in stats.items():
+            start = time.perf_counter()
+            if mode == "whole":
+                detections = detect_batch(model, [frame])
+            else:
+                detections = detect_sliced(model, frame, tile_size, overlap, batch_size)
+            mode_stats.latencies.append(time.perf_counter() - start)
+
+            found = match_detections(detections, gt_classes, gt_boxes)
+            mode_stats.found += int(found.sum())
+            mode_stats.small_found += int((found & small).sum())
+            mode_stats.predictions += len(detections)
+
+    return {
+        "split": split,
+        "images": len(names),
+        "upscale": upscale,
+        "tile_size": tile_size,
+        "overlap": overlap,
+        "batch_size": batch_size,
+        "objects": total,
+        "small_objects": small_total,
+        **{mode: s.summary(total, small_total) for mode, s in stats.items()}
+    }
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Whole-frame vs sliced inference")
+    parser.add_argument("--split", default="valid")
+    parser.add_argument("--limit", type=int, default=0, help="max images (0 = all)")
+    parser.add_argument("--upscale", type=float, default=1.0, help="e.g. 3.75 for 1024px → 3840px")
+    parser.add_argument("--tile", type=int, default=TILE_SIZE)
+    parser.add_argument("--overlap", type=float, default=TILE_OVERLAP)
+    parser.add_argument("--batch", type=int, default=TILE_BATCH_SIZE)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    print("[START] Sliced Inference Benchmark")
+
+    report = run_benchmark(
+        load_model(), args.split, args.limit, args.upscale,
+        args.tile, args.overlap, args.batch
+    )
+
+    print(f"[INFO] {report['images']} image(s), {report['objects']} object(s), "
+          f"{report['small_objects']} small")
+    for mode in ("whole", "sliced"):
+        r = report[mode]
+        print(f"[{mode.upper():6}] recall {r['recall']:.3f} | small recall {r['small_recall']:.3f} | "
+              f"precision {r['precision']:.3f} | {r['latency_ms_mean']:.0f} ms/frame "
+              f"(p95 {r['latency_ms_p95']:.0f})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Report written to {args.json}")
+
+    print("[DONE] Benchmark complete")
@@ -0,0 +1,224 @@
+"""
+FarmX - Sliced Inference
+Author: Parth Vishwakarma
+
+Purpose:
+- Detect small early-stage weeds in high-resolution (4K+) frames
+- Split each frame into overlapping model-sized tiles, batched per forward pass
+- Map tile boxes back to full-frame pixels and merge them with global NMS
+"""
+
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from ai_model.detector import (
+    COL_BOX,
+    COL_CLS,
+    COL_CONF,
+    COL_IMAGE,
+    CONF_THRESHOLD,
+    DETECTION_COLUMNS,
+    detect_batch
+)
+
+# =========================
+# CONFIG
+# =========================
+TILE_SIZE = 640             # model training imgsz (args.yaml)
+TILE_OVERLAP = 0.2          # fraction of a tile shared with its neighbour
+TILE_BATCH_SIZE = 8         # tiles per forward pass
+INCLUDE_FULL_FRAME = True   # also run the downscaled whole frame (large plants)
+
+MERGE_METRIC = "ios"        # "iou" or "ios" (intersection over smaller box), tile vs tile
+FULL_FRAME_METRIC = "iou"   # full-frame vs tile boxes: IoS would let one big
+                            # full-frame box swallow every small weed inside it
+MERGE_THRESHOLD = 0.5       # boxes overlapping more than this are merged
+
+# =========================
+# TILING
+# =========================
+def _tile_starts(length: int, tile: int, stride: int) -> np.ndarray:
+    if length <= tile:
+        return np.zeros(1, dtype=np.int64)
+
+    starts = np.arange(0, length - tile, stride)
+    # Last tile is aligned to the edge instead of hanging past it
+    return np.append(starts, length - tile)
+
+
+def tile_grid(
+    width: int,
+    height: int,
+    tile_size: int = TILE_SIZE,
+    overlap: float = TILE_OVERLAP
+) -> np.ndarray:
+    """
+    (K, 4) int array of tile windows (x1, y1, x2, y2) covering the frame.
+    """
+
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be in [0, 1)")
+
+    stride = max(1, int(tile_size * (1 - overlap)))
+    xs = _tile_starts(width, tile_size, stride)
+    ys = _tile_starts(height, tile_size, stride)
+
+    x1, y1 = np.meshgrid(xs, ys)
+    x1, y1 = x1.ravel(), y1.ravel()
+
+    return np.stack(
+        [x1, y1, np.minimum(x1 + tile_size, width), np.minimum(y1 + tile_size, height)],
+        axis=1
+    )
+
+# =========================
+# BOX MERGING (GLOBAL NMS)
+# =========================
+def box_overlap(box: np.ndarray, boxes: np.ndarray, metric: str = "iou") -> np.ndarray:
+    """
+    Overlap of one xyxy box with (N, 4) boxes: IoU, or intersection over
+    the smaller box ("ios", catches boxes cut in half at a tile seam).
+    """
+
+    ix1 = np.maximum(box[0], boxes[:, 0])
+    iy1 = np.maximum(box[1], boxes[:, 1])
+    ix2 = np.minimum(box[2], boxes[:, 2])
+    iy2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+    if metric == "iou":
+        denom = area + areas - inter
+    elif metric == "ios":
+        denom = np.minimum(area, areas)
+    else:
+        raise ValueError(f"Unknown merge metric: {metric}")
+
+    return inter / np.maximum(denom, 1e-9)
+
+
+def merge_detections(
+    detections: np.ndarray,
+    threshold: float = MERGE_THRESHOLD,
+    metric: str = MERGE_METRIC,
+    full_frame: Optional[np.ndarray] = None,
+    full_frame_metric: str = FULL_FRAME_METRIC
+) -> np.ndarray:
+    """
+    Class-aware greedy NMS over (N, 7) detection rows from one frame.
+    `full_frame` (N,) bool marks rows from the downscaled whole-frame pass;
+    any pair involving one of them is compared with `full_frame_metric`.
+    Returns the kept rows, highest confidence first.
+    """
+
+    if len(detections) < 2:
+        return detections
+
+    boxes = detections[:, COL_BOX].astype(np.float64)
+    classes = detections[:, COL_CLS]
+    order = np.argsort(-detections[:, COL_CONF], kind="stable")
+
+    suppressed = np.zeros(len(detections), dtype=bool)
+    keep = []
+
+    for i in order:
+        if suppressed[i]:
+            continue
+        keep.append(i)
+
+        overlap = box_overlap(boxes[i], boxes, metric)
+        if full_frame is not None and full_frame.any():
+            mixed = full_frame | full_frame[i]
+            overlap[mixed] = box_overlap(boxes[i], boxes[mixed], full_frame_metric)
+
+        same = classes == classes[i]
+        suppressed |= same & (overlap > threshold)
+
+    return detections[keep]
+
+# =========================
+# SLICED DETECTION
+# =========================
+def detect_sliced(
+    model,
+    frame: np.ndarray,
+    tile_size: int = TILE_SIZE,
+    overlap: float = TILE_OVERLAP,
+    batch_size: int = TILE_BATCH_SIZE,
+    conf: float = CONF_THRESHOLD,
+    include_full_frame: bool = INCLUDE_FULL_FRAME,
+    image_index: int = 0
+) -> np.ndarray:
+    """
+    Sliced inference on one frame.
+    Returns (N, 7) rows in DETECTION_COLUMNS order, full-frame pixel boxes.
+    """
+
+    height, width = frame.shape[:2]
+    windows = tile_grid(width, height, tile_size, overlap)
+
+    # Tiles are views into the frame; no copies until the model letterboxes
+    crops: List[np.ndarray] = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+    full_frame_tile = -1
+    if include_full_frame and len(windows) > 1:
+        full_frame_tile = len(crops)
+        crops.append(frame)
+        windows = np.vstack([windows, [0, 0, width, height]])
+
+    parts = []
+    for start in range(0, len(crops), batch_size):
+        rows = detect_batch(model, crops[start:start + batch_size], conf=conf, image_offset=start)
+        if len(rows):
+            tile = rows[:, COL_IMAGE].astype(np.int64)
+            rows[:, COL_BOX] += windows[tile][:, [0, 1, 0, 1]]
+            parts.append(rows)
+
+    if not parts:
+        return np.empty((0, len(DETECTION_COLUMNS)), dtype=np.float32)
+
+    rows = np.concatenate(parts)
+    merged = merge_detections(rows, full_frame=rows[:, COL_IMAGE] == full_frame_tile)
+    merged[:, COL_IMAGE] = image_index
+
+    return merged
+
+
+def detect_sliced_frames(
+    model,
+    frames: Iterable[np.ndarray],
+    **kwargs
+) -> Iterator[np.ndarray]:
+    """
+    Sliced inference over a list or iterator of frames.
+    Yields one detection array per frame; image indexes are global.
+    """
+
+    for index, frame in enumerate(frames):
+        yield detect_sliced(model, frame, image_index=index, **kwargs)
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Sliced Inference")
+
+    windows = tile_grid(3840, 2160)
+    print(f"4K frame → {len(windows)} tiles of {TILE_SIZE}px, overlap {TILE_OVERLAP}")
+
+    # Two halves of one weed cut at a seam, the same weed from the full frame,
+    # and a small weed inside a large full-frame box (kept: IoU, not IoS)
+    rows = np.array([
+        [0, 0, 0.90, 500, 100, 640, 160],
+        [0, 0, 0.80, 512, 100, 700, 160],
+        [1, 0, 0.70, 498, 98, 702, 162],
+        [0, 1, 0.95, 520, 100, 600, 160],
+        [1, 2, 0.90, 1000, 600, 1400, 1000],
+        [0, 2, 0.80, 1100, 700, 1140, 740],
+    ], dtype=np.float32)
+    merged = merge_detections(rows, full_frame=rows[:, COL_IMAGE] == 1)
+    print("Merged rows:", len(merged), "of", len(rows))
+
+    print("[DONE] Sliced inference test complete")
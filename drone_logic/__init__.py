@@ -0,0 +1,41 @@
+"""
+FarmX - Drone Logic Package
+Author: Parth Vishwakarma
+
+Purpose:
+- Lazy re-exports: `import drone_logic` loads nothing, each name imports
+  its module (and numpy / cv2) on first use
+"""
+
+import importlib
+
+_EXPORTS = {
+    "CameraSession": "drone_logic.camera_session",
+    "FieldMosaic": "drone_logic.field_mosaic",
+    "FrameArchiver": "drone_logic.frame_handoff",
+    "SharedFrameBuffer": "drone_logic.frame_handoff",
+    "camera_footprint": "drone_logic.georeference",
+    "cells_to_field": "drone_logic.georeference",
+    "latlon_to_local": "drone_logic.georeference",
+    "local_to_latlon": "drone_logic.georeference",
+    "hover_and_capture_frame": "drone_logic.hover_capture_logic",
+    "hover_and_detect": "drone_logic.hover_capture_logic",
+    "wait_until_stable": "drone_logic.stabilization",
+    "generate_coverage_waypoints": "drone_logic.waypoint_logic",
+    "execute_waypoints": "drone_logic.waypoint_logic",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,297 @@
+"""
+FarmX - Camera Session
+Author: Parth Vishwakarma
+
+Purpose:
+- Keep the camera open for the whole mission (no per-hover device open)
+- Grab frames continuously into a preallocated ring buffer
+- Pick the sharpest of the last N frames to absorb hover motion
+- Stand-in image / video sources for testing without hardware
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+CAMERA_INDEX = 0                # USB camera / drone camera
+RING_BUFFER_SIZE = 8            # frames kept in memory
+BEST_OF_N = 5                   # frames compared for sharpness
+SHARPNESS_WIDTH = 320           # frames are downscaled to this width to score
+FRAME_TIMEOUT = 2.0             # seconds to wait for new frames
+FILE_SOURCE_FPS = 30.0          # playback rate of image-folder sources
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# =========================
+# ERRORS
+# =========================
+class FrameTimeout(RuntimeError):
+    """
+    No new frame arrived in time; the camera itself has not failed.
+    """
+
+# =========================
+# STAND-IN SOURCE
+# =========================
+class ImageFolderSource:
+    """
+    Replays still images like a camera (cv2.VideoCapture-style read()).
+    Accepts a single image file or a folder; loops forever by default.
+    """
+
+    def __init__(self, path: str, loop: bool = True, fps: float = FILE_SOURCE_FPS):
+        if os.path.isdir(path):
+            self.paths = [
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            ]
+        else:
+            self.paths = [path]
+
+        if not self.paths:
+            raise RuntimeError(f"No images found in {path}")
+
+        self.loop = loop
+        self.interval = 1.0 / fps
+        self.index = 0
+        self._frames = {}
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.index >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.index = 0
+
+        path = self.paths[self.index]
+        self.index += 1
+
+        # Decode each file once; replaying is then just a copy
+        frame = self._frames.get(path)
+        if frame is None:
+            frame = cv2.imread(path)
+            if frame is None:
+                return False, None
+            self._frames[path] = frame
+
+        time.sleep(self.interval)
+
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+
+        return True, frame.copy()
+
+    def release(self):
+        self._frames.clear()
+
+
+def open_source(source: Union[int, str]):
+    """
+    Camera index → device; video file → cv2 playback; image / folder → replay.
+    """
+
+    if isinstance(source, str) and (
+        os.path.isdir(source) or source.lower().endswith(IMAGE_EXTENSIONS)
+    ):
+        return ImageFolderSource(source)
+
+    return cv2.VideoCapture(source)
+
+# =========================
+# SHARPNESS
+# =========================
+def sharpness(frame: np.ndarray) -> float:
+    """
+    Variance of the Laplacian: higher = sharper (less motion blur).
+    """
+
+    height, width = frame.shape[:2]
+    if width > SHARPNESS_WIDTH:
+        frame = cv2.resize(
+            frame, (SHARPNESS_WIDTH, int(height * SHARPNESS_WIDTH / width)),
+            interpolation=cv2.INTER_AREA
+        )
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+# =========================
+# CAMERA SESSION
+# =========================
+class CameraSession:
+    """
+    Long-lived camera with a background grabber thread.
+
+    Frames are written into a preallocated (N, H, W, 3) ring buffer. The
+    grabber always writes into the slot after the newest published frame,
+    so readers can copy up to N - 1 recent frames without tearing.
+    """
+
+    def __init__(
+        self,
+        source: Union[int, str] = CAMERA_INDEX,
+        buffer_size: int = RING_BUFFER_SIZE
+    ):
+        if buffer_size < 2:
+            raise ValueError("buffer_size must be >= 2")
+
+        self.source = source
+        self.buffer_size = buffer_size
+
+        self._cap = None
+        self._ring: Optional[np.ndarray] = None
+        self._stamps = np.zeros(buffer_size, dtype=np.float64)
+        self._count = 0                 # frames published so far
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+
+    # ---- lifecycle ----
+    def start(self) -> "CameraSession":
+        if self._running:
+            return self
+
+        self._cap = open_source(self.source)
+        if not self._cap.isOpened():
+            raise RuntimeError("Camera not accessible")
+
+        ret, frame = self._cap.read()
+        if not ret:
+            self._cap.release()
+            raise RuntimeError("Failed to capture image")
+
+        self._ring = np.empty((self.buffer_size,) + frame.shape, dtype=frame.dtype)
+        self._publish(frame)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, name="camera", daemon=True)
+        self._thread.start()
+
+        print(f"[INFO] Camera session started ({frame.shape[1]}x{frame.shape[0]})")
+        return self
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def __enter__(self) -> "CameraSession":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---- grabbing ----
+    def _publish(self, frame: Optional[np.ndarray] = None):
+        slot = self._count % self.buffer_size
+        if frame is not None:
+            if frame.shape != self._ring.shape[1:]:
+                frame = cv2.resize(frame, (self._ring.shape[2], self._ring.shape[1]))
+            self._ring[slot] = frame
+
+        with self._cond:
+            self._stamps[slot] = time.monotonic()
+            self._count += 1
+            self._cond.notify_all()
+
+    def _grab_loop(self):
+        while self._running:
+            slot = self._count % self.buffer_size
+            target = self._ring[slot]
+
+            ret, frame = self._cap.read(target)
+            if not ret:
+                with self._cond:
+                    self._error = RuntimeError("Failed to capture image")
+                    self._running = False
+                    self._cond.notify_all()
+                break
+
+            # Devices that could not decode in place hand back a new array
+            self._publish(None if np.shares_memory(frame, target) else frame)
+
+    # ---- reading ----
+    def frame_count(self) -> int:
+        with self._cond:
+            return self._count
+
+    def wait_for_frames(self, count: int = 1, timeout: float = FRAME_TIMEOUT) -> int:
+        """
+        Blocks until `count` new frames have arrived. Returns the frame count.
+        Raises FrameTimeout on timeout, the grabber's error if the camera failed.
+        """
+
+        with self._cond:
+            target = self._count + count
+            ready = self._cond.wait_for(
+                lambda: self._count >= target or not self._running, timeout
+            )
+            if self._error is not None:
+                raise self._error
+            if not ready:
+                raise FrameTimeout("Timed out waiting for camera frames")
+            if self._count < target:
+                raise RuntimeError("Camera session is closed")
+            return self._count
+
+    def recent_frames(self, count: int) -> List[Tuple[float, np.ndarray]]:
+        """
+        Copies of the newest `count` frames (newest first) with timestamps.
+        At most buffer_size - 1 frames are returned.
+        """
+
+        with self._cond:
+            available = min(count, self._count, self.buffer_size - 1)
+            slots = [(self._count - 1 - i) % self.buffer_size for i in range(available)]
+            return [(float(self._stamps[s]), self._ring[s].copy()) for s in slots]
+
+    def latest(self) -> np.ndarray:
+        return self.recent_frames(1)[0][1]
+
+    def best_frame(self, n: int = BEST_OF_N, fresh: bool = True) -> np.ndarray:
+        """
+        Sharpest of the last `n` frames (Laplacian variance).
+        With fresh=True, waits for `n` frames grabbed after this call.
+        """
+
+        n = min(n, self.buffer_size - 1)
+        if fresh:
+            self.wait_for_frames(n)
+
+        frames = self.recent_frames(n)
+        scores = [sharpness(frame) for _, frame in frames]
+
+        return frames[int(np.argmax(scores))][1]
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    import sys
+
+    print("[TEST] Camera Session")
+
+    source = sys.argv[1] if len(sys.argv) > 1 else CAMERA_INDEX
+
+    with CameraSession(source) as session:
+        for hover in range(3):
+            frame = session.best_frame()
+            print(f"[HOVER {hover + 1}] best frame {frame.shape}, sharpness {sharpness(frame):.1f}")
+
+    print("[DONE] Camera session test complete")
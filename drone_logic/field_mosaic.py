@@ -0,0 +1,420 @@
+"""
+FarmX - Field Mosaic
+Author: Parth Vishwakarma
+
+Purpose:
+- Project each frame's weed cells onto the field (waypoint lat/lon,
+  altitude, heading and camera FOV via drone_logic.georeference)
+- Accumulate hits in a chunked, memory-mapped field raster: only touched
+  chunks exist on disk and only a bounded number are mapped at once
+- Fast region queries and a downsampled overview for re-spray planning
+  without reprocessing imagery
+
+Layout (one folder per field):
+    manifest.json               origin, cell size, chunk size, layers, frames
+    chunk_<cx>_<cy>.npy         (layers, CHUNK_CELLS, CHUNK_CELLS) uint16 hit counts
+
+Raster index: [layer, north cell, east cell] from the field origin.
+"""
+
+import glob
+import json
+import math
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from drone_logic.georeference import (
+    CAMERA_HFOV_DEG,
+    CAMERA_VFOV_DEG,
+    GRID_SIZE,
+    HOVER_ALTITUDE,
+    camera_footprint,
+    cells_to_field,
+    latlon_to_local,
+    local_to_latlon
+)
+
+# =========================
+# CONFIG
+# =========================
+MOSAIC_DIR = "ai_model/inference/field_mosaic"
+MOSAIC_CELL_M = 0.02        # field cell size (same as the spray ledger)
+CHUNK_CELLS = 512           # chunk side in cells (10.24 m at 2 cm)
+MOSAIC_LAYERS = 3           # one hit count per class (BroWeed, Maize, NarWeed)
+MAX_OPEN_CHUNKS = 64        # mapped chunks kept open (LRU)
+OVERVIEW_FACTOR = 32        # cells per overview pixel side
+
+_DTYPE = np.uint16
+_HIT_LIMIT = np.iinfo(_DTYPE).max
+
+# =========================
+# MOSAIC
+# =========================
+class FieldMosaic:
+    """
+    Sparse field raster of per-class weed hits, stored as memory-mapped chunks.
+    """
+
+    def __init__(
+        self,
+        path: str = MOSAIC_DIR,
+        origin: Optional[Tuple[float, float]] = None,
+        cell_size_m: float = MOSAIC_CELL_M,
+        chunk_cells: int = CHUNK_CELLS,
+        layers: int = MOSAIC_LAYERS,
+        max_open: int = MAX_OPEN_CHUNKS
+    ):
+        self.path = path
+        self.max_open = max_open
+        self._chunks: "OrderedDict[Tuple[int, int], np.memmap]" = OrderedDict()
+
+        manifest = os.path.join(path, "manifest.json")
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                meta = json.load(f)
+            if origin is not None and tuple(origin) != tuple(meta["origin"]):
+                print(f"[WARNING] Mosaic origin {meta['origin']} kept (requested {origin})")
+        else:
+            if origin is None:
+                raise ValueError("A new mosaic needs an origin (lat, lon)")
+            meta = {
+                "origin": list(origin),
+                "cell_size_m": cell_size_m,
+                "chunk_cells": chunk_cells,
+                "layers": layers,
+                "frames": 0
+            }
+
+        self.origin = tuple(meta["origin"])
+        self.cell_size_m = meta["cell_size_m"]
+        self.chunk_cells = meta["chunk_cells"]
+        self.layers = meta["layers"]
+        self.frames = meta["frames"]
+
+        os.makedirs(path, exist_ok=True)
+        self._save_manifest()
+
+    # ---- storage ----
+    def _save_manifest(self):
+        meta = {
+            "origin": list(self.origin),
+            "cell_size_m": self.cell_size_m,
+            "chunk_cells": self.chunk_cells,
+            "layers": self.layers,
+            "frames": self.frames
+        }
+        path = os.path.join(self.path, "manifest.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _chunk_path(self, key: Tuple[int, int]) -> str:
+        return os.path.join(self.path, f"chunk_{key[0]}_{key[1]}.npy")
+
+    def _chunk(self, key: Tuple[int, int], create: bool) -> Optional[np.ndarray]:
+        """
+        Mapped chunk (LRU), created zero-filled on first write.
+        """
+
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        path = self._chunk_path(key)
+        if os.path.exists(path):
+            chunk = np.load(path, mmap_mode="r+")
+        elif create:
+            shape = (self.layers, self.chunk_cells, self.chunk_cells)
+            chunk = np.lib.format.open_memmap(path, mode="w+", dtype=_DTYPE, shape=shape)
+        else:
+            return None
+
+        self._chunks[key] = chunk
+        if len(self._chunks) > self.max_open:
+            _, old = self._chunks.popitem(last=False)
+            old.flush()
+
+        return chunk
+
+    def chunk_keys(self):
+        """
+        (cx, cy) of every chunk on disk.
+        """
+
+        keys = []
+        for path in glob.glob(os.path.join(self.path, "chunk_*_*.npy")):
+            cx, cy = os.path.basename(path)[6:-4].split("_")
+            keys.append((int(cx), int(cy)))
+        return sorted(keys)
+
+    def flush(self):
+        for chunk in self._chunks.values():
+            chunk.flush()
+        self._save_manifest()
+
+    def close(self):
+        self.flush()
+        self._chunks.clear()
+
+    # ---- coordinates ----
+    def to_cells(self, field_xy: np.ndarray) -> np.ndarray:
+        """
+        (N, 2) field (east, north) meters → (N, 2) int64 field cells.
+        """
+
+        return np.floor(np.asarray(field_xy, dtype=np.float64) / self.cell_size_m).astype(np.int64)
+
+    def cell_centers(self, cells: np.ndarray) -> np.ndarray:
+        return (np.asarray(cells, dtype=np.float64) + 0.5) * self.cell_size_m
+
+    def to_local(self, lat, lon) -> np.ndarray:
+        return latlon_to_local(lat, lon, *self.origin)
+
+    def to_latlon(self, field_xy: np.ndarray) -> np.ndarray:
+        field_xy = np.asarray(field_xy, dtype=np.float64).reshape(-1, 2)
+        return local_to_latlon(field_xy[:, 0], field_xy[:, 1], *self.origin)
+
+    # ---- writing ----
+    def add_cells(self, field_cells: np.ndarray, layers) -> int:
+        """
+        Adds one hit per distinct (field cell, layer), grouped into
+        per-chunk updates. Returns the number of distinct hits.
+        """
+
+        field_cells = np.asarray(field_cells, dtype=np.int64).reshape(-1, 2)
+        layers = np.broadcast_to(np.asarray(layers, dtype=np.int64), len(field_cells))
+        if len(field_cells) == 0:
+            return 0
+
+        hits = np.unique(np.column_stack([field_cells // self.chunk_cells, layers, field_cells]), axis=0)
+        chunk_xy, layers, local = hits[:, :2], hits[:, 2], hits[:, 3:] % self.chunk_cells
+
+        # Rows are sorted by chunk, so each chunk is mapped once per call
+        bounds = np.flatnonzero(np.any(np.diff(chunk_xy, axis=0) != 0, axis=1)) + 1
+
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(hits)]):
+            chunk = self._chunk((int(chunk_xy[start, 0]), int(chunk_xy[start, 1])), create=True)
+            index = (layers[start:end], local[start:end, 1], local[start:end, 0])
+            chunk[index] = np.minimum(chunk[index].astype(np.int64) + 1, _HIT_LIMIT)
+
+        return len(hits)
+
+    def add_frame(
+        self,
+        cells: np.ndarray,
+        lat: float,
+        lon: float,
+        classes=0,
+        altitude_m: float = HOVER_ALTITUDE,
+        heading_deg: float = 0.0,
+        hfov_deg: float = CAMERA_HFOV_DEG,
+        vfov_deg: float = CAMERA_VFOV_DEG
+    ) -> int:
+        """
+        Projects one frame's (N, 2) grid cells taken at (lat, lon) into the
+        mosaic. `classes` is one layer for all cells or one per cell.
+        Returns the number of field cells hit.
+        """
+
+        cells = np.asarray(cells, dtype=np.float64).reshape(-1, 2)
+        classes = np.broadcast_to(np.asarray(classes, dtype=np.int64), len(cells))
+        self.frames += 1
+        if len(cells) == 0:
+            return 0
+
+        # A frame cell wider than a field cell is sampled k x k times so it
+        # paints every field cell it covers
+        width, height = camera_footprint(altitude_m, hfov_deg, vfov_deg)
+        k = max(1, math.ceil(max(width, height) / GRID_SIZE / self.cell_size_m))
+        if k > 1:
+            offsets = (np.arange(k) + 0.5) / k - 0.5
+            sub = np.stack(np.meshgrid(offsets, offsets), axis=-1).reshape(-1, 2)
+            cells = (cells[:, None, :] + sub[None]).reshape(-1, 2)
+            classes = np.repeat(classes, len(sub))
+
+        center = self.to_local(lat, lon)
+        field_xy = cells_to_field(cells, center, altitude_m, heading_deg, hfov_deg, vfov_deg)
+        field_cells = self.to_cells(field_xy)
+
+        # One hit per field cell and class per frame
+        return self.add_cells(field_cells, classes)
+
+    # ---- reading ----
+    def query_cells(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """
+        Dense (layers, y1 - y0, x1 - x0) hit counts for a field-cell window
+        (end exclusive). Only chunks overlapping the window are read.
+        """
+
+        out = np.zeros((self.layers, y1 - y0, x1 - x0), dtype=_DTYPE)
+        size = self.chunk_cells
+
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                chunk = self._chunk((cx, cy), create=False)
+                if chunk is None:
+                    continue
+
+                gx0, gy0 = max(x0, cx * size), max(y0, cy * size)
+                gx1, gy1 = min(x1, (cx + 1) * size), min(y1, (cy + 1) * size)
+                out[:, gy0 - y0:gy1 - y0, gx0 - x0:gx1 - x0] = chunk[
+                    :, gy0 - cy * size:gy1 - cy * size, gx0 - cx * size:gx1 - cx * size
+                ]
+
+        return out
+
+    def query(self, east_min: float, north_min: float, east_max: float, north_max: float):
+        """
+        Region query in field meters. Returns (counts, (x0, y0) field cell
+        of counts[:, 0, 0]).
+        """
+
+        (x0, y0), (x1, y1) = self.to_cells([[east_min, north_min], [east_max, north_max]])
+        return self.query_cells(int(x0), int(y0), int(x1) + 1, int(y1) + 1), (int(x0), int(y0))
+
+    def query_latlon(self, lat_min: float, lon_min: float, lat_max: float, lon_max: float):
+        (east_min, north_min), (east_max, north_max) = self.to_local(
+            [lat_min, lat_max], [lon_min, lon_max]
+        )
+        return self.query(east_min, north_min, east_max, north_max)
+
+    def targets(
+        self,
+        layers: Sequence[int],
+        bounds: Optional[Tuple[float, float, float, float]] = None,
+        min_hits: int = 1
+    ) -> np.ndarray:
+        """
+        Field (east, north) centers of cells with at least `min_hits` in any
+        of `layers`, over `bounds` (meters) or the whole field. This is the
+        input for a re-spray pass.
+        """
+
+        if bounds is not None:
+            counts, (x0, y0) = self.query(*bounds)
+            ys, xs = np.nonzero(counts[list(layers)].max(axis=0) >= min_hits)
+            return self.cell_centers(np.column_stack([xs + x0, ys + y0]))
+
+        found = []
+        for cx, cy in self.chunk_keys():
+            chunk = self._chunk((cx, cy), create=False)
+            ys, xs = np.nonzero(chunk[list(layers)].max(axis=0) >= min_hits)
+            found.append(np.column_stack([xs + cx * self.chunk_cells, ys + cy * self.chunk_cells]))
+
+        if not found:
+            return np.empty((0, 2), dtype=np.float64)
+        return self.cell_centers(np.concatenate(found))
+
+    def extent(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Field-cell bounds (x0, y0, x1, y1) covered by chunks on disk.
+        """
+
+        keys = self.chunk_keys()
+        if not keys:
+            return None
+
+        cxs, cys = zip(*keys)
+        size = self.chunk_cells
+        return min(cxs) * size, min(cys) * size, (max(cxs) + 1) * size, (max(cys) + 1) * size
+
+    def overview(self, factor: int = OVERVIEW_FACTOR):
+        """
+        Max-pooled (layers, H, W) overview of the whole field, built one
+        chunk at a time. Returns (overview, (x0, y0) field cell of [0, 0]).
+        """
+
+        if self.chunk_cells % factor:
+            raise ValueError(f"factor must divide the chunk size ({self.chunk_cells})")
+
+        bounds = self.extent()
+        if bounds is None:
+            return np.zeros((self.layers, 0, 0), dtype=_DTYPE), (0, 0)
+
+        x0, y0, x1, y1 = bounds
+        out = np.zeros((self.layers, (y1 - y0) // factor, (x1 - x0) // factor), dtype=_DTYPE)
+        side = self.chunk_cells // factor
+
+        for cx, cy in self.chunk_keys():
+            chunk = self._chunk((cx, cy), create=False)
+            pooled = chunk.reshape(self.layers, side, factor, side, factor).max(axis=(2, 4))
+            oy, ox = (cy * self.chunk_cells - y0) // factor, (cx * self.chunk_cells - x0) // factor
+            out[:, oy:oy + side, ox:ox + side] = pooled
+
+        return out, (x0, y0)
+
+    def overview_image(self, factor: int = OVERVIEW_FACTOR, colors: Optional[Dict[int, Tuple[int, int, int]]] = None) -> np.ndarray:
+        """
+        BGR overview, north up: one colour per layer where it has hits.
+        """
+
+        colors = colors or {0: (0, 0, 255), 1: (0, 200, 0), 2: (255, 0, 0)}
+        pooled, _ = self.overview(factor)
+
+        image = np.full(pooled.shape[1:] + (3,), 255, dtype=np.uint8)
+        for layer, color in colors.items():
+            if layer < self.layers:
+                image[pooled[layer] > 0] = color
+
+        return image[::-1]
+
+    def stats(self) -> Dict:
+        keys = self.chunk_keys()
+        chunk_bytes = self.layers * self.chunk_cells ** 2 * np.dtype(_DTYPE).itemsize
+        return {
+            "frames": self.frames,
+            "chunks": len(keys),
+            "disk_mb": round(len(keys) * chunk_bytes / 1e6, 2),
+            "open_chunks": len(self._chunks),
+            "cell_size_m": self.cell_size_m
+        }
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    from drone_logic.waypoint_logic import generate_coverage_waypoints
+
+    print("[TEST] Field Mosaic")
+
+    field = [
+        (26.21830, 78.18280),
+        (26.21830, 78.18300),
+        (26.21845, 78.18300),
+        (26.21845, 78.18280)
+    ]
+
+    path = tempfile.mkdtemp(prefix="farmx_mosaic_")
+    mosaic = FieldMosaic(path, origin=field[0])
+
+    rng = np.random.default_rng(0)
+    for lat, lon in generate_coverage_waypoints(field):
+        cells = rng.integers(0, GRID_SIZE, size=(20, 2))
+        mosaic.add_frame(cells, lat, lon, classes=rng.choice([0, 2], size=len(cells)))
+    mosaic.flush()
+
+    print("Stats:", mosaic.stats())
+
+    counts, corner = mosaic.query(0.0, 0.0, 5.0, 5.0)
+    print(f"Region 5x5 m: {counts.shape}, {int((counts > 0).sum())} hit cell(s) from cell {corner}")
+
+    weeds = mosaic.targets(layers=[0, 2])
+    print(f"Re-spray targets: {len(weeds)}, first at {np.round(mosaic.to_latlon(weeds[:1]), 7).tolist()}")
+
+    overview = mosaic.overview_image(factor=16)
+    print(f"Overview image: {overview.shape}")
+
+    mosaic.close()
+    reopened = FieldMosaic(path)
+    print(f"Reopened: {reopened.frames} frame(s), {len(reopened.targets(layers=[0, 2]))} target(s)")
+    reopened.close()
+    shutil.rmtree(path)
+
+    print("[DONE] Field mosaic test complete")
@@ -0,0 +1,222 @@
+"""
+FarmX - Frame Hand-off Module
+Author: Parth Vishwakarma
+
+Purpose:
+- Pass captured frames to detection in memory, not through a PNG file
+- Shared-memory frame slots when detection runs in another process
+- Archive frames on a background thread in a selectable format
+"""
+
+import os
+import queue
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+ARCHIVE_DIR = "ai_model/inference/"
+ARCHIVE_FORMAT = "jpg"          # "jpg", "png" or "npy"
+JPEG_QUALITY = 95               # 0-100
+PNG_COMPRESSION = 1             # 0-9 (0 = fastest, largest)
+ARCHIVE_QUEUE_SIZE = 16         # frames waiting to be written
+
+SHARED_SLOTS = 4                # frames in flight to a detector process
+
+_STOP = object()
+
+# =========================
+# BACKGROUND ARCHIVER
+# =========================
+class FrameArchiver:
+    """
+    Writes frames to disk on a background thread, off the hover critical path.
+    submit() only blocks when ARCHIVE_QUEUE_SIZE frames are already waiting.
+    """
+
+    def __init__(
+        self,
+        save_dir: str = ARCHIVE_DIR,
+        fmt: str = ARCHIVE_FORMAT,
+        jpeg_quality: int = JPEG_QUALITY,
+        png_compression: int = PNG_COMPRESSION,
+        max_pending: int = ARCHIVE_QUEUE_SIZE
+    ):
+        if fmt not in ("jpg", "png", "npy"):
+            raise ValueError(f"Unknown archive format: {fmt}")
+
+        self.save_dir = save_dir
+        self.fmt = fmt
+
+        if fmt == "jpg":
+            self.params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        elif fmt == "png":
+            self.params = [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
+        else:
+            self.params = []
+
+        os.makedirs(save_dir, exist_ok=True)
+
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._worker, name="archiver", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray, name: str) -> str:
+        """
+        Queues a frame for writing. Returns the path it will be written to.
+        The caller must not modify `frame` afterwards.
+        """
+
+        path = os.path.join(self.save_dir, f"{name}.{self.fmt}")
+        self._jobs.put((frame, path))
+        return path
+
+    def flush(self):
+        """
+        Blocks until every queued frame is on disk.
+        """
+        self._jobs.join()
+
+    def close(self):
+        self._jobs.put(_STOP)
+        self._thread.join()
+
+    def _worker(self):
+        while True:
+            item = self._jobs.get()
+            if item is _STOP:
+                self._jobs.task_done()
+                break
+
+            frame, path = item
+            try:
+                if self.fmt == "npy":
+                    np.save(path, frame)
+                elif not cv2.imwrite(path, frame, self.params):
+                    print(f"[WARNING] Could not write {path}")
+            except Exception as exc:
+                print(f"[WARNING] Could not write {path}: {exc}")
+            finally:
+                self._jobs.task_done()
+
+# =========================
+# SHARED-MEMORY HAND-OFF
+# =========================
+class SharedFrameBuffer:
+    """
+    Round-robin shared-memory frame slots (producer side).
+
+    put() copies a frame into the next slot and returns a small picklable
+    descriptor to send over a multiprocessing queue; the detector process
+    maps it with attach_frame() without copying. A slot is reused after
+    `slots` further frames, so the consumer must be done with it by then.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        dtype=np.uint8,
+        slots: int = SHARED_SLOTS
+    ):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=frame_bytes * slots)
+        self._frames = np.ndarray(
+            (slots,) + self.shape, dtype=self.dtype, buffer=self._shm.buf
+        )
+        self._next = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def put(self, frame: np.ndarray) -> Dict:
+        if frame.shape != self.shape:
+            raise ValueError(f"Frame shape {frame.shape} != buffer shape {self.shape}")
+
+        slot = self._next
+        self._next = (self._next + 1) % self.slots
+        self._frames[slot] = frame
+
+        return {
+            "name": self._shm.name,
+            "slot": slot,
+            "slots": self.slots,
+            "shape": self.shape,
+            "dtype": self.dtype.str
+        }
+
+    def close(self):
+        """
+        Releases and removes the shared memory (producer owns it).
+        """
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
+
+
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def attach_frame(descriptor: Dict) -> np.ndarray:
+    """
+    Consumer side: zero-copy view of the frame a descriptor points to.
+    Segments are attached once per process and cached. The consumer should
+    be started by the producer (multiprocessing) so they share one resource
+    tracker and only the producer's close() removes the segment.
+    """
+
+    name = descriptor["name"]
+    shm = _attached.get(name)
+
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+
+    shape = tuple(descriptor["shape"])
+    frames = np.ndarray(
+        (descriptor["slots"],) + shape, dtype=np.dtype(descriptor["dtype"]), buffer=shm.buf
+    )
+    return frames[descriptor["slot"]]
+
+
+def detach_all():
+    """
+    Consumer side: closes every attached segment.
+    Drop all views from attach_frame() first.
+    """
+
+    for shm in _attached.values():
+        shm.close()
+    _attached.clear()
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Frame Hand-off")
+
+    frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    buffer = SharedFrameBuffer(frame.shape)
+    view = attach_frame(buffer.put(frame))
+    print("Shared-memory frame matches:", bool((view == frame).all()))
+    del view
+    detach_all()
+    buffer.close()
+
+    archiver = FrameArchiver(save_dir="/tmp/farmx_archive", fmt="jpg")
+    path = archiver.submit(frame, "test_frame")
+    archiver.flush()
+    archiver.close()
+    print("Archived:", path, os.path.exists(path))
+
+    print("[DONE] Frame hand-off test complete")
@@ -0,0 +1,140 @@
+"""
+FarmX - Georeference Module
+Author: Parth Vishwakarma
+
+Purpose:
+- Convert GPS lat/lon to local field coordinates (meters east / north)
+- Compute the camera ground footprint from altitude and field of view
+- Project frame-local 256x256 grid cells onto the field
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+GRID_SIZE = 256
+EARTH_RADIUS_M = 6371008.8      # mean Earth radius
+
+HOVER_ALTITUDE = 0.6            # meters (~2 feet)
+CAMERA_HFOV_DEG = 62.2          # downward camera field of view
+CAMERA_VFOV_DEG = 48.8
+
+# =========================
+# LAT/LON ↔ LOCAL METERS
+# =========================
+def latlon_to_local(
+    lat,
+    lon,
+    origin_lat: float,
+    origin_lon: float
+) -> np.ndarray:
+    """
+    Local tangent-plane (east, north) meters from a field origin.
+    Equirectangular approximation: sub-centimeter error over a farm.
+    Accepts scalars or arrays; returns (..., 2).
+    """
+
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+
+    east = np.radians(lon - origin_lon) * EARTH_RADIUS_M * math.cos(math.radians(origin_lat))
+    north = np.radians(lat - origin_lat) * EARTH_RADIUS_M
+
+    return np.stack([east, north], axis=-1)
+
+
+def local_to_latlon(
+    east,
+    north,
+    origin_lat: float,
+    origin_lon: float
+) -> np.ndarray:
+    """
+    Inverse of latlon_to_local. Returns (..., 2) as (lat, lon).
+    """
+
+    east = np.asarray(east, dtype=np.float64)
+    north = np.asarray(north, dtype=np.float64)
+
+    lat = origin_lat + np.degrees(north / EARTH_RADIUS_M)
+    lon = origin_lon + np.degrees(east / (EARTH_RADIUS_M * math.cos(math.radians(origin_lat))))
+
+    return np.stack([lat, lon], axis=-1)
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in meters (scalars or arrays).
+    """
+
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.asarray(lon2) - np.asarray(lon1))
+
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+# =========================
+# CAMERA FOOTPRINT
+# =========================
+def camera_footprint(
+    altitude_m: float = HOVER_ALTITUDE,
+    hfov_deg: float = CAMERA_HFOV_DEG,
+    vfov_deg: float = CAMERA_VFOV_DEG
+) -> Tuple[float, float]:
+    """
+    Ground (width, height) in meters seen by a nadir camera.
+    """
+
+    width = 2 * altitude_m * math.tan(math.radians(hfov_deg) / 2)
+    height = 2 * altitude_m * math.tan(math.radians(vfov_deg) / 2)
+
+    return width, height
+
+# =========================
+# FRAME CELLS → FIELD
+# =========================
+def cells_to_field(
+    cells: np.ndarray,
+    center_local: Tuple[float, float],
+    altitude_m: float = HOVER_ALTITUDE,
+    heading_deg: float = 0.0,
+    hfov_deg: float = CAMERA_HFOV_DEG,
+    vfov_deg: float = CAMERA_VFOV_DEG
+) -> np.ndarray:
+    """
+    Projects (N, 2) grid cells (int or float) of one frame to field
+    (east, north) meters. `center_local` is the frame center in field
+    coordinates; heading 0° means the top of the image faces north.
+    """
+
+    cells = np.asarray(cells, dtype=np.float64).reshape(-1, 2)
+    width, height = camera_footprint(altitude_m, hfov_deg, vfov_deg)
+
+    # Offset of each cell center from the image center, image axes
+    right = ((cells[:, 0] + 0.5) / GRID_SIZE - 0.5) * width
+    up = (0.5 - (cells[:, 1] + 0.5) / GRID_SIZE) * height
+
+    theta = math.radians(heading_deg)
+    east = center_local[0] + right * math.cos(theta) + up * math.sin(theta)
+    north = center_local[1] - right * math.sin(theta) + up * math.cos(theta)
+
+    return np.stack([east, north], axis=1)
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Georeference")
+
+    origin = (26.2183, 78.1828)
+    local = latlon_to_local(26.2184, 78.1829, *origin)
+    print("Local offset (m):", np.round(local, 3).tolist())
+    print("Footprint (m):   ", np.round(camera_footprint(), 3))
+    print("Cells on field:  ", np.round(cells_to_field([(0, 0), (128, 128)], local), 3).tolist())
+
+    print("[DONE] Georeference test complete")
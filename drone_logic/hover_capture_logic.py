@@ -4,59 +4,152 @@ Author: Parth Vishwakarma
 
 Function:
 - Drone hovers at a fixed altitude
-- Waits for stabilization
+- Waits for stabilization (until the camera view is steady, fixed time as timeout)
 - Captures an image
 - Saves image for AI weed detection
+- Reuses one long-lived camera session across hovers
+- Hands frames to the detector in memory; archiving runs in the background
 """
 
 import time
 import cv2
 from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from drone_logic.camera_session import BEST_OF_N, CameraSession
+from drone_logic.frame_handoff import ARCHIVE_FORMAT, FrameArchiver
+from drone_logic.stabilization import SimulatedIMU, StabilizationResult, wait_until_stable
 
 # =========================
 # CONFIG
 # =========================
 HOVER_HEIGHT_METERS = 0.6        # ~2 feet above ground
-STABILIZATION_TIME = 2.0         # seconds
+STABILIZATION_TIME = 2.0         # seconds (max wait when adaptive)
+ADAPTIVE_STABILIZATION = True    # capture as soon as the view is steady
+USE_SIMULATED_IMU = False        # also require the simulated IMU to be quiet
 CAMERA_INDEX = 0                # USB camera / drone camera
+CAMERA_SOURCE = CAMERA_INDEX    # or a video file / image folder for testing
 IMAGE_SAVE_PATH = "ai_model/inference/"
 IMAGE_PREFIX = "hover_capture"
+ARCHIVE_FRAMES = True            # keep a copy of every in-memory capture
+USE_DETECTOR_SERVICE = True      # reuse the warm ai_model.detector_service if running
 
 # =========================
 # DRONE PLACEHOLDER LOGIC
 # =========================
+_imu: Optional[SimulatedIMU] = SimulatedIMU() if USE_SIMULATED_IMU else None
+_stabilization_log: List[StabilizationResult] = []
+
+
 def hover_drone(height):
     """
     Placeholder for drone hover command.
     In real drone: MAVLink / PX4 / ArduPilot command.
     """
     print(f"[INFO] Hovering drone at {height} meters...")
+    if _imu is not None:
+        _imu.reset()
     time.sleep(1)
 
 def stabilize_drone():
     """
     Allow drone to stabilize before image capture.
+    Adaptive: returns once consecutive frames stop moving,
+    or after STABILIZATION_TIME at the latest.
     """
     print("[INFO] Stabilizing drone...")
-    time.sleep(STABILIZATION_TIME)
+
+    if not ADAPTIVE_STABILIZATION:
+        time.sleep(STABILIZATION_TIME)
+        return
+
+    result = wait_until_stable(get_camera_session(), timeout=STABILIZATION_TIME, imu=_imu)
+    _stabilization_log.append(result)
+
+    if result.stable:
+        print(f"[INFO] Stable after {result.elapsed:.2f}s (saved {result.saved:.2f}s)")
+    else:
+        print(f"[WARNING] Not stable after {STABILIZATION_TIME}s (motion {result.motion:.2f}), capturing anyway")
+
+
+def stabilization_savings() -> float:
+    """
+    Total seconds saved by adaptive stabilization so far this mission.
+    """
+    return sum(result.saved for result in _stabilization_log)
+
+# =========================
+# CAMERA SESSION
+# =========================
+_session: Optional[CameraSession] = None
+
+
+def get_camera_session() -> CameraSession:
+    """
+    Opens the camera once and keeps it grabbing for the whole mission.
+    """
+    global _session
+    if _session is None:
+        _session = CameraSession(CAMERA_SOURCE).start()
+    return _session
+
+
+def close_camera_session():
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+_archiver: Optional[FrameArchiver] = None
+
+
+def get_archiver() -> FrameArchiver:
+    """
+    Background writer for captured frames (format: ARCHIVE_FORMAT).
+    """
+    global _archiver
+    if _archiver is None:
+        _archiver = FrameArchiver(IMAGE_SAVE_PATH, ARCHIVE_FORMAT)
+    return _archiver
+
+
+def close_archiver():
+    """
+    Waits for pending archive writes and stops the writer.
+    """
+    global _archiver
+    if _archiver is not None:
+        _archiver.close()
+        _archiver = None
 
 # =========================
 # IMAGE CAPTURE
 # =========================
-def capture_image():
+def capture_frame(archive: bool = ARCHIVE_FRAMES) -> np.ndarray:
     """
-    Captures image from camera and saves it.
+    Captures the sharpest of the next BEST_OF_N frames and returns it
+    as an array. The archive copy is written in the background.
     """
-    cap = cv2.VideoCapture(CAMERA_INDEX)
+    frame = get_camera_session().best_frame(BEST_OF_N)
 
-    if not cap.isOpened():
-        raise RuntimeError("Camera not accessible")
+    if archive:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = get_archiver().submit(frame, f"{IMAGE_PREFIX}_{timestamp}")
+        print(f"[INFO] Frame captured (archiving to {path})")
+    else:
+        print("[INFO] Frame captured")
 
-    ret, frame = cap.read()
-    cap.release()
+    return frame
 
-    if not ret:
-        raise RuntimeError("Failed to capture image")
+
+def capture_image():
+    """
+    Captures image from camera and saves it.
+    Picks the sharpest of the next BEST_OF_N frames.
+    """
+    frame = get_camera_session().best_frame(BEST_OF_N)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{IMAGE_PREFIX}_{timestamp}.png"
@@ -79,10 +172,50 @@ def hover_and_capture():
     image_path = capture_image()
     return image_path
 
+
+def hover_and_capture_frame(archive: bool = ARCHIVE_FRAMES) -> np.ndarray:
+    """
+    Hover → stabilize → capture, returning the frame in memory
+    (no PNG write / re-read before detection).
+    """
+    hover_drone(HOVER_HEIGHT_METERS)
+    stabilize_drone()
+    return capture_frame(archive)
+
+
+_detector = None
+
+
+def get_detector():
+    """
+    Connects to the detector service (or loads the model) once per mission.
+    """
+    global _detector
+    if _detector is None:
+        from ai_model.detector_service import load_detector
+        _detector = load_detector(use_service=USE_DETECTOR_SERVICE)
+    return _detector
+
+
+def hover_and_detect(model=None, archive: bool = ARCHIVE_FRAMES):
+    """
+    Hover → capture → detect. Returns (frame, detections) where detections
+    is the (N, 7) array from ai_model.detector.detect_batch.
+    """
+    from ai_model.detector import detect_batch
+
+    frame = hover_and_capture_frame(archive)
+    return frame, detect_batch(model or get_detector(), [frame])
+
 # =========================
 # TEST RUN
 # =========================
 if __name__ == "__main__":
     print("[START] Hover Capture Test")
     img = hover_and_capture()
+    frame = hover_and_capture_frame()
+    close_camera_session()
+    close_archiver()
     print(f"[DONE] Captured image saved at: {img}")
+    print(f"[DONE] In-memory frame: {frame.shape}")
+    print(f"[DONE] Stabilization time saved: {stabilization_savings():.2f}s")
@@ -0,0 +1,185 @@
+"""
+FarmX - Stabilization Detector
+Author: Parth Vishwakarma
+
+Purpose:
+- Decide when the hovering drone is steady enough to capture
+- Measure motion between consecutive camera frames (frame difference or optical flow)
+- Optionally require a (simulated) IMU to be quiet as well
+- Fall back to the fixed stabilization time as a timeout
+"""
+
+import math
+import time
+from typing import NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from drone_logic.camera_session import CameraSession, FrameTimeout
+
+# =========================
+# CONFIG
+# =========================
+STABILIZATION_TIMEOUT = 2.0     # seconds (the old fixed wait)
+MOTION_METHOD = "diff"          # "diff" (frame difference) or "flow" (optical flow)
+DIFF_THRESHOLD = 2.5            # mean abs gray-level change between frames
+FLOW_THRESHOLD = 0.3            # median flow in pixels (at MOTION_WIDTH)
+STABLE_FRAMES = 3               # consecutive quiet frames required
+MOTION_WIDTH = 160              # frames are downscaled to this width first
+
+IMU_RATE_THRESHOLD = 1.0        # deg/s angular rate counted as still
+
+# =========================
+# FRAME MOTION
+# =========================
+def _prepare(frame: np.ndarray) -> np.ndarray:
+    height, width = frame.shape[:2]
+    if width > MOTION_WIDTH:
+        frame = cv2.resize(
+            frame, (MOTION_WIDTH, int(height * MOTION_WIDTH / width)),
+            interpolation=cv2.INTER_AREA
+        )
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return cv2.GaussianBlur(gray, (3, 3), 0)
+
+
+def frame_motion(previous: np.ndarray, current: np.ndarray, method: str = MOTION_METHOD) -> float:
+    """
+    Motion score between two prepared (small, gray) frames.
+    diff → mean absolute difference; flow → median Farneback flow magnitude.
+    """
+
+    if method == "diff":
+        return float(cv2.absdiff(previous, current).mean())
+
+    if method == "flow":
+        flow = cv2.calcOpticalFlowFarneback(previous, current, None, 0.5, 2, 9, 2, 5, 1.1, 0)
+        return float(np.median(np.linalg.norm(flow, axis=2)))
+
+    raise ValueError(f"Unknown motion method: {method}")
+
+# =========================
+# SIMULATED IMU
+# =========================
+class SimulatedIMU:
+    """
+    Angular rate of a drone settling into hover: a decaying wobble plus
+    sensor noise. Stands in for the flight controller's IMU in tests.
+    """
+
+    def __init__(
+        self,
+        settle_time: float = 1.2,
+        peak_rate_dps: float = 15.0,
+        wobble_hz: float = 2.0,
+        noise_dps: float = 0.2,
+        seed: Optional[int] = None
+    ):
+        self.settle_time = settle_time
+        self.peak_rate_dps = peak_rate_dps
+        self.wobble_hz = wobble_hz
+        self.noise_dps = noise_dps
+        self._rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        """
+        Call when the drone arrives at a new waypoint.
+        """
+        self._start = time.monotonic()
+
+    def angular_rate(self) -> float:
+        t = time.monotonic() - self._start
+        decay = math.exp(-3.0 * t / self.settle_time)
+        wobble = abs(math.cos(2 * math.pi * self.wobble_hz * t))
+
+        return self.peak_rate_dps * decay * wobble + abs(self._rng.normal(0, self.noise_dps))
+
+# =========================
+# STABILIZATION WAIT
+# =========================
+class StabilizationResult(NamedTuple):
+    stable: bool            # False = timed out
+    elapsed: float          # seconds waited
+    saved: float            # seconds saved against the fixed wait
+    motion: float           # last motion score
+    frames: int             # frames examined
+
+
+def wait_until_stable(
+    session: CameraSession,
+    timeout: float = STABILIZATION_TIMEOUT,
+    method: str = MOTION_METHOD,
+    threshold: Optional[float] = None,
+    stable_frames: int = STABLE_FRAMES,
+    imu: Optional[SimulatedIMU] = None,
+    imu_threshold: float = IMU_RATE_THRESHOLD
+) -> StabilizationResult:
+    """
+    Watches new camera frames until `stable_frames` in a row move less
+    than `threshold` (and the IMU, if given, is quiet), or `timeout` passes.
+    A camera failure is raised, not reported as a timeout.
+    """
+
+    if threshold is None:
+        threshold = DIFF_THRESHOLD if method == "diff" else FLOW_THRESHOLD
+
+    start = time.monotonic()
+    deadline = start + timeout
+
+    previous = None
+    motion = float("inf")
+    quiet = 0
+    frames = 0
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        try:
+            session.wait_for_frames(1, timeout=remaining)
+        except FrameTimeout:
+            break
+
+        current = _prepare(session.latest())
+        frames += 1
+
+        if previous is not None:
+            motion = frame_motion(previous, current, method)
+            still = motion < threshold
+            if imu is not None:
+                still = still and imu.angular_rate() < imu_threshold
+            quiet = quiet + 1 if still else 0
+
+            if quiet >= stable_frames:
+                elapsed = time.monotonic() - start
+                return StabilizationResult(True, elapsed, max(0.0, timeout - elapsed), motion, frames)
+
+        previous = current
+
+    return StabilizationResult(False, time.monotonic() - start, 0.0, motion, frames)
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    import sys
+
+    print("[TEST] Stabilization Detector")
+
+    # A single still image replays as a perfectly steady camera
+    source = sys.argv[1] if len(sys.argv) > 1 else 0
+    imu = SimulatedIMU(seed=0)
+
+    with CameraSession(source) as session:
+        for waypoint in range(3):
+            imu.reset()
+            result = wait_until_stable(session, imu=imu)
+            state = "stable" if result.stable else "timeout"
+            print(f"[WAYPOINT {waypoint + 1}] {state} after {result.elapsed:.2f}s "
+                  f"(saved {result.saved:.2f}s, motion {result.motion:.2f})")
+
+    print("[DONE] Stabilization test complete")
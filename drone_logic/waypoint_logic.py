@@ -6,10 +6,24 @@ Purpose:
 - Generate waypoints for full field coverage
 - Move drone step-by-step between hover points
 - Support stop-and-act spraying strategy
+- Plan serpentine (boustrophedon) coverage of a field polygon,
+  spaced from the camera footprint
 """
 
+import math
 import time
-from typing import List, Tuple
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from drone_logic.georeference import (
+    CAMERA_HFOV_DEG,
+    CAMERA_VFOV_DEG,
+    camera_footprint,
+    haversine_m,
+    latlon_to_local,
+    local_to_latlon
+)
 
 # =========================
 # CONFIG
@@ -17,6 +31,7 @@ from typing import List, Tuple
 STEP_DISTANCE_METERS = 1.0      # forward movement after each spray
 HOVER_ALTITUDE = 0.6            # meters (~2 feet)
 MOVE_DELAY = 1.5                # seconds between moves
+TARGET_OVERLAP = 0.2            # fraction of footprint shared by neighbours
 
 # =========================
 # WAYPOINT GENERATION
@@ -28,22 +43,125 @@ def generate_waypoints(
     field_width: int
 ) -> List[Tuple[float, float]]:
     """
-    Generates a simple grid of waypoints.
+    Generates a simple grid of waypoints, STEP_DISTANCE_METERS apart.
+    Rows alternate direction so the drone never flies back empty.
     (For MVP: assumes rectangular field & flat terrain)
     """
 
     waypoints = []
-    lat, lon = start_lat, start_lon
 
     for row in range(field_length):
-        for col in range(field_width):
-            waypoints.append((lat, lon))
-            lon += 0.00001  # mock longitude step
-        lat += 0.00001      # mock latitude step
-        lon = start_lon
+        cols = range(field_width) if row % 2 == 0 else reversed(range(field_width))
+        for col in cols:
+            lat, lon = local_to_latlon(
+                col * STEP_DISTANCE_METERS, row * STEP_DISTANCE_METERS,
+                start_lat, start_lon
+            )
+            waypoints.append((float(lat), float(lon)))
 
     return waypoints
 
+# =========================
+# COVERAGE PLANNER
+# =========================
+def coverage_spacing(
+    altitude: float = HOVER_ALTITUDE,
+    hfov_deg: float = CAMERA_HFOV_DEG,
+    vfov_deg: float = CAMERA_VFOV_DEG,
+    overlap: float = TARGET_OVERLAP
+) -> Tuple[float, float]:
+    """
+    Max (east, north) spacing in meters between hover points so that
+    neighbouring frames overlap by `overlap` of the footprint.
+    """
+
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be in [0, 1)")
+
+    width, height = camera_footprint(altitude, hfov_deg, vfov_deg)
+    return width * (1 - overlap), height * (1 - overlap)
+
+
+def _row_intervals(polygon: np.ndarray, y: float) -> List[Tuple[float, float]]:
+    """
+    Inside-intervals of a horizontal line through a (possibly concave) polygon.
+    """
+
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+    # Half-open rule so a vertex on the line is counted once
+    crosses = (y0 <= y) != (y1 <= y)
+    xs = x0[crosses] + (y - y0[crosses]) * (x1[crosses] - x0[crosses]) / (y1[crosses] - y0[crosses])
+    xs = np.sort(xs)
+
+    return list(zip(xs[0::2].tolist(), xs[1::2].tolist()))
+
+
+def _evenly_spaced(start: float, end: float, max_step: float) -> np.ndarray:
+    """
+    Centers of ceil(length / max_step) equal slots covering [start, end].
+    """
+
+    count = max(1, math.ceil((end - start) / max_step))
+    return start + (np.arange(count) + 0.5) * (end - start) / count
+
+
+def generate_coverage_waypoints(
+    boundary: Sequence[Tuple[float, float]],
+    altitude: float = HOVER_ALTITUDE,
+    hfov_deg: float = CAMERA_HFOV_DEG,
+    vfov_deg: float = CAMERA_VFOV_DEG,
+    overlap: float = TARGET_OVERLAP
+) -> Iterator[Tuple[float, float]]:
+    """
+    Serpentine coverage of a field boundary polygon [(lat, lon), ...].
+
+    Rows run east-west, spaced by the camera footprint, and alternate
+    direction. Waypoints are generated lazily row by row, so large
+    fields never hold the whole plan in memory.
+    """
+
+    origin_lat, origin_lon = boundary[0]
+    polygon = latlon_to_local(
+        [lat for lat, _ in boundary], [lon for _, lon in boundary],
+        origin_lat, origin_lon
+    )
+    step_x, step_y = coverage_spacing(altitude, hfov_deg, vfov_deg, overlap)
+
+    rows = _evenly_spaced(polygon[:, 1].min(), polygon[:, 1].max(), step_y)
+
+    for row, y in enumerate(rows):
+        intervals = _row_intervals(polygon, y)
+        if row % 2 == 1:
+            intervals = intervals[::-1]
+
+        for start, end in intervals:
+            xs = _evenly_spaced(start, end, step_x)
+            if row % 2 == 1:
+                xs = xs[::-1]
+
+            latlon = local_to_latlon(xs, np.full_like(xs, y), origin_lat, origin_lon)
+            for lat, lon in latlon.tolist():
+                yield lat, lon
+
+
+def path_length(waypoints: Iterable[Tuple[float, float]]) -> float:
+    """
+    Total flight distance in meters along the waypoints.
+    Consumes lazily, so it also works on a coverage generator.
+    """
+
+    total = 0.0
+    previous = None
+
+    for lat, lon in waypoints:
+        if previous is not None:
+            total += float(haversine_m(previous[0], previous[1], lat, lon))
+        previous = (lat, lon)
+
+    return total
+
 # =========================
 # DRONE MOVEMENT PLACEHOLDER
 # =========================
@@ -65,18 +183,28 @@ def hover():
 # =========================
 # WAYPOINT EXECUTION
 # =========================
-def execute_waypoints(waypoints: List[Tuple[float, float]]):
+def execute_waypoints(
+    waypoints: Iterable[Tuple[float, float]],
+    on_hover: Optional[Callable[[int, float, float], None]] = None
+):
     """
     Main execution loop for waypoint-based mission.
+    Accepts a list or a lazy coverage generator.
+    `on_hover(index, lat, lon)` runs at each hover point, e.g. capture,
+    detect and FieldMosaic.add_frame(cells, lat, lon).
     """
 
-    print(f"[INFO] Total waypoints: {len(waypoints)}")
+    if hasattr(waypoints, "__len__"):
+        print(f"[INFO] Total waypoints: {len(waypoints)}")
 
     for index, (lat, lon) in enumerate(waypoints):
         print(f"\n[WAYPOINT {index + 1}]")
         move_to_waypoint(lat, lon, HOVER_ALTITUDE)
         hover()
 
+        if on_hover is not None:
+            on_hover(index, lat, lon)
+
         # At this point:
         # → hover_capture.py is called
         # → YOLO inference runs
@@ -100,4 +228,15 @@ if __name__ == "__main__":
 
     execute_waypoints(waypoints)
 
+    # Coverage plan for a small field polygon (lat, lon)
+    field = [
+        (26.21830, 78.18280),
+        (26.21830, 78.18300),
+        (26.21845, 78.18300),
+        (26.21845, 78.18280)
+    ]
+    count = sum(1 for _ in generate_coverage_waypoints(field))
+    length = path_length(generate_coverage_waypoints(field))
+    print(f"\n[PLAN] Coverage: {count} waypoints, {length:.1f} m path")
+
     print("\n[DONE] Waypoint mission completed")
@@ -0,0 +1,43 @@
+"""
+FarmX - Grid Logic Package
+Author: Parth Vishwakarma
+
+Purpose:
+- Lazy re-exports: `import grid_logic` loads nothing, each name imports
+  its module (and numpy / cv2) on first use
+"""
+
+import importlib
+
+_EXPORTS = {
+    "map_boxes_to_grid": "grid_logic.coordinate_mapper",
+    "map_points_to_grid": "grid_logic.coordinate_mapper",
+    "occupancy_grid": "grid_logic.coordinate_mapper",
+    "unique_cells": "grid_logic.coordinate_mapper",
+    "apply_crop_mask": "grid_logic.crop_mask",
+    "rasterize_boxes": "grid_logic.crop_mask",
+    "rasterize_polygons": "grid_logic.crop_mask",
+    "overlay_grid": "grid_logic.grid_generator",
+    "mark_targets": "grid_logic.grid_generator",
+    "generate_grid_visual": "grid_logic.grid_generator",
+    "CoordinateCanvas": "grid_logic.grid_generator",
+    "get_coordinate_canvas": "grid_logic.grid_generator",
+    "cells_to_json": "grid_logic.grid_generator",
+    "cells_to_svg": "grid_logic.grid_generator",
+    "save_vector": "grid_logic.grid_generator",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,10 +6,13 @@ Purpose:
 - Convert YOLO bounding boxes into precise spray coordinates
 - Map image pixels to a 256x256 grid
 - Output weed target points for sprinkler control
+- Map whole arrays of boxes in one vectorized call
 """
 
 from typing import List, Tuple
 
+import numpy as np
+
 # =========================
 # CONFIG
 # =========================
@@ -22,6 +25,95 @@ GRID_SIZE = 256   # 256x256 grid
 # (x_center, y_center, width, height)
 # Image size: (img_width, img_height)
 
+# =========================
+# VECTORIZED CORE
+# =========================
+def map_points_to_grid(
+    points: np.ndarray,
+    img_width: int,
+    img_height: int
+) -> np.ndarray:
+    """
+    Maps an (N, 2) array of pixel points (x, y) to grid cells.
+    Returns an (N, 2) int32 array of (grid_x, grid_y), clamped to the grid.
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    scale = np.array([GRID_SIZE / img_width, GRID_SIZE / img_height])
+
+    cells = np.floor(points * scale)
+    np.clip(cells, 0, GRID_SIZE - 1, out=cells)
+
+    return cells.astype(np.int32)
+
+
+def map_boxes_to_grid(
+    boxes: np.ndarray,
+    img_width: int,
+    img_height: int,
+    box_format: str = "xyxy",
+    unique: bool = True
+) -> np.ndarray:
+    """
+    Maps an (N, 4) array of bounding boxes to the grid cells of their centers.
+
+    box_format:
+    - "xyxy" = (x1, y1, x2, y2) corners (YOLO boxes.xyxy / detector output)
+    - "xywh" = (x_center, y_center, width, height)
+
+    With unique=True duplicate cells are dropped and the result is
+    sorted by (grid_x, grid_y).
+    """
+
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+    if box_format == "xyxy":
+        centers = (boxes[:, :2] + boxes[:, 2:]) * 0.5
+    elif box_format == "xywh":
+        centers = boxes[:, :2]
+    else:
+        raise ValueError(f"Unknown box format: {box_format}")
+
+    cells = map_points_to_grid(centers, img_width, img_height)
+
+    if unique:
+        cells = unique_cells(cells)
+
+    return cells
+
+
+def unique_cells(cells: np.ndarray) -> np.ndarray:
+    """
+    Deduplicates an (N, 2) cell array via its linearized index.
+    Result is sorted by (grid_x, grid_y).
+    """
+
+    cells = np.asarray(cells, dtype=np.int32).reshape(-1, 2)
+    linear = np.unique(cells[:, 0] * GRID_SIZE + cells[:, 1])
+
+    return np.stack([linear // GRID_SIZE, linear % GRID_SIZE], axis=1).astype(np.int32)
+
+
+def occupancy_grid(cells: np.ndarray) -> np.ndarray:
+    """
+    Builds a GRID_SIZE x GRID_SIZE bool bitmap, indexed [grid_y, grid_x].
+    """
+
+    cells = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+    grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=bool)
+    grid[cells[:, 1], cells[:, 0]] = True
+
+    return grid
+
+
+def occupied_cells(grid: np.ndarray) -> np.ndarray:
+    """
+    Inverse of occupancy_grid: returns (N, 2) cells sorted by (grid_x, grid_y).
+    """
+
+    gy, gx = np.nonzero(grid)
+    return unique_cells(np.stack([gx, gy], axis=1))
+
 # =========================
 # CORE LOGIC
 # =========================
@@ -34,16 +126,11 @@ def map_bbox_to_grid(
     Maps YOLO bounding box center to grid coordinates.
     """
 
-    x_center, y_center, _, _ = bbox
-
-    grid_x = int((x_center / img_width) * GRID_SIZE)
-    grid_y = int((y_center / img_height) * GRID_SIZE)
-
-    # Clamp values within grid
-    grid_x = min(max(grid_x, 0), GRID_SIZE - 1)
-    grid_y = min(max(grid_y, 0), GRID_SIZE - 1)
+    grid_x, grid_y = map_boxes_to_grid(
+        [bbox], img_width, img_height, box_format="xywh", unique=False
+    )[0]
 
-    return grid_x, grid_y
+    return int(grid_x), int(grid_y)
 
 
 def extract_spray_coordinates(
@@ -55,13 +142,11 @@ def extract_spray_coordinates(
     Converts all weed detections into spray coordinates.
     """
 
-    spray_points = []
-
-    for bbox in detections:
-        grid_coord = map_bbox_to_grid(bbox, img_width, img_height)
-        spray_points.append(grid_coord)
+    cells = map_boxes_to_grid(
+        detections, img_width, img_height, box_format="xywh", unique=False
+    )
 
-    return spray_points
+    return [tuple(cell) for cell in cells.tolist()]
 
 
 # =========================
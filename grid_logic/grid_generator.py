@@ -6,11 +6,19 @@ Purpose:
 - Generate a 256x256 grid over an image
 - Visualize spray target coordinates
 - Assist in debugging and demo presentation
+- Cache the grid per resolution instead of redrawing 512 lines per image
+- Coordinate canvas kept per resolution, redrawing only the cells that changed
+- Vector output (SVG / JSON) of the cells for dashboards
 """
 
 import cv2
+import json
 import os
-from typing import List, Tuple
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 # =========================
 # CONFIG
@@ -19,28 +27,74 @@ GRID_SIZE = 256
 GRID_COLOR = (200, 200, 200)     # light gray
 TARGET_COLOR = (0, 0, 255)       # red
 TARGET_RADIUS = 3
+GRID_CACHE_SIZE = 4              # (width, height, color) templates kept
+
+# Blank coordinate canvas (white, grid, red dot + "(gx,gy)" label per cell)
+CANVAS_GRID_COLOR = (200, 200, 200)
+CANVAS_DOT_RADIUS = 5
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_SCALE = 0.35
+LABEL_OFFSET = (6, -6)           # label origin relative to the cell center
+
+# =========================
+# CACHED TEMPLATES
+# =========================
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def grid_template(
+    width: int,
+    height: int,
+    color: Tuple[int, int, int] = GRID_COLOR
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws the 256x256 grid once per (width, height, color).
+
+    Returns (mask, template), both (height, width, 3) and read-only:
+    - mask     = True on grid-line pixels
+    - template = grid color on the lines, 0 elsewhere
+    """
+
+    xs = (np.arange(1, GRID_SIZE) * (width / GRID_SIZE)).astype(np.intp)
+    ys = (np.arange(1, GRID_SIZE) * (height / GRID_SIZE)).astype(np.intp)
+
+    mask = np.zeros((height, width, 3), dtype=bool)
+    mask[:, xs[xs < width]] = True
+    mask[ys[ys < height], :] = True
+
+    template = np.zeros((height, width, 3), dtype=np.uint8)
+    template[mask] = np.tile(np.asarray(color, dtype=np.uint8), mask.sum() // 3)
+
+    mask.setflags(write=False)
+    template.setflags(write=False)
+    return mask, template
+
+
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def disk_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pixel offsets (dy, dx) of a filled disk, used to stamp target dots.
+    """
+
+    dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    inside = dx * dx + dy * dy <= radius * radius
+
+    dy, dx = dy[inside], dx[inside]
+    dy.setflags(write=False)
+    dx.setflags(write=False)
+    return dy, dx
 
 # =========================
 # GRID OVERLAY FUNCTION
 # =========================
-def overlay_grid(image):
+def overlay_grid(image, color: Tuple[int, int, int] = GRID_COLOR):
     """
     Draws 256x256 grid on the image.
     """
 
     height, width, _ = image.shape
+    mask, template = grid_template(width, height, tuple(color))
 
-    cell_w = width / GRID_SIZE
-    cell_h = height / GRID_SIZE
-
-    for i in range(1, GRID_SIZE):
-        # Vertical lines
-        x = int(i * cell_w)
-        cv2.line(image, (x, 0), (x, height), GRID_COLOR, 1)
-
-        # Horizontal lines
-        y = int(i * cell_h)
-        cv2.line(image, (0, y), (width, y), GRID_COLOR, 1)
+    # One masked pass over the frame instead of 510 cv2.line calls
+    np.copyto(image, template, where=mask)
 
     return image
 
@@ -49,24 +103,261 @@ def overlay_grid(image):
 # =========================
 def mark_targets(
     image,
-    coordinates: List[Tuple[int, int]]
+    coordinates: List[Tuple[int, int]],
+    radius: int = TARGET_RADIUS,
+    color: Tuple[int, int, int] = TARGET_COLOR
 ):
     """
     Marks spray target grid points on the image.
     """
 
+    cells = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    if len(cells) == 0:
+        return image
+
     height, width, _ = image.shape
     cell_w = width / GRID_SIZE
     cell_h = height / GRID_SIZE
 
-    for gx, gy in coordinates:
-        px = int((gx + 0.5) * cell_w)
-        py = int((gy + 0.5) * cell_h)
+    px = ((cells[:, 0] + 0.5) * cell_w).astype(np.intp)
+    py = ((cells[:, 1] + 0.5) * cell_h).astype(np.intp)
+
+    # Every dot pixel of every target in one index array
+    dy, dx = disk_offsets(radius)
+    xs = (px[:, None] + dx).ravel()
+    ys = (py[:, None] + dy).ravel()
 
-        cv2.circle(image, (px, py), TARGET_RADIUS, TARGET_COLOR, -1)
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    image[ys[inside], xs[inside]] = color
 
     return image
 
+# =========================
+# SPARSE COORDINATE CANVAS
+# =========================
+@lru_cache(maxsize=GRID_CACHE_SIZE)
+def blank_template(
+    width: int,
+    height: int,
+    color: Tuple[int, int, int] = CANVAS_GRID_COLOR
+) -> np.ndarray:
+    """
+    Read-only white canvas with the grid drawn, built once per resolution.
+    """
+
+    mask, template = grid_template(width, height, color)
+    canvas = np.full((height, width, 3), 255, dtype=np.uint8)
+    np.copyto(canvas, template, where=mask)
+
+    canvas.setflags(write=False)
+    return canvas
+
+
+class CoordinateCanvas:
+    """
+    Preallocated blank canvas for one resolution.
+
+    render(cells) diffs the new cells against the last frame and repaints
+    only the boxes of removed and added cells (template, then dots and
+    labels). Cost scales with the number of changed cells, not with the
+    frame size.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        radius: int = CANVAS_DOT_RADIUS,
+        color: Tuple[int, int, int] = TARGET_COLOR
+    ):
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.color = color
+        self.template = blank_template(width, height)
+        self.canvas = self.template.copy()
+        self.drawn: Dict[Tuple[int, int], Tuple[int, int, int, int]] = {}
+
+    def _cell_rect(self, gx: int, gy: int) -> Tuple[int, int, int, int]:
+        """
+        Pixel box (x0, y0, x1, y1) touched by a cell's dot and label.
+        """
+
+        cx = int((gx + 0.5) * (self.width / GRID_SIZE))
+        cy = int((gy + 0.5) * (self.height / GRID_SIZE))
+        (text_w, text_h), baseline = cv2.getTextSize(f"({gx},{gy})", LABEL_FONT, LABEL_SCALE, 1)
+
+        tx, ty = cx + LABEL_OFFSET[0], cy + LABEL_OFFSET[1]
+        x0 = min(cx - self.radius, tx - 1)
+        y0 = min(cy - self.radius, ty - text_h - 1)
+        x1 = max(cx + self.radius, tx + text_w + 1) + 1
+        y1 = max(cy + self.radius, ty + baseline + 1) + 1
+
+        return max(x0, 0), max(y0, 0), min(x1, self.width), min(y1, self.height)
+
+    def _paint(self, box: Tuple[int, int, int, int], cells: List[Tuple[int, int]]):
+        """
+        Restores one box from the template and redraws `cells` clipped to
+        it: dots first, then labels, like a full render would.
+        """
+
+        x0, y0, x1, y1 = box
+        region = self.canvas[y0:y1, x0:x1]
+        region[:] = self.template[y0:y1, x0:x1]
+        if not cells:
+            return
+
+        grid = np.asarray(cells, dtype=np.float64)
+        cx = ((grid[:, 0] + 0.5) * (self.width / GRID_SIZE)).astype(np.intp) - x0
+        cy = ((grid[:, 1] + 0.5) * (self.height / GRID_SIZE)).astype(np.intp) - y0
+
+        dy, dx = disk_offsets(self.radius)
+        xs = (cx[:, None] + dx).ravel()
+        ys = (cy[:, None] + dy).ravel()
+        inside = (xs >= 0) & (xs < x1 - x0) & (ys >= 0) & (ys < y1 - y0)
+        region[ys[inside], xs[inside]] = self.color
+
+        for (gx, gy), px, py in zip(cells, cx.tolist(), cy.tolist()):
+            cv2.putText(
+                region, f"({gx},{gy})", (px + LABEL_OFFSET[0], py + LABEL_OFFSET[1]),
+                LABEL_FONT, LABEL_SCALE, (0, 0, 0), 1, cv2.LINE_AA
+            )
+
+    def render(self, cells, copy: bool = False) -> np.ndarray:
+        """
+        Canvas showing exactly `cells`. Without copy, the returned array is
+        reused by the next render() call.
+        """
+
+        wanted = {(int(gx), int(gy)) for gx, gy in np.asarray(cells).reshape(-1, 2).tolist()}
+
+        dirty = [self.drawn.pop(cell) for cell in list(self.drawn) if cell not in wanted]
+        for cell in wanted:
+            if cell not in self.drawn:
+                self.drawn[cell] = self._cell_rect(*cell)
+                dirty.append(self.drawn[cell])
+
+        if dirty:
+            keys = sorted(self.drawn)
+            rects = np.array([self.drawn[k] for k in keys], dtype=np.int64).reshape(-1, 4)
+
+            # Each dirty box is repainted with every cell that touches it,
+            # so overlapping dots and labels come out as in a full redraw
+            for box in dirty:
+                x0, y0, x1, y1 = box
+                touching = np.flatnonzero(
+                    (rects[:, 0] < x1) & (x0 < rects[:, 2]) & (rects[:, 1] < y1) & (y0 < rects[:, 3])
+                )
+                self._paint(box, [keys[i] for i in touching])
+
+        return self.canvas.copy() if copy else self.canvas
+
+    def clear(self):
+        self.canvas[:] = self.template
+        self.drawn.clear()
+
+
+_canvases = threading.local()
+
+
+def get_coordinate_canvas(width: int, height: int) -> CoordinateCanvas:
+    """
+    This thread's canvas for a resolution (pipeline write workers each
+    keep their own, so frames never share a buffer across threads).
+    """
+
+    cache = getattr(_canvases, "cache", None)
+    if cache is None:
+        cache = _canvases.cache = {}
+
+    canvas = cache.get((width, height))
+    if canvas is None:
+        if len(cache) >= GRID_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        canvas = cache[(width, height)] = CoordinateCanvas(width, height)
+
+    return canvas
+
+# =========================
+# VECTOR OUTPUT
+# =========================
+def cells_to_json(
+    cells,
+    width: int,
+    height: int,
+    spray_time: Optional[Sequence[float]] = None
+) -> Dict:
+    """
+    Grid cells as a JSON-ready dict (no pixels).
+    """
+
+    data = {
+        "grid": GRID_SIZE,
+        "width": width,
+        "height": height,
+        "cells": np.asarray(cells, dtype=np.int64).reshape(-1, 2).tolist()
+    }
+    if spray_time is not None:
+        data["spray_time"] = [round(float(t), 3) for t in spray_time]
+
+    return data
+
+
+def cells_to_svg(
+    cells,
+    width: int,
+    height: int,
+    labels: bool = True,
+    radius: int = CANVAS_DOT_RADIUS
+) -> str:
+    """
+    SVG of the coordinate canvas: the grid is one <pattern>, then one
+    <circle> (and optional <text>) per cell.
+    """
+
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2).tolist()
+    cell_w, cell_h = width / GRID_SIZE, height / GRID_SIZE
+    grid = "#%02x%02x%02x" % CANVAS_GRID_COLOR[::-1]
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+        f'<defs><pattern id="grid" width="{cell_w:.4f}" height="{cell_h:.4f}" patternUnits="userSpaceOnUse">'
+        f'<path d="M {cell_w:.4f} 0 L 0 0 0 {cell_h:.4f}" fill="none" stroke="{grid}" stroke-width="1"/>'
+        f'</pattern></defs>',
+        '<rect width="100%" height="100%" fill="white"/>',
+        '<rect width="100%" height="100%" fill="url(#grid)"/>',
+        '<g fill="red">'
+    ]
+
+    for gx, gy in cells:
+        parts.append(f'<circle cx="{(gx + 0.5) * cell_w:.1f}" cy="{(gy + 0.5) * cell_h:.1f}" r="{radius}"/>')
+    parts.append("</g>")
+
+    if labels and cells:
+        parts.append('<g font-family="sans-serif" font-size="9" fill="black">')
+        for gx, gy in cells:
+            x = (gx + 0.5) * cell_w + LABEL_OFFSET[0]
+            y = (gy + 0.5) * cell_h + LABEL_OFFSET[1]
+            parts.append(f'<text x="{x:.1f}" y="{y:.1f}">({gx},{gy})</text>')
+        parts.append("</g>")
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def save_vector(path: str, cells, width: int, height: int, spray_time=None):
+    """
+    Writes .svg or .json from the file extension.
+    """
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        if path.endswith(".svg"):
+            f.write(cells_to_svg(cells, width, height))
+        else:
+            json.dump(cells_to_json(cells, width, height, spray_time), f)
+
 # =========================
 # MAIN FUNCTION
 # =========================
@@ -97,6 +388,12 @@ def generate_grid_visual(
 if __name__ == "__main__":
     print("[TEST] Grid Generator")
 
+    canvas = get_coordinate_canvas(1024, 576)
+    canvas.render([(120, 80), (200, 140)])
+    canvas.render([(120, 80), (50, 220)])       # repaints two cells only
+    print(f"Coordinate canvas: {len(canvas.drawn)} cell(s) drawn")
+    print(f"SVG: {len(cells_to_svg(list(canvas.drawn), 1024, 576))} bytes")
+
     test_image = "ai_model/inference/test.png"
     test_coordinates = [(120, 80), (200, 140), (50, 220)]
 
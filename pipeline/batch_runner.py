@@ -0,0 +1,282 @@
+"""
+FarmX - Batch Pipeline Runner
+Author: Parth Vishwakarma
+
+Purpose:
+- Run survey folders through a multi-stage pipeline instead of one image at a time
+- Overlap disk reads, batched YOLO inference, grid mapping, output writes and spraying
+- Keep memory flat with bounded queues between stages
+- Report per-stage throughput at the end of a run
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# =========================
+# CONFIG
+# =========================
+BATCH_SIZE = 8          # images per YOLO forward pass
+READ_WORKERS = 4        # threads decoding images from disk
+WRITE_WORKERS = 2       # threads encoding / saving outputs
+QUEUE_SIZE = 32         # max items waiting between two stages
+
+STAGES = ("read", "infer", "map", "write", "actuate")
+
+_STOP = object()        # end-of-stream marker passed between stages
+
+# =========================
+# STAGE STATISTICS
+# =========================
+class StageStats:
+    """
+    Item count and busy time of one pipeline stage (summed over its workers).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, items: int, seconds: float):
+        with self._lock:
+            self.items += items
+            self.busy_seconds += seconds
+
+    def throughput(self) -> float:
+        """
+        Items per second of busy time for a single worker.
+        """
+        if self.busy_seconds == 0:
+            return 0.0
+        return self.items / self.busy_seconds
+
+
+def print_stats(stats: Dict[str, StageStats], wall_seconds: float, images: int):
+    """
+    Prints per-stage throughput and overall images/sec.
+    """
+
+    print("\n[STATS] Pipeline throughput")
+    for name in STAGES:
+        stage = stats[name]
+        print(
+            f"[STATS] {name:<8} {stage.items:>6} items "
+            f"{stage.busy_seconds:>8.2f} s busy "
+            f"{stage.throughput():>8.1f} items/s"
+        )
+
+    rate = images / wall_seconds if wall_seconds > 0 else 0.0
+    print(f"[STATS] total    {images:>6} images {wall_seconds:>8.2f} s wall {rate:>8.1f} images/s")
+
+# =========================
+# PIPELINE
+# =========================
+def run_pipeline(
+    image_paths: Iterable[str],
+    read_image: Callable[[str], Optional[object]],
+    infer_batch: Callable[[List[object]], List[object]],
+    map_detections: Callable[[object, object], object],
+    write_outputs: Callable[[str, object, object], None],
+    actuate: Callable[[str, object], None],
+    batch_size: int = BATCH_SIZE,
+    read_workers: int = READ_WORKERS,
+    write_workers: int = WRITE_WORKERS,
+    queue_size: int = QUEUE_SIZE
+) -> Dict[str, StageStats]:
+    """
+    Runs every image through read → infer → map → write / actuate.
+
+    - read_image(path) returns an image, or None to skip the file
+    - infer_batch(images) returns one detection result per image
+    - map_detections(image, detections) returns the spray targets
+    - write_outputs(path, image, targets) saves the frame outputs
+    - actuate(path, targets) sends the targets to the sprinkler (called in order)
+
+    Reading and writing use thread pools; inference, mapping and actuation
+    each run on a single thread. The first stage error aborts the run and
+    is re-raised once all threads have stopped.
+    """
+
+    if batch_size < 1 or read_workers < 1 or write_workers < 1:
+        raise ValueError("batch_size and worker counts must be >= 1")
+
+    read_q = queue.Queue(maxsize=queue_size)
+    infer_q = queue.Queue(maxsize=queue_size)
+    write_q = queue.Queue(maxsize=queue_size)
+    actuate_q = queue.Queue(maxsize=queue_size)
+
+    stats = {name: StageStats(name) for name in STAGES}
+    errors = []
+    abort = threading.Event()
+
+    paths = iter(image_paths)
+    paths_lock = threading.Lock()
+
+    def fail(exc: Exception):
+        errors.append(exc)
+        abort.set()
+
+    # ---- read: N workers pulling from a shared path iterator ----
+    def reader():
+        try:
+            while not abort.is_set():
+                with paths_lock:
+                    path = next(paths, None)
+                if path is None:
+                    break
+
+                start = time.perf_counter()
+                image = read_image(path)
+                stats["read"].record(1, time.perf_counter() - start)
+
+                if image is not None:
+                    read_q.put((path, image))
+        except Exception as exc:
+            fail(exc)
+        finally:
+            read_q.put(_STOP)
+
+    # ---- infer: collect frames into batches, one forward pass each ----
+    def inferencer():
+        running = read_workers
+        batch = []
+
+        while running:
+            item = read_q.get()
+            if item is _STOP:
+                running -= 1
+            else:
+                batch.append(item)
+
+            if batch and (len(batch) >= batch_size or not running):
+                if not abort.is_set():
+                    try:
+                        start = time.perf_counter()
+                        results = infer_batch([image for _, image in batch])
+                        stats["infer"].record(len(batch), time.perf_counter() - start)
+
+                        for (path, image), detections in zip(batch, results):
+                            infer_q.put((path, image, detections))
+                    except Exception as exc:
+                        fail(exc)
+                batch = []
+
+        infer_q.put(_STOP)
+
+    # ---- map: detections → spray targets ----
+    def mapper():
+        while True:
+            item = infer_q.get()
+            if item is _STOP:
+                break
+            if abort.is_set():
+                continue
+
+            path, image, detections = item
+            try:
+                start = time.perf_counter()
+                targets = map_detections(image, detections)
+                stats["map"].record(1, time.perf_counter() - start)
+            except Exception as exc:
+                fail(exc)
+                continue
+
+            write_q.put((path, image, targets))
+            actuate_q.put((path, targets))
+
+        for _ in range(write_workers):
+            write_q.put(_STOP)
+        actuate_q.put(_STOP)
+
+    # ---- write: N workers saving overlays / coordinate files ----
+    def writer():
+        while True:
+            item = write_q.get()
+            if item is _STOP:
+                break
+            if abort.is_set():
+                continue
+
+            path, image, targets = item
+            try:
+                start = time.perf_counter()
+                write_outputs(path, image, targets)
+                stats["write"].record(1, time.perf_counter() - start)
+            except Exception as exc:
+                fail(exc)
+
+    # ---- actuate: single thread, frames sprayed in arrival order ----
+    def actuator():
+        while True:
+            item = actuate_q.get()
+            if item is _STOP:
+                break
+            if abort.is_set():
+                continue
+
+            path, targets = item
+            try:
+                start = time.perf_counter()
+                actuate(path, targets)
+                stats["actuate"].record(1, time.perf_counter() - start)
+            except Exception as exc:
+                fail(exc)
+
+    threads = (
+        [threading.Thread(target=reader, name=f"read-{i}") for i in range(read_workers)]
+        + [threading.Thread(target=inferencer, name="infer")]
+        + [threading.Thread(target=mapper, name="map")]
+        + [threading.Thread(target=writer, name=f"write-{i}") for i in range(write_workers)]
+        + [threading.Thread(target=actuator, name="actuate")]
+    )
+
+    wall_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - wall_start
+
+    print_stats(stats, wall_seconds, stats["map"].items)
+
+    if errors:
+        raise errors[0]
+
+    return stats
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Batch Pipeline Runner")
+
+    def fake_read(path):
+        time.sleep(0.01)
+        return path
+
+    def fake_infer(images):
+        time.sleep(0.02)
+        return [[(10, 10, 20, 20)] for _ in images]
+
+    def fake_map(image, detections):
+        return [(x1 // 4, y1 // 4) for x1, y1, _, _ in detections]
+
+    def fake_write(path, image, targets):
+        time.sleep(0.01)
+
+    def fake_actuate(path, targets):
+        time.sleep(0.005)
+
+    run_pipeline(
+        [f"frame_{i:04d}.jpg" for i in range(64)],
+        fake_read,
+        fake_infer,
+        fake_map,
+        fake_write,
+        fake_actuate
+    )
+
+    print("\n[DONE] Pipeline test complete")
@@ -0,0 +1,263 @@
+"""
+FarmX - Offline Benchmark
+Author: Parth Vishwakarma
+
+Purpose:
+- Run the full chain offline over the labelled valid/ and test/ splits:
+  decode → detect → grid map → wind compensation → spray planning with
+  the simulated actuator
+- Per-stage latency percentiles and images/sec
+- Grid-cell precision / recall against the polygon ground truth
+- Simulated spray time per frame
+- Machine-readable JSON report to track regressions between builds
+
+Usage:
+    python -m pipeline.benchmark --splits valid test --json bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from ai_model.class_policy import CLASS_POLICY, PolicyTally, apply_policy, merge_cells
+from ai_model.detector import COL_BOX, COL_CLS, CONF_THRESHOLD, MODEL_PATH, detect_batch, load_model
+from ai_model.labels import DATASET_DIR, label_path_for, read_polygons
+from ai_model.sliced_inference import detect_sliced
+from grid_logic.coordinate_mapper import GRID_SIZE, map_boxes_to_grid
+from grid_logic.crop_mask import CROP_CLASS, apply_crop_mask, rasterize_boxes
+from sprinkler.actuators import SimulatedBackend
+from sprinkler.sprinkler_controller import spray_targets
+from sprinkler.wind_compensation import compensate_targets
+
+# =========================
+# CONFIG
+# =========================
+SPLITS = ("valid", "test")
+BENCH_STAGES = ("decode", "detect", "map", "wind", "spray")
+PERCENTILES = (50, 90, 99)
+
+WIND_SPEED_MPS = 1.5        # fixed wind applied during the run
+WIND_DIRECTION_DEG = 45.0
+
+# =========================
+# GROUND TRUTH
+# =========================
+def object_raster(polygons: List[np.ndarray]) -> np.ndarray:
+    """
+    int32 grid [grid_y, grid_x] holding 1 + object index per covered cell
+    (0 = background). Later objects overwrite earlier ones where they overlap.
+    """
+
+    raster = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.int32)
+    shift = 3
+    for idx, polygon in enumerate(polygons):
+        pts = np.round(np.asarray(polygon) * GRID_SIZE * (1 << shift)).astype(np.int32)
+        cv2.fillPoly(raster, [pts], idx + 1, lineType=cv2.LINE_8, shift=shift)
+        cv2.polylines(raster, [pts], True, idx + 1, lineType=cv2.LINE_8, shift=shift)
+
+    return raster
+
+
+def score_cells(cells: np.ndarray, gt_classes: np.ndarray, polygons: List[np.ndarray]) -> Dict[str, int]:
+    """
+    Spray cells vs ground truth:
+    - a cell is correct if it lies on a weed the policy sprays
+    - a weed is found if at least one cell lies on it
+    - crop_hits counts cells landing on crop
+    """
+
+    cells = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+    spray = np.array([CLASS_POLICY.get(int(c), (False, 0.0))[0] for c in gt_classes], dtype=bool)
+
+    raster = object_raster(polygons)
+    hit = raster[cells[:, 1], cells[:, 0]] - 1          # object index or -1
+
+    on_object = hit >= 0
+    hit_spray = np.zeros(len(hit), dtype=bool)
+    hit_spray[on_object] = spray[hit[on_object]]
+
+    crop = np.zeros(len(hit), dtype=bool)
+    crop[on_object] = gt_classes[hit[on_object]] == CROP_CLASS
+
+    return {
+        "cells": len(cells),
+        "correct_cells": int(hit_spray.sum()),
+        "weeds": int(spray.sum()),
+        "found_weeds": len(np.unique(hit[hit_spray])),
+        "crop_hits": int(crop.sum())
+    }
+
+# =========================
+# BENCHMARK
+# =========================
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+
+    ms = np.asarray(values) * 1000
+    report = {f"p{p}_ms": round(float(np.percentile(ms, p)), 3) for p in PERCENTILES}
+    report["mean_ms"] = round(float(ms.mean()), 3)
+    return report
+
+
+def run_split(
+    model,
+    split: str,
+    limit: int = 0,
+    sliced: bool = False,
+    crop_exclusion: bool = True,
+    dataset_dir: str = DATASET_DIR
+) -> Dict:
+    image_dir = os.path.join(dataset_dir, split, "images")
+    names = sorted(os.listdir(image_dir))
+    if limit:
+        names = names[:limit]
+
+    timings: Dict[str, List[float]] = {stage: [] for stage in BENCH_STAGES}
+    totals = {"cells": 0, "correct_cells": 0, "weeds": 0, "found_weeds": 0, "crop_hits": 0}
+    spray_seconds: List[float] = []
+    actuation_seconds: List[float] = []
+    tally = PolicyTally()
+    backend = SimulatedBackend()
+    images = 0
+
+    start_wall = time.perf_counter()
+
+    for name in names:
+        path = os.path.join(image_dir, name)
+
+        t0 = time.perf_counter()
+        frame = cv2.imread(path)
+        t1 = time.perf_counter()
+        if frame is None:
+            continue
+        height, width = frame.shape[:2]
+
+        if sliced:
+            detections = detect_sliced(model, frame, conf=CONF_THRESHOLD)
+        else:
+            detections = detect_batch(model, [frame], conf=CONF_THRESHOLD)
+        result = apply_policy(detections)
+        t2 = time.perf_counter()
+
+        cells = map_boxes_to_grid(result.targets[:, COL_BOX], width, height, unique=False)
+        spray_time = result.spray_time
+        crops = detections[detections[:, COL_CLS] == CROP_CLASS]
+        if crop_exclusion and len(crops) and len(cells):
+            excluded = apply_crop_mask(cells, spray_time, rasterize_boxes(crops[:, COL_BOX], width, height))
+            cells, spray_time = excluded.cells, excluded.spray_time
+        cells, spray_time = merge_cells(cells, spray_time)
+        t3 = time.perf_counter()
+
+        compensated = [tuple(c) for c in compensate_targets(cells, WIND_SPEED_MPS, WIND_DIRECTION_DEG).tolist()]
+        t4 = time.perf_counter()
+
+        # One job per frame, as in the primary script; the servos start
+        # where the previous frame left them
+        clock, sprayed = backend.clock, backend.spray_time
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            spray_targets(compensated, backend=backend, spray_time=spray_time)
+        t5 = time.perf_counter()
+
+        for stage, seconds in zip(BENCH_STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4)):
+            timings[stage].append(seconds)
+
+        # Accuracy of the cells sent to the sprinkler (before wind offsets)
+        gt_classes, polygons = read_polygons(label_path_for(path))
+        for key, value in score_cells(cells, gt_classes, polygons).items():
+            totals[key] += value
+
+        spray_seconds.append(backend.spray_time - sprayed)
+        actuation_seconds.append(backend.clock - clock)
+        tally.update(result)
+        images += 1
+
+    wall = time.perf_counter() - start_wall
+
+    return {
+        "images": images,
+        "wall_seconds": round(wall, 3),
+        "images_per_second": round(images / wall, 3) if wall > 0 else 0.0,
+        "stages": {stage: _percentiles(values) for stage, values in timings.items()},
+        "cell_precision": round(totals["correct_cells"] / max(totals["cells"], 1), 4),
+        "cell_recall": round(totals["found_weeds"] / max(totals["weeds"], 1), 4),
+        "crop_hit_rate": round(totals["crop_hits"] / max(totals["cells"], 1), 4),
+        "counts": totals,
+        "spray_seconds_per_frame": {
+            "mean": round(float(np.mean(spray_seconds)), 3) if spray_seconds else 0.0,
+            "p90": round(float(np.percentile(spray_seconds, 90)), 3) if spray_seconds else 0.0,
+        },
+        "actuation_seconds_per_frame": {
+            "mean": round(float(np.mean(actuation_seconds)), 3) if actuation_seconds else 0.0,
+            "p90": round(float(np.percentile(actuation_seconds, 90)), 3) if actuation_seconds else 0.0,
+        },
+        "classes": tally.summary()
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FarmX offline benchmark")
+    parser.add_argument("--splits", nargs="+", default=list(SPLITS))
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--limit", type=int, default=0, help="max images per split (0 = all)")
+    parser.add_argument("--sliced", action="store_true", help="use sliced inference")
+    parser.add_argument("--no-crop-exclusion", action="store_true")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    print("[START] FarmX Benchmark")
+
+    model = load_model(args.model)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "model": args.model,
+            "sliced": args.sliced,
+            "crop_exclusion": not args.no_crop_exclusion,
+            "wind": [WIND_SPEED_MPS, WIND_DIRECTION_DEG],
+            "limit": args.limit
+        },
+        "splits": {}
+    }
+
+    for split in args.splits:
+        result = run_split(model, split, args.limit, args.sliced, not args.no_crop_exclusion)
+        report["splits"][split] = result
+
+        print(f"[{split.upper()}] {result['images']} images, {result['images_per_second']:.2f} images/s, "
+              f"cell precision {result['cell_precision']:.3f}, recall {result['cell_recall']:.3f}, "
+              f"spray {result['spray_seconds_per_frame']['mean']:.2f} s/frame")
+        for stage in BENCH_STAGES:
+            stats = result["stages"][stage]
+            if stats:
+                print(f"   {stage:<7} p50 {stats['p50_ms']:8.2f} ms  p90 {stats['p90_ms']:8.2f} ms  "
+                      f"p99 {stats['p99_ms']:8.2f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Report written to {args.json}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    print("[DONE] Benchmark complete")
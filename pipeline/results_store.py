@@ -0,0 +1,526 @@
+"""
+FarmX - Mission Results Store
+Author: Parth Vishwakarma
+
+Purpose:
+- One append-only file per mission instead of two PNGs and a .txt per frame
+- Per-frame detections, spray cells and metadata packed into chunked arrays
+- Frame index written at close (rebuilt by a scan after a crash), so any
+  frame loads by ID or name without reading the rest of the file
+- Grid overlays rendered on demand, only for frames someone asks to view
+
+File layout (all records appended, little-endian arrays):
+    record  = magic (4s) | header length (u32) | payload length (u64) | JSON header | payload
+    FXCK    chunk of up to CHUNK_FRAMES frames: frames table, detections, cells, spray times
+    FXIX    frame index (always the last record)
+    trailer = b"FXRINDEX" | offset of the FXIX record (u64)
+
+Usage:
+    python -m pipeline.results_store --list                     # latest mission in output/
+    python -m pipeline.results_store output/mission_20261018_101500.fxr --frame 0004.jpg --image-dir images --out view.png
+"""
+
+import argparse
+import glob
+import json
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+RESULTS_DIR = "output"
+MISSION_PREFIX = "mission"   # files are <prefix>_<YYYYmmdd_HHMMSS>.fxr
+CHUNK_FRAMES = 64           # frames buffered per chunk record
+CACHED_CHUNKS = 8           # decoded chunks kept by the reader
+
+DETECTION_WIDTH = 7         # ai_model.detector.DETECTION_COLUMNS
+
+CHUNK_MAGIC = b"FXCK"
+INDEX_MAGIC = b"FXIX"
+TRAILER_MAGIC = b"FXRINDEX"
+
+_RECORD = struct.Struct("<4sIQ")
+_TRAILER = struct.Struct("<8sQ")
+
+FRAME_DTYPE = np.dtype([
+    ("frame_id", "<i8"),
+    ("width", "<i4"),
+    ("height", "<i4"),
+    ("timestamp", "<f8"),
+    ("det_start", "<i4"),
+    ("det_count", "<i4"),
+    ("cell_start", "<i4"),
+    ("cell_count", "<i4"),
+])
+
+INDEX_DTYPE = np.dtype([("offset", "<i8"), ("slot", "<i4")])
+
+# Payload arrays of a chunk, in file order
+_ARRAYS = (
+    ("frames", FRAME_DTYPE, ()),
+    ("detections", np.dtype("<f4"), (DETECTION_WIDTH,)),
+    ("cells", np.dtype("<i2"), (2,)),
+    ("spray_time", np.dtype("<f4"), ()),
+)
+
+# =========================
+# RECORDS
+# =========================
+class FrameResult(NamedTuple):
+    frame_id: int
+    name: str
+    width: int
+    height: int
+    timestamp: float
+    detections: np.ndarray      # (N, 7) DETECTION_COLUMNS
+    cells: np.ndarray           # (M, 2) grid cells sent to the sprinkler
+    spray_time: np.ndarray      # (M,) seconds per cell
+    meta: Dict
+
+
+def _write_record(f, magic: bytes, header: Dict, payload: bytes = b"") -> int:
+    offset = f.tell()
+    encoded = json.dumps(header).encode()
+    f.write(_RECORD.pack(magic, len(encoded), len(payload)))
+    f.write(encoded)
+    f.write(payload)
+    return offset
+
+
+def _read_header(buffer, offset: int):
+    """
+    (magic, header, payload start, record end) of the record at `offset`,
+    or None if it is truncated / not a record.
+    """
+
+    if offset + _RECORD.size > len(buffer):
+        return None
+
+    magic, header_len, payload_len = _RECORD.unpack_from(buffer, offset)
+    if magic not in (CHUNK_MAGIC, INDEX_MAGIC):
+        return None
+
+    start = offset + _RECORD.size
+    end = start + header_len + payload_len
+    if end > len(buffer):
+        return None
+
+    header = json.loads(bytes(buffer[start:start + header_len]))
+    return magic, header, start + header_len, end
+
+
+def _scan(buffer) -> Tuple[List[int], int]:
+    """
+    Chunk offsets and the end of the last complete record (crash recovery).
+    """
+
+    chunks, offset = [], 0
+    while True:
+        record = _read_header(buffer, offset)
+        if record is None:
+            return chunks, offset
+        if record[0] == CHUNK_MAGIC:
+            chunks.append(offset)
+        offset = record[3]
+
+
+def _load_index(buffer):
+    """
+    (index array, names, index record offset) from the trailer, or None.
+    """
+
+    if len(buffer) < _TRAILER.size:
+        return None
+
+    magic, offset = _TRAILER.unpack_from(buffer, len(buffer) - _TRAILER.size)
+    if magic != TRAILER_MAGIC:
+        return None
+
+    record = _read_header(buffer, offset)
+    if record is None or record[0] != INDEX_MAGIC:
+        return None
+
+    _, header, start, end = record
+    index = np.frombuffer(buffer, INDEX_DTYPE, header["frames"], start)
+    return index, header["names"], offset
+
+
+def _decode_chunk(buffer, offset: int):
+    _, header, start, _ = _read_header(buffer, offset)
+
+    arrays = {}
+    for key, dtype, tail in _ARRAYS:
+        count = header["counts"][key]
+        arrays[key] = np.frombuffer(buffer, dtype, count * int(np.prod(tail)), start).reshape((count,) + tail)
+        start += arrays[key].nbytes
+
+    return header, arrays
+
+
+def _index_chunks(buffer, chunks: List[int]):
+    """
+    Rebuilds the frame index by reading every chunk header.
+    """
+
+    index, names = [], []
+    for offset in chunks:
+        header, arrays = _decode_chunk(buffer, offset)
+        for slot, frame_id in enumerate(arrays["frames"]["frame_id"].tolist()):
+            index.append((frame_id, offset, slot))
+            names.append((frame_id, header["names"][slot]))
+
+    table = np.zeros(len(index), dtype=INDEX_DTYPE)
+    ordered_names = [""] * len(index)
+    for frame_id, offset, slot in index:
+        table[frame_id] = (offset, slot)
+    for frame_id, name in names:
+        ordered_names[frame_id] = name
+
+    return table, ordered_names
+
+# =========================
+# MISSION FILES
+# =========================
+def mission_name(prefix: str = MISSION_PREFIX) -> str:
+    """
+    New mission name from the current time, e.g. mission_20261018_101500.
+    """
+    return time.strftime(f"{prefix}_%Y%m%d_%H%M%S")
+
+
+def mission_path(name: Optional[str] = None, results_dir: str = RESULTS_DIR) -> str:
+    return os.path.join(results_dir, f"{name or mission_name()}.fxr")
+
+
+def latest_mission(results_dir: str = RESULTS_DIR, prefix: str = MISSION_PREFIX) -> Optional[str]:
+    """
+    Path of the newest mission file, or None.
+    """
+    paths = sorted(glob.glob(os.path.join(results_dir, f"{prefix}_*.fxr")))
+    return paths[-1] if paths else None
+
+# =========================
+# WRITER
+# =========================
+class ResultsWriter:
+    """
+    Appends frames to a new mission file. Thread-safe; frames are buffered
+    and written CHUNK_FRAMES at a time. An existing file is only continued
+    with resume=True (e.g. after a crash); otherwise it is an error.
+    """
+
+    def __init__(self, path: str, chunk_frames: int = CHUNK_FRAMES, resume: bool = False):
+        if os.path.exists(path) and os.path.getsize(path) > 0 and not resume:
+            raise FileExistsError(f"{path} already holds a mission; pass resume=True to continue it")
+
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.lock = threading.Lock()
+        self._pending: List[Tuple] = []
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.index = np.empty(0, dtype=INDEX_DTYPE)
+        self.names: List[str] = []
+        end = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            buffer = np.memmap(path, dtype=np.uint8, mode="r")
+            loaded = _load_index(buffer)
+            if loaded is not None:
+                index, self.names, end = loaded
+                self.index = index.copy()
+            else:
+                chunks, end = _scan(buffer)
+                self.index, self.names = _index_chunks(buffer, chunks)
+                print(f"[WARNING] {path}: no index, recovered {len(self.names)} frame(s) by scan")
+            del buffer
+
+        # Drop the old index + trailer (or a torn tail) and keep appending
+        self.f = open(path, "r+b" if os.path.exists(path) else "w+b")
+        self.f.truncate(end)
+        self.f.seek(end)
+
+        self._new_index: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(
+        self,
+        name: str,
+        width: int,
+        height: int,
+        detections: np.ndarray,
+        cells: np.ndarray,
+        spray_time: np.ndarray,
+        meta: Optional[Dict] = None
+    ) -> int:
+        """
+        Queues one frame. Returns its frame ID.
+        """
+
+        detections = np.asarray(detections, dtype="<f4").reshape(-1, DETECTION_WIDTH)
+        cells = np.asarray(cells, dtype="<i2").reshape(-1, 2)
+        spray_time = np.broadcast_to(np.asarray(spray_time, dtype="<f4"), len(cells))
+
+        with self.lock:
+            frame_id = len(self.names)
+            self.names.append(name)
+            self._pending.append(
+                (frame_id, name, width, height, time.time(), detections, cells, spray_time, meta or {})
+            )
+            if len(self._pending) >= self.chunk_frames:
+                self._write_chunk()
+
+        return frame_id
+
+    def _write_chunk(self):
+        if not self._pending:
+            return
+
+        frames = np.zeros(len(self._pending), dtype=FRAME_DTYPE)
+        det_start = cell_start = 0
+        for i, (frame_id, _, width, height, stamp, dets, cells, _, _) in enumerate(self._pending):
+            frames[i] = (frame_id, width, height, stamp, det_start, len(dets), cell_start, len(cells))
+            det_start += len(dets)
+            cell_start += len(cells)
+
+        arrays = {
+            "frames": frames,
+            "detections": np.concatenate([p[5] for p in self._pending]),
+            "cells": np.concatenate([p[6] for p in self._pending]),
+            "spray_time": np.concatenate([p[7] for p in self._pending]),
+        }
+        header = {
+            "names": [p[1] for p in self._pending],
+            "meta": [p[8] for p in self._pending],
+            "counts": {key: len(arrays[key]) for key, _, _ in _ARRAYS}
+        }
+        payload = b"".join(np.ascontiguousarray(arrays[key]).tobytes() for key, _, _ in _ARRAYS)
+
+        offset = _write_record(self.f, CHUNK_MAGIC, header, payload)
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+        self._new_index.extend((offset, slot) for slot in range(len(self._pending)))
+        self._pending = []
+
+    def flush(self):
+        with self.lock:
+            self._write_chunk()
+
+    def close(self):
+        """
+        Writes the last chunk, the frame index and the trailer.
+        """
+
+        with self.lock:
+            self._write_chunk()
+
+            index = np.concatenate([self.index, np.array(self._new_index, dtype=INDEX_DTYPE)])
+            offset = _write_record(
+                self.f, INDEX_MAGIC, {"frames": len(index), "names": self.names}, index.tobytes()
+            )
+            self.f.write(_TRAILER.pack(TRAILER_MAGIC, offset))
+            self.f.flush()
+            os.fsync(self.f.fileno())
+            self.f.close()
+
+        print(f"[INFO] Results store closed: {self.path} ({len(index)} frame(s))")
+
+# =========================
+# READER
+# =========================
+class ResultsReader:
+    """
+    Memory-mapped reader. frame(id) and find(name) touch only the index and
+    one chunk; arrays are views into the mapped file.
+    """
+
+    def __init__(self, path: str, cached_chunks: int = CACHED_CHUNKS):
+        self.path = path
+        self.buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        self.cached_chunks = cached_chunks
+        self._cache: "OrderedDict[int, Tuple]" = OrderedDict()
+
+        loaded = _load_index(self.buffer)
+        if loaded is not None:
+            self.index, self.names, _ = loaded
+        else:
+            chunks, _ = _scan(self.buffer)
+            self.index, self.names = _index_chunks(self.buffer, chunks)
+            print(f"[WARNING] {path}: no index (unclosed mission?), scanned {len(self.names)} frame(s)")
+
+        self._ids: Dict[str, List[int]] = {}
+        for frame_id, name in enumerate(self.names):
+            self._ids.setdefault(name, []).append(frame_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        for frame_id in range(len(self)):
+            yield self.frame(frame_id)
+
+    def _chunk(self, offset: int):
+        chunk = self._cache.get(offset)
+        if chunk is None:
+            chunk = _decode_chunk(self.buffer, offset)
+            self._cache[offset] = chunk
+            if len(self._cache) > self.cached_chunks:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(offset)
+        return chunk
+
+    def find(self, name: str) -> int:
+        """
+        Frame ID of an image name or path. A name stored more than once
+        (frames re-processed after resuming) gives the latest, with a warning.
+        """
+
+        matches = self._ids.get(name)
+        if not matches:
+            base = os.path.basename(name)
+            matches = [i for i, n in enumerate(self.names) if os.path.basename(n) == base]
+        if not matches:
+            raise KeyError(name)
+
+        if len(matches) > 1:
+            print(f"[WARNING] {len(matches)} frames named {name} (IDs {matches}); using the latest")
+        return matches[-1]
+
+    def frame(self, frame_id: int) -> FrameResult:
+        offset, slot = self.index[frame_id]
+        header, arrays = self._chunk(int(offset))
+        row = arrays["frames"][slot]
+
+        dets = slice(row["det_start"], row["det_start"] + row["det_count"])
+        cells = slice(row["cell_start"], row["cell_start"] + row["cell_count"])
+
+        return FrameResult(
+            frame_id=int(row["frame_id"]),
+            name=header["names"][slot],
+            width=int(row["width"]),
+            height=int(row["height"]),
+            timestamp=float(row["timestamp"]),
+            detections=arrays["detections"][dets],
+            cells=arrays["cells"][cells],
+            spray_time=arrays["spray_time"][cells],
+            meta=header["meta"][slot]
+        )
+
+# =========================
+# ON-DEMAND OVERLAYS
+# =========================
+def render_overlays(
+    cells: np.ndarray,
+    image: Optional[np.ndarray] = None,
+    size: Optional[Tuple[int, int]] = None
+):
+    """
+    (grid on image, blank grid with dots + coordinates) for one frame.
+    Pass the original image, or its (width, height) for the blank canvas only.
+    The blank canvas is this thread's reused per-resolution buffer (valid
+    until the next render at that size); copy it to keep it.
+    """
+    import cv2
+
+    from grid_logic.grid_generator import GRID_SIZE, get_coordinate_canvas, overlay_grid
+
+    cells = np.asarray(cells).reshape(-1, 2).tolist()
+    width, height = (image.shape[1], image.shape[0]) if image is not None else size
+    cell_w = width / GRID_SIZE
+    cell_h = height / GRID_SIZE
+
+    grid_on_image = None
+    if image is not None:
+        grid_on_image = overlay_grid(image.copy(), (180, 180, 180))
+        for (gx, gy) in cells:
+            cv2.rectangle(
+                grid_on_image,
+                (int(gx * cell_w), int(gy * cell_h)),
+                (int((gx + 1) * cell_w), int((gy + 1) * cell_h)),
+                (0, 0, 255),  # red cell border
+                2
+            )
+
+    # Only cells that changed since the last frame at this size are redrawn
+    blank_canvas = get_coordinate_canvas(width, height).render(cells)
+
+    return grid_on_image, blank_canvas
+
+
+def render_frame(reader: ResultsReader, frame_id: int, image_dir: Optional[str] = None):
+    """
+    Overlays for a stored frame. The original image is loaded (from its
+    stored path, or by name from image_dir) only for the grid-on-image view.
+    """
+    import cv2
+
+    result = reader.frame(frame_id)
+
+    image = None
+    for candidate in (result.name, os.path.join(image_dir or "", os.path.basename(result.name))):
+        if os.path.exists(candidate):
+            image = cv2.imread(candidate)
+            break
+
+    return render_overlays(result.cells, image, (result.width, result.height))
+
+# =========================
+# MAIN
+# =========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect a mission results file")
+    parser.add_argument("path", nargs="?", help="mission file (default: latest in output/)")
+    parser.add_argument("--list", action="store_true", help="one line per frame")
+    parser.add_argument("--frame", help="frame ID or image name to show")
+    parser.add_argument("--image-dir", help="folder with the original images")
+    parser.add_argument("--out", default="frame_view.png", help="overlay output path")
+    parser.add_argument("--vector", help="also write the frame's cells as .svg or .json")
+    args = parser.parse_args()
+
+    args.path = args.path or latest_mission()
+    if args.path is None:
+        parser.error(f"no mission files in {RESULTS_DIR}/")
+
+    reader = ResultsReader(args.path)
+    print(f"[INFO] {args.path}: {len(reader)} frame(s), {os.path.getsize(args.path) / 1e6:.2f} MB")
+
+    if args.list:
+        total_cells = 0
+        for result in reader:
+            print(f"{result.frame_id:>6}  {result.name}  {len(result.detections)} det  {len(result.cells)} cells")
+            total_cells += len(result.cells)
+        print(f"[INFO] {total_cells} spray cell(s) in total")
+
+    if args.frame is not None:
+        import cv2
+
+        frame_id = int(args.frame) if args.frame.isdigit() else reader.find(args.frame)
+
+        if args.vector:
+            from grid_logic.grid_generator import save_vector
+
+            result = reader.frame(frame_id)
+            save_vector(args.vector, result.cells, result.width, result.height, result.spray_time)
+            print(f"[DONE] {args.vector}")
+        grid_on_image, blank = render_frame(reader, frame_id, args.image_dir)
+
+        base, ext = os.path.splitext(args.out)
+        cv2.imwrite(f"{base}_blank_with_coords{ext}", blank)
+        print(f"[DONE] {base}_blank_with_coords{ext}")
+        if grid_on_image is not None:
+            cv2.imwrite(f"{base}_grid_on_image{ext}", grid_on_image)
+            print(f"[DONE] {base}_grid_on_image{ext}")
+        else:
+            print("[WARNING] Original image not found; use --image-dir for the grid-on-image view")
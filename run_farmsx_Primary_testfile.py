@@ -1,8 +1,18 @@
 import cv2
+import json
 import numpy as np
 import os
-from ultralytics import YOLO
-from sprinkler.sprinkler_controller import send_to_sprinkler
+from ai_model.class_policy import CLASS_POLICY, PolicyTally, apply_policy, merge_cells
+from ai_model.detector import COL_BOX, COL_CLS, detect_batch, split_by_image
+from ai_model.detector_service import load_detector
+from ai_model.sliced_inference import detect_sliced
+from drone_logic.georeference import latlon_to_local
+from grid_logic.coordinate_mapper import map_boxes_to_grid
+from grid_logic.crop_mask import CROP_CLASS, apply_crop_mask, rasterize_boxes
+from sprinkler.spray_ledger import SprayLedger
+from sprinkler.sprinkler_controller import send_to_sprinkler, wait_for_sprinkler
+from pipeline.batch_runner import run_pipeline
+from pipeline.results_store import ResultsWriter, mission_name, mission_path, render_overlays
 
 # ==========================
 # CONFIG
@@ -16,118 +26,178 @@ OUTPUT_DIR = "output"
 GRID_DIR = os.path.join(OUTPUT_DIR, "grids")
 COORD_DIR = os.path.join(OUTPUT_DIR, "coords")
 
-# ==========================
-# SETUP
-# ==========================
-os.makedirs(GRID_DIR, exist_ok=True)
-os.makedirs(COORD_DIR, exist_ok=True)
+# "store": one append-only file per mission (overlays on demand via pipeline.results_store)
+# "files": two PNG overlays + a coords .txt per frame
+OUTPUT_FORMAT = "store"
 
-# ==========================
-# LOAD MODEL
-# ==========================
-model = YOLO(MODEL_PATH)
+# Each run is a new mission (output/<name>.fxr, output/<name>.ledger).
+# Set RESUME_MISSION to an interrupted mission's name to continue it.
+MISSION_NAME = mission_name()
+RESUME_MISSION = None         # e.g. "mission_20261018_101500"
+
+# Pipeline mode: overlap reads, batched inference, writes and spraying
+PIPELINE_MODE = True
+BATCH_SIZE = 8                # images per YOLO forward pass
+READ_WORKERS = 4
+WRITE_WORKERS = 2
+QUEUE_SIZE = 32
+
+# Sliced inference: overlapping 640px tiles for high-resolution frames
+SLICED_INFERENCE = False
+
+# Keep spray off Maize: shift / reduce / skip weed cells on crop (grid_logic.crop_mask)
+CROP_EXCLUSION = True
+
+# Use the warm detector service when running (python -m ai_model.detector_service)
+USE_DETECTOR_SERVICE = True
+
+# Skip cells already sprayed from an overlapping frame (sprinkler.spray_ledger).
+# Needs each frame's hover position:
+# {"origin": [lat, lon], "frames": {"0001.jpg": [lat, lon, heading_deg], ...}}
+SPRAY_LEDGER = True
+FRAME_POSITIONS = os.path.join(IMAGE_DIR, "positions.json")
+
+model = None
+results = None
+ledger = None
+frame_positions = {}
+class_tally = PolicyTally()
 
 # ==========================
-# PROCESS EACH IMAGE
+# READ
 # ==========================
-for img_name in os.listdir(IMAGE_DIR):
+def list_images(image_dir):
+    return [
+        os.path.join(image_dir, img_name)
+        for img_name in sorted(os.listdir(image_dir))
+        if img_name.lower().endswith((".png", ".jpg", ".jpeg"))
+    ]
 
-    if not img_name.lower().endswith((".png", ".jpg", ".jpeg")):
-        continue
 
-    image_path = os.path.join(IMAGE_DIR, img_name)
+def read_image(image_path):
     image = cv2.imread(image_path)
 
     if image is None:
-        print(f"❌ Skipping {img_name} (cannot read)")
-        continue
+        print(f"❌ Skipping {os.path.basename(image_path)} (cannot read)")
 
-    h, w, _ = image.shape
-    cell_w = w // GRID_SIZE
-    cell_h = h // GRID_SIZE
+    return image
 
-    print(f"\n🔍 Processing: {img_name}")
+def load_frame_positions(path):
+    """
+    {image name: (frame center in field meters (east, north), heading_deg)},
+    or {} when the mission has no positions file.
+    """
+    if not os.path.exists(path):
+        return {}
 
-    # ==========================
-    # YOLO INFERENCE
-    # ==========================
-    results = model(image, conf=CONF_THRESHOLD)[0]
-    weed_boxes = []
+    with open(path) as f:
+        data = json.load(f)
 
-    for box in results.boxes:
-        cls = int(box.cls[0])
-        if cls == 0:  # class 0 = weed
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            weed_boxes.append((x1, y1, x2, y2))
+    positions = {}
+    for name, (lat, lon, *heading) in data["frames"].items():
+        east, north = latlon_to_local(lat, lon, *data["origin"]).tolist()
+        positions[name] = ((east, north), float(heading[0]) if heading else 0.0)
 
-    # ==========================
-    # GRID MAPPING
-    # ==========================
-    weed_cells = set()
+    return positions
 
-    for (x1, y1, x2, y2) in weed_boxes:
-        cx = (x1 + x2) // 2
-        cy = (y1 + y2) // 2
+# ==========================
+# YOLO INFERENCE
+# ==========================
+def detect_weeds(images):
+    """
+    Runs one forward pass over a batch of images
+    (or tiled passes per image when SLICED_INFERENCE is on).
+    Returns (weed rows, spray times, crop rows) per image, rows in
+    DETECTION_COLUMNS order, after the class policy (all weed classes,
+    crop not sprayed).
+    """
+    if SLICED_INFERENCE:
+        detections = np.concatenate([
+            detect_sliced(model, image, conf=CONF_THRESHOLD, image_index=idx)
+            for idx, image in enumerate(images)
+        ])
+    else:
+        detections = detect_batch(model, images, conf=CONF_THRESHOLD)
 
-        gx = min(cx // cell_w, GRID_SIZE - 1)
-        gy = min(cy // cell_h, GRID_SIZE - 1)
+    result = apply_policy(detections, CLASS_POLICY)
+    class_tally.update(result)
 
-        weed_cells.add((gx, gy))
+    # Carry each row's spray time along as an extra column while splitting
+    weeds = np.column_stack([result.targets, result.spray_time])
+    crops = detections[detections[:, COL_CLS] == CROP_CLASS]
 
-    # ==========================
-    # GRID ON ORIGINAL IMAGE
-    # ==========================
-    grid_on_image = image.copy()
-
-    for i in range(GRID_SIZE):
-        cv2.line(grid_on_image, (i * cell_w, 0), (i * cell_w, h), (180, 180, 180), 1)
-        cv2.line(grid_on_image, (0, i * cell_h), (w, i * cell_h), (180, 180, 180), 1)
-
-    for (gx, gy) in weed_cells:
-        x = gx * cell_w
-        y = gy * cell_h
-        cv2.rectangle(
-            grid_on_image,
-            (x, y),
-            (x + cell_w, y + cell_h),
-            (0, 0, 255),  # red cell border
-            2
+    return [
+        (rows[:, :-1], rows[:, -1], crop_rows)
+        for rows, crop_rows in zip(
+            split_by_image(weeds, len(images)), split_by_image(crops, len(images))
         )
+    ]
 
-    # ==========================
-    # BLANK GRID WITH RED DOT + COORDS
-    # ==========================
-    blank_canvas = np.ones((h, w, 3), dtype=np.uint8) * 255
-
-    # grid lines
-    for i in range(GRID_SIZE):
-        cv2.line(blank_canvas, (i * cell_w, 0), (i * cell_w, h), (200, 200, 200), 1)
-        cv2.line(blank_canvas, (0, i * cell_h), (w, i * cell_h), (200, 200, 200), 1)
-
-    # red dot + coordinate text
-    for (gx, gy) in weed_cells:
-        cx = gx * cell_w + cell_w // 2
-        cy = gy * cell_h + cell_h // 2
-
-        # red dot
-        cv2.circle(blank_canvas, (cx, cy), 5, (0, 0, 255), -1)
-
-        # coordinates text
-        label = f"({gx},{gy})"
-        cv2.putText(
-            blank_canvas,
-            label,
-            (cx + 6, cy - 6),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.35,
-            (0, 0, 0),
-            1,
-            cv2.LINE_AA
+# ==========================
+# GRID MAPPING
+# ==========================
+def map_weed_cells(image, weeds):
+    """
+    Returns (unique weed cells [(gx, gy), ...], their spray times, the
+    frame's detections). Cells on a crop plant are shifted off it,
+    dose-reduced or skipped.
+    """
+    weed_rows, spray_times, crop_rows = weeds
+    crop_boxes = crop_rows[:, COL_BOX]
+    h, w, _ = image.shape
+    weed_cells = map_boxes_to_grid(weed_rows[:, COL_BOX], w, h, unique=False)
+
+    if CROP_EXCLUSION and len(crop_boxes) and len(weed_cells):
+        excluded = apply_crop_mask(weed_cells, spray_times, rasterize_boxes(crop_boxes, w, h))
+        weed_cells, spray_times = excluded.cells, excluded.spray_time
+
+        if excluded.shifted or excluded.reduced or excluded.skipped:
+            print(f"[INFO] Crop overlap: {excluded.shifted} shifted, "
+                  f"{excluded.reduced} reduced, {excluded.skipped} skipped")
+
+    weed_cells, spray_times = merge_cells(weed_cells, spray_times)
+
+    return [tuple(cell) for cell in weed_cells.tolist()], spray_times, np.concatenate([weed_rows, crop_rows])
+
+# ==========================
+# SPRINKLER HAND-OFF
+# ==========================
+def spray_weed_cells(image_path, targets):
+    """
+    One sprinkler job per frame: all weed classes share one tour,
+    each cell sprayed for its own class's time. Frames with a known
+    position skip cells already sprayed from an overlapping frame.
+    """
+    weed_cells, spray_times, _ = targets
+    position = frame_positions.get(os.path.basename(image_path))
+
+    if ledger is not None and position is not None:
+        center, heading = position
+        send_to_sprinkler(
+            weed_cells, spray_time=spray_times,
+            ledger=ledger, center_local=center, heading_deg=heading
         )
+    else:
+        send_to_sprinkler(weed_cells, spray_time=spray_times)
+
+# ==========================
+# SAVE OUTPUTS
+# ==========================
+def write_outputs(image_path, image, targets):
+    weed_cells, spray_times, detections = targets
+    h, w, _ = image.shape
+    img_name = os.path.basename(image_path)
+
+    if OUTPUT_FORMAT == "store":
+        frame_id = results.append(image_path, w, h, detections, weed_cells, spray_times)
+        print(f"✅ Done: {img_name} → frame {frame_id} ({len(weed_cells)} weed cells)")
+        return
 
     # ==========================
-    # SAVE OUTPUTS
+    # GRID ON IMAGE + BLANK GRID WITH RED DOT + COORDS
     # ==========================
+    grid_on_image, blank_canvas = render_overlays(weed_cells, image)
+
     base_name = os.path.splitext(img_name)[0]
 
     grid_img_path = os.path.join(GRID_DIR, f"{base_name}_grid_on_image.png")
@@ -138,17 +208,96 @@ for img_name in os.listdir(IMAGE_DIR):
     cv2.imwrite(grid_blank_path, blank_canvas)
 
     with open(coord_path, "w") as f:
-        for gx, gy in sorted(weed_cells):
+        for gx, gy in weed_cells:
             f.write(f"{gx},{gy}\n")
 
-    # ==========================
-    # SEND TO SPRINKLER
-    # ==========================
-    send_to_sprinkler(sorted(weed_cells))
-
     print(f"✅ Done: {img_name}")
     print(f"   🖼 Grid on Image: {grid_img_path}")
     print(f"   🧾 Grid w/ Coords: {grid_blank_path}")
     print(f"   📍 Weed Cells: {len(weed_cells)}")
 
-print("\n🚜 FarmX Batch Processing Complete")
+# ==========================
+# SERIAL MODE
+# ==========================
+def run_serial(image_paths):
+    for image_path in image_paths:
+        image = read_image(image_path)
+        if image is None:
+            continue
+
+        print(f"\n🔍 Processing: {os.path.basename(image_path)}")
+
+        weeds = detect_weeds([image])[0]
+        targets = map_weed_cells(image, weeds)
+        write_outputs(image_path, image, targets)
+
+        # ==========================
+        # SEND TO SPRINKLER
+        # ==========================
+        spray_weed_cells(image_path, targets)
+
+# ==========================
+# MAIN
+# ==========================
+def main():
+    global model, results, ledger, frame_positions
+
+    # ==========================
+    # SETUP
+    # ==========================
+    mission = RESUME_MISSION or MISSION_NAME
+    print(f"[INFO] {'Resuming' if RESUME_MISSION else 'Starting'} {mission}")
+
+    if OUTPUT_FORMAT == "store":
+        results = ResultsWriter(mission_path(mission, OUTPUT_DIR), resume=RESUME_MISSION is not None)
+    else:
+        os.makedirs(GRID_DIR, exist_ok=True)
+        os.makedirs(COORD_DIR, exist_ok=True)
+
+    if SPRAY_LEDGER:
+        frame_positions = load_frame_positions(FRAME_POSITIONS)
+        if frame_positions:
+            ledger = SprayLedger(os.path.join(OUTPUT_DIR, f"{mission}.ledger"))
+        else:
+            print(f"[WARNING] No frame positions ({FRAME_POSITIONS}); overlapping frames may be re-sprayed")
+
+    # Results are closed (last chunk + index written) even if a stage or
+    # the sprinkler fails, so the frames processed so far stay readable
+    try:
+        # ==========================
+        # LOAD MODEL
+        # ==========================
+        model = load_detector(MODEL_PATH, use_service=USE_DETECTOR_SERVICE)
+
+        # ==========================
+        # PROCESS EACH IMAGE
+        # ==========================
+        image_paths = list_images(IMAGE_DIR)
+
+        if PIPELINE_MODE:
+            run_pipeline(
+                image_paths,
+                read_image=read_image,
+                infer_batch=detect_weeds,
+                map_detections=map_weed_cells,
+                write_outputs=write_outputs,
+                actuate=spray_weed_cells,
+                batch_size=BATCH_SIZE,
+                read_workers=READ_WORKERS,
+                write_workers=WRITE_WORKERS,
+                queue_size=QUEUE_SIZE
+            )
+        else:
+            run_serial(image_paths)
+
+        # Spraying runs in the background; let the last frames finish
+        wait_for_sprinkler()
+    finally:
+        if results is not None:
+            results.close()
+
+    class_tally.print_summary()
+    print("\n🚜 FarmX Batch Processing Complete")
+
+if __name__ == "__main__":
+    main()
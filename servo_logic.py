@@ -3,94 +3,26 @@ FarmX - Servo Logic Module
 Author: Parth Vishwakarma
 
 Purpose:
-- Convert 256x256 grid coordinates into servo angles
-- Control 2-axis (Pan-Tilt) sprinkler system
-- Enable precision herbicide spraying
+- Backwards-compatible entry point for the servo logic
+- The single implementation lives in sprinkler/servo_logic.py
+  (precomputed angle table + calibration models)
 """
 
-import time
-from typing import Tuple, List
-
-# =========================
-# CONFIG
-# =========================
-GRID_SIZE = 256
-
-PAN_SERVO_MIN = 0       # degrees
-PAN_SERVO_MAX = 180
-
-TILT_SERVO_MIN = 30     # degrees (to avoid hitting drone frame)
-TILT_SERVO_MAX = 150
-
-SPRAY_DURATION = 0.4   # seconds per weed
-
-# =========================
-# GRID → SERVO MAPPING
-# =========================
-def grid_to_servo_angles(grid_x: int, grid_y: int) -> Tuple[float, float]:
-    """
-    Convert grid coordinates (256x256) to servo angles.
-    """
-
-    pan_angle = PAN_SERVO_MIN + (
-        (grid_x / (GRID_SIZE - 1)) * (PAN_SERVO_MAX - PAN_SERVO_MIN)
-    )
-
-    tilt_angle = TILT_SERVO_MIN + (
-        (grid_y / (GRID_SIZE - 1)) * (TILT_SERVO_MAX - TILT_SERVO_MIN)
-    )
-
-    return round(pan_angle, 2), round(tilt_angle, 2)
-
-# =========================
-# SERVO CONTROL (PLACEHOLDER)
-# =========================
-def move_servo(pan: float, tilt: float):
-    """
-    Placeholder for real servo control.
-    Replace with GPIO / PWM / Arduino / ESP32 logic.
-    """
-    print(f"[SERVO] Moving → Pan: {pan}°, Tilt: {tilt}°")
-    time.sleep(0.2)
-
-def spray_on():
-    """
-    Turn spray ON.
-    """
-    print("[SPRAY] ON")
-
-def spray_off():
-    """
-    Turn spray OFF.
-    """
-    print("[SPRAY] OFF")
-
-# =========================
-# SINGLE TARGET SPRAY
-# =========================
-def spray_at_coordinate(grid_x: int, grid_y: int):
-    """
-    Complete spray sequence for one weed.
-    """
-
-    pan, tilt = grid_to_servo_angles(grid_x, grid_y)
-
-    move_servo(pan, tilt)
-    spray_on()
-    time.sleep(SPRAY_DURATION)
-    spray_off()
-
-# =========================
-# MULTIPLE TARGET HANDLER
-# =========================
-def spray_multiple_targets(targets: List[Tuple[int, int]]):
-    """
-    Spray multiple weed coordinates sequentially.
-    """
-
-    for idx, (x, y) in enumerate(targets):
-        print(f"\n[TARGET {idx + 1}] Grid ({x}, {y})")
-        spray_at_coordinate(x, y)
+from sprinkler.servo_logic import (  # noqa: F401
+    GRID_SIZE,
+    PAN_SERVO_MAX,
+    PAN_SERVO_MIN,
+    SPRAY_DURATION,
+    TILT_SERVO_MAX,
+    TILT_SERVO_MIN,
+    grid_to_servo_angles,
+    grid_to_servo_angles_batch,
+    move_servo,
+    spray_at_coordinate,
+    spray_multiple_targets,
+    spray_off,
+    spray_on
+)
 
 # =========================
 # TEST RUN
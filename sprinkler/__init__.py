@@ -0,0 +1,41 @@
+"""
+FarmX - Sprinkler Package
+Author: Parth Vishwakarma
+
+Purpose:
+- Lazy re-exports: `import sprinkler` loads nothing, each name imports
+  its module (and numpy / cv2) on first use
+"""
+
+import importlib
+
+_EXPORTS = {
+    "send_to_sprinkler": "sprinkler.sprinkler_controller",
+    "wait_for_sprinkler": "sprinkler.sprinkler_controller",
+    "spray_targets": "sprinkler.sprinkler_controller",
+    "spray_target": "sprinkler.sprinkler_controller",
+    "ActuationEngine": "sprinkler.actuation_engine",
+    "ServoBackend": "sprinkler.actuators",
+    "SimulatedBackend": "sprinkler.actuators",
+    "grid_to_servo_angles": "sprinkler.servo_logic",
+    "plan_patches": "sprinkler.spray_clustering",
+    "SprayLedger": "sprinkler.spray_ledger",
+    "schedule_targets": "sprinkler.target_scheduler",
+    "compensate_targets": "sprinkler.wind_compensation",
+    "WindCompensator": "sprinkler.wind_compensation",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
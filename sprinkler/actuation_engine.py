@@ -0,0 +1,231 @@
+"""
+FarmX - Actuation Engine
+Author: Parth Vishwakarma
+
+Purpose:
+- Run spraying on a dedicated thread so detection never waits for servos
+- Queue spray jobs (one per frame) with back-pressure when the queue is full
+- Cancel pending jobs and abort the running one safely (spray forced OFF)
+- Surface spray / hardware failures to the mission instead of only the Future
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+from sprinkler.actuators import ActuatorBackend
+
+# =========================
+# CONFIG
+# =========================
+MAX_PENDING_JOBS = 4        # frames waiting to be sprayed before submit() blocks
+
+_STOP = object()
+
+# =========================
+# CANCELLATION
+# =========================
+class ActuationCancelled(Exception):
+    """
+    Raised inside a spray job when the engine cancels it.
+    """
+
+
+class _CancellableBackend(ActuatorBackend):
+    """
+    Wraps a backend and aborts the running job once `is_cancelled()`.
+    spray_off is always let through so the pump never stays on.
+    """
+
+    def __init__(self, backend: ActuatorBackend, is_cancelled: Callable[[], bool]):
+        self.backend = backend
+        self.is_cancelled = is_cancelled
+
+    @property
+    def pose(self):
+        return self.backend.pose
+
+    def _check(self):
+        if self.is_cancelled():
+            raise ActuationCancelled()
+
+    def move_servo(self, pan: float, tilt: float):
+        self._check()
+        self.backend.move_servo(pan, tilt)
+
+    def spray_on(self):
+        self._check()
+        self.backend.spray_on()
+
+    def spray_off(self):
+        self.backend.spray_off()
+
+    def wait(self, seconds: float):
+        self._check()
+        self.backend.wait(seconds)
+        self._check()
+
+# =========================
+# ENGINE
+# =========================
+class ActuationEngine:
+    """
+    Single worker thread executing spray jobs in submission order.
+
+    run_job(targets, backend=..., **options) does the actual spraying, normally
+    sprinkler_controller.spray_targets. submit() returns a Future that
+    resolves to the job's return value. The first failed job is also kept
+    and re-raised by the next submit() or join().
+    """
+
+    def __init__(
+        self,
+        run_job: Callable,
+        backend: ActuatorBackend,
+        max_pending: int = MAX_PENDING_JOBS
+    ):
+        self.run_job = run_job
+        self.backend = backend
+
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+
+        # Jobs submitted before the last cancel_all() carry an older
+        # generation and are aborted, even if already running.
+        self._lock = threading.Lock()
+        self._cancel_generation = 0
+        self._running_generation = 0
+        self._failure: Optional[Exception] = None
+        self._guarded = _CancellableBackend(
+            backend, lambda: self._running_generation < self._cancel_generation
+        )
+
+    # ---- lifecycle ----
+    def start(self) -> "ActuationEngine":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="actuation", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, cancel: bool = False):
+        """
+        Stops the worker after the queued jobs (or cancels them first).
+        """
+        if self._thread is None:
+            return
+        if cancel:
+            self.cancel_all()
+        self._jobs.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "ActuationEngine":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(cancel=exc_type is not None)
+
+    # ---- jobs ----
+    def submit(
+        self,
+        targets: List[Tuple[int, int]],
+        block: bool = True,
+        timeout: Optional[float] = None,
+        **options
+    ) -> Future:
+        """
+        Queues one frame's targets for spraying.
+        Extra keyword options are passed on to run_job.
+
+        When max_pending jobs are already waiting, blocks (back-pressure)
+        or, with block=False / an expired timeout, raises queue.Full.
+        Raises the first failure of an earlier job instead of queueing.
+        """
+
+        self.raise_failure()
+        self.start()
+        future = Future()
+        with self._lock:
+            generation = self._cancel_generation
+        self._jobs.put((future, generation, list(targets), options), block=block, timeout=timeout)
+        return future
+
+    def pending(self) -> int:
+        return self._jobs.qsize()
+
+    def cancel_all(self) -> int:
+        """
+        Cancels every queued job and aborts the one being sprayed.
+        Returns the number of jobs cancelled.
+        """
+
+        with self._lock:
+            self._cancel_generation += 1
+
+        count = 0
+        while True:
+            try:
+                item = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is _STOP:
+                # Keep the shutdown request
+                self._jobs.task_done()
+                self._jobs.put(_STOP)
+                break
+
+            future = item[0]
+            if future.cancel():
+                count += 1
+            self._jobs.task_done()
+
+        return count
+
+    def join(self):
+        """
+        Blocks until every submitted job has finished, then raises the
+        first job failure, if any.
+        """
+        self._jobs.join()
+        self.raise_failure()
+
+    def raise_failure(self):
+        """
+        Re-raises (and clears) the first failure of a spray job.
+        Cancelled jobs are not failures.
+        """
+        with self._lock:
+            failure, self._failure = self._failure, None
+        if failure is not None:
+            raise failure
+
+    # ---- worker ----
+    def _worker(self):
+        while True:
+            item = self._jobs.get()
+            if item is _STOP:
+                self._jobs.task_done()
+                break
+
+            future, generation, targets, options = item
+            self._running_generation = generation
+
+            if generation < self._cancel_generation:
+                future.cancel()
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.run_job(targets, backend=self._guarded, **options))
+                except ActuationCancelled:
+                    print("[WARNING] Spray job cancelled")
+                    future.set_exception(ActuationCancelled())
+                except Exception as exc:
+                    print(f"[WARNING] Spray job failed: {exc!r}")
+                    with self._lock:
+                        if self._failure is None:
+                            self._failure = exc
+                    future.set_exception(exc)
+
+            self._jobs.task_done()
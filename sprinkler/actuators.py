@@ -0,0 +1,105 @@
+"""
+FarmX - Actuator Backends
+Author: Parth Vishwakarma
+
+Purpose:
+- Pluggable hardware interface for the pan-tilt sprayer
+- Real servo / pump backend built on servo_logic
+- Simulated backend for tests and benchmarks (no hardware, no sleeping)
+"""
+
+import time
+from typing import List, Tuple
+
+from sprinkler.servo_logic import move_servo, spray_on, spray_off
+from sprinkler.target_scheduler import HOME_ANGLES
+
+# =========================
+# BACKEND INTERFACE
+# =========================
+class ActuatorBackend:
+    """
+    Commands the sprinkler controller needs from the hardware.
+
+    `pose` is the last commanded (pan, tilt); jobs time their first move
+    from it, since the servos stay where the previous job left them.
+    """
+
+    pose: Tuple[float, float] = HOME_ANGLES
+
+    def move_servo(self, pan: float, tilt: float):
+        raise NotImplementedError
+
+    def spray_on(self):
+        raise NotImplementedError
+
+    def spray_off(self):
+        raise NotImplementedError
+
+    def wait(self, seconds: float):
+        """
+        Let the hardware finish the last command (servo travel, spraying).
+        """
+        time.sleep(seconds)
+
+# =========================
+# REAL HARDWARE
+# =========================
+class ServoBackend(ActuatorBackend):
+    """
+    Drives the servos and pump through sprinkler.servo_logic.
+    """
+
+    def move_servo(self, pan: float, tilt: float):
+        move_servo(pan, tilt)
+        self.pose = (pan, tilt)
+
+    def spray_on(self):
+        spray_on()
+
+    def spray_off(self):
+        spray_off()
+
+# =========================
+# SIMULATION
+# =========================
+class SimulatedBackend(ActuatorBackend):
+    """
+    Records every command against a virtual clock.
+
+    realtime=False (default) advances the clock without sleeping, so a
+    whole mission's spraying can be simulated in milliseconds.
+    """
+
+    def __init__(self, realtime: bool = False):
+        self.realtime = realtime
+        self.clock = 0.0
+        self.spray_time = 0.0
+        self.spraying = False
+        self.commands: List[Tuple[float, str, tuple]] = []
+
+    def move_servo(self, pan: float, tilt: float):
+        self.commands.append((self.clock, "move", (pan, tilt)))
+        self.pose = (pan, tilt)
+
+    def spray_on(self):
+        self.spraying = True
+        self.commands.append((self.clock, "spray_on", ()))
+
+    def spray_off(self):
+        self.spraying = False
+        self.commands.append((self.clock, "spray_off", ()))
+
+    def wait(self, seconds: float):
+        if self.realtime:
+            time.sleep(seconds)
+        self.clock += seconds
+        if self.spraying:
+            self.spray_time += seconds
+
+    def reset(self):
+        self.clock = 0.0
+        self.spray_time = 0.0
+        self.spraying = False
+        self.pose = HOME_ANGLES
+        self.commands.clear()
@@ -0,0 +1,287 @@
+"""
+FarmX - Servo Logic Module
+Author: Parth Vishwakarma
+
+Purpose:
+- Convert 256x256 grid coordinates into servo angles
+- Precompute a 256x256x2 angle lookup table from a calibration model
+- Support linear, geometric (altitude-dependent) and fitted calibrations
+- Control 2-axis (Pan-Tilt) sprinkler system
+"""
+
+import math
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# =========================
+# CONFIG
+# =========================
+GRID_SIZE = 256
+
+PAN_SERVO_MIN = 0       # degrees
+PAN_SERVO_MAX = 180
+
+TILT_SERVO_MIN = 30     # degrees (to avoid hitting drone frame)
+TILT_SERVO_MAX = 150
+
+PAN_CENTER = 90.0       # servo angle pointing straight down
+TILT_CENTER = 90.0
+
+CAMERA_HFOV_DEG = 62.2  # downward camera field of view
+CAMERA_VFOV_DEG = 48.8
+NOZZLE_OFFSET_M = (0.0, 0.0)   # nozzle position relative to camera (x, y)
+HOVER_HEIGHT_METERS = 0.6
+
+SPRAY_DURATION = 0.4    # seconds per weed
+SERVO_MOVE_TIME = 0.2   # fixed wait used by the standalone spray helpers
+
+ANGLE_TABLE_PATH = "sprinkler/servo_angle_table.npy"
+
+# A calibration maps float grid arrays (gx, gy) to (pan, tilt) arrays
+Calibration = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+# =========================
+# CALIBRATION MODELS
+# =========================
+def linear_calibration(gx: np.ndarray, gy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Linear interpolation across the servo limits (original mapping).
+    """
+
+    pan = PAN_SERVO_MIN + (gx / (GRID_SIZE - 1)) * (PAN_SERVO_MAX - PAN_SERVO_MIN)
+    tilt = TILT_SERVO_MIN + (gy / (GRID_SIZE - 1)) * (TILT_SERVO_MAX - TILT_SERVO_MIN)
+
+    return pan, tilt
+
+
+def geometric_calibration(
+    altitude_m: float = HOVER_HEIGHT_METERS,
+    hfov_deg: float = CAMERA_HFOV_DEG,
+    vfov_deg: float = CAMERA_VFOV_DEG,
+    nozzle_offset_m: Tuple[float, float] = NOZZLE_OFFSET_M
+) -> Calibration:
+    """
+    Aims the nozzle at the ground point under each cell center.
+
+    The camera footprint grows with altitude while the nozzle angle to a
+    ground point is atan(offset / altitude), so the mapping is nonlinear
+    and changes with hover height.
+    """
+
+    half_w = altitude_m * math.tan(math.radians(hfov_deg) / 2)
+    half_h = altitude_m * math.tan(math.radians(vfov_deg) / 2)
+
+    def calibration(gx, gy):
+        # Ground position of the cell center relative to the nozzle
+        x = ((gx + 0.5) / GRID_SIZE * 2 - 1) * half_w - nozzle_offset_m[0]
+        y = ((gy + 0.5) / GRID_SIZE * 2 - 1) * half_h - nozzle_offset_m[1]
+
+        pan = PAN_CENTER + np.degrees(np.arctan2(x, altitude_m))
+        tilt = TILT_CENTER + np.degrees(np.arctan2(y, altitude_m))
+        return pan, tilt
+
+    return calibration
+
+
+def _poly_terms(gx: np.ndarray, gy: np.ndarray, degree: int) -> np.ndarray:
+    u = np.asarray(gx, dtype=np.float64) / (GRID_SIZE - 1)
+    v = np.asarray(gy, dtype=np.float64) / (GRID_SIZE - 1)
+
+    return np.stack(
+        [u ** i * v ** j for i in range(degree + 1) for j in range(degree + 1 - i)],
+        axis=-1
+    )
+
+
+def fit_calibration(
+    grid_points: np.ndarray,
+    measured_angles: np.ndarray,
+    degree: int = 2
+) -> Calibration:
+    """
+    Fits a 2D polynomial calibration to measured (grid → angle) samples,
+    e.g. from aiming the nozzle at markers on the ground by hand.
+    """
+
+    grid_points = np.asarray(grid_points, dtype=np.float64).reshape(-1, 2)
+    measured_angles = np.asarray(measured_angles, dtype=np.float64).reshape(-1, 2)
+
+    terms = _poly_terms(grid_points[:, 0], grid_points[:, 1], degree)
+    if len(grid_points) < terms.shape[1]:
+        raise ValueError(f"Need at least {terms.shape[1]} samples for degree {degree}")
+
+    coeffs, *_ = np.linalg.lstsq(terms, measured_angles, rcond=None)
+
+    def calibration(gx, gy):
+        angles = _poly_terms(gx, gy, degree) @ coeffs
+        return angles[..., 0], angles[..., 1]
+
+    return calibration
+
+# =========================
+# ANGLE LOOKUP TABLE
+# =========================
+def build_angle_table(calibration: Calibration = linear_calibration) -> np.ndarray:
+    """
+    Evaluates a calibration for every cell once.
+    Returns a (GRID_SIZE, GRID_SIZE, 2) float64 table indexed [grid_x, grid_y],
+    clamped to the servo limits and rounded to 0.01°.
+    """
+
+    gx, gy = np.meshgrid(
+        np.arange(GRID_SIZE, dtype=np.float64),
+        np.arange(GRID_SIZE, dtype=np.float64),
+        indexing="ij"
+    )
+    pan, tilt = calibration(gx, gy)
+
+    table = np.empty((GRID_SIZE, GRID_SIZE, 2), dtype=np.float64)
+    table[..., 0] = np.round(np.clip(pan, PAN_SERVO_MIN, PAN_SERVO_MAX), 2)
+    table[..., 1] = np.round(np.clip(tilt, TILT_SERVO_MIN, TILT_SERVO_MAX), 2)
+
+    return table
+
+
+def save_angle_table(table: np.ndarray, path: str = ANGLE_TABLE_PATH):
+    np.save(path, table)
+    print(f"[INFO] Servo angle table saved to {path}")
+
+
+def load_angle_table(path: str = ANGLE_TABLE_PATH) -> np.ndarray:
+    table = np.load(path)
+
+    if table.shape != (GRID_SIZE, GRID_SIZE, 2):
+        raise ValueError(f"Bad angle table shape {table.shape} in {path}")
+
+    return table
+
+
+_angle_table = build_angle_table()
+
+
+def use_angle_table(table: Optional[np.ndarray] = None, calibration: Optional[Calibration] = None):
+    """
+    Switches the active lookup table (given directly or built from a calibration).
+    """
+
+    global _angle_table
+
+    if table is None:
+        table = build_angle_table(calibration or linear_calibration)
+
+    _angle_table = table
+
+
+def angle_table() -> np.ndarray:
+    return _angle_table
+
+# =========================
+# GRID → SERVO MAPPING
+# =========================
+def grid_to_servo_angles(grid_x: int, grid_y: int) -> Tuple[float, float]:
+    """
+    Convert grid coordinates (256x256) to servo angles.
+    """
+
+    pan, tilt = _angle_table[grid_x, grid_y]
+    return float(pan), float(tilt)
+
+
+def grid_to_servo_angles_batch(cells: np.ndarray) -> np.ndarray:
+    """
+    Looks up an (N, 2) array of grid cells at once.
+    Returns an (N, 2) float array of (pan, tilt).
+    """
+
+    cells = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+    return _angle_table[cells[:, 0], cells[:, 1]]
+
+
+def subcell_to_servo_angles(points: np.ndarray) -> np.ndarray:
+    """
+    Bilinear table lookup for (N, 2) float grid positions,
+    e.g. wind-compensated targets with sub-cell offsets.
+    """
+
+    points = np.clip(np.asarray(points, dtype=np.float64).reshape(-1, 2), 0, GRID_SIZE - 1)
+
+    base = np.minimum(np.floor(points).astype(np.intp), GRID_SIZE - 2)
+    frac = points - base
+    x0, y0 = base[:, 0], base[:, 1]
+    fx, fy = frac[:, :1], frac[:, 1:]
+
+    top = _angle_table[x0, y0] * (1 - fx) + _angle_table[x0 + 1, y0] * fx
+    bottom = _angle_table[x0, y0 + 1] * (1 - fx) + _angle_table[x0 + 1, y0 + 1] * fx
+
+    return top * (1 - fy) + bottom * fy
+
+# =========================
+# SERVO CONTROL (PLACEHOLDER)
+# =========================
+def move_servo(pan: float, tilt: float):
+    """
+    Placeholder for real servo control.
+    Replace with GPIO / PWM / Arduino / ESP32 logic.
+    Only sends the command; callers wait for the travel time.
+    """
+    print(f"[SERVO] Moving → Pan: {pan}°, Tilt: {tilt}°")
+
+def spray_on():
+    """
+    Turn spray ON.
+    """
+    print("[SPRAY] ON")
+
+def spray_off():
+    """
+    Turn spray OFF.
+    """
+    print("[SPRAY] OFF")
+
+# =========================
+# SINGLE TARGET SPRAY
+# =========================
+def spray_at_coordinate(grid_x: int, grid_y: int):
+    """
+    Complete spray sequence for one weed.
+    """
+
+    pan, tilt = grid_to_servo_angles(grid_x, grid_y)
+
+    move_servo(pan, tilt)
+    time.sleep(SERVO_MOVE_TIME)
+    spray_on()
+    time.sleep(SPRAY_DURATION)
+    spray_off()
+
+# =========================
+# MULTIPLE TARGET HANDLER
+# =========================
+def spray_multiple_targets(targets: List[Tuple[int, int]]):
+    """
+    Spray multiple weed coordinates sequentially.
+    """
+
+    for idx, (x, y) in enumerate(targets):
+        print(f"\n[TARGET {idx + 1}] Grid ({x}, {y})")
+        spray_at_coordinate(x, y)
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Servo Logic Running")
+
+    test_targets = [(120, 80), (200, 140), (50, 220)]
+
+    print("Linear:   ", grid_to_servo_angles_batch(test_targets).tolist())
+
+    use_angle_table(calibration=geometric_calibration(altitude_m=0.6))
+    print("Geometric:", grid_to_servo_angles_batch(test_targets).tolist())
+
+    use_angle_table()
+    spray_multiple_targets(test_targets)
+
+    print("\n[DONE] Servo logic test complete")
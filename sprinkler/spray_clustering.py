@@ -0,0 +1,239 @@
+"""
+FarmX - Spray Clustering Module
+Author: Parth Vishwakarma
+
+Purpose:
+- Group adjacent / nearby weed cells into spray patches
+- Spray each patch in one continuous sweep with the nozzle kept open
+- Estimate per-patch timing and herbicide volume vs. per-cell spraying
+- cv2 is imported on first use, so the controller imports without it
+"""
+
+from typing import List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from grid_logic.coordinate_mapper import occupancy_grid
+from sprinkler.target_scheduler import (
+    HOME_ANGLES,
+    SERVO_SETTLE_TIME,
+    SERVO_SPEED_DEG_PER_S,
+    angle_distance,
+    move_time,
+    schedule_targets,
+    targets_to_angles
+)
+
+# =========================
+# CONFIG
+# =========================
+CLUSTER_RADIUS = 1          # cells; 1 = touching (8-connected)
+MAX_PATCH_CELLS = 16        # longer patches are split into several sweeps
+SWEEP_DWELL_PER_CELL = 0.1  # seconds of spray over each cell while sweeping
+NOZZLE_FLOW_ML_PER_S = 5.0  # herbicide flow with spray ON
+
+SPRAY_DURATION = 0.4        # per-cell baseline (sprinkler_controller)
+
+# =========================
+# DATA FORMAT
+# =========================
+class SprayPatch(NamedTuple):
+    cells: np.ndarray       # (K, 2) grid cells in sweep order
+    move_time: float        # seconds to reach the first cell
+    spray_time: float       # seconds with spray ON
+    volume_ml: float        # estimated herbicide volume
+    dose: np.ndarray        # (K,) spray time scale per cell (weed class)
+
+    @property
+    def duration(self) -> float:
+        return self.move_time + self.spray_time
+
+# =========================
+# CLUSTERING
+# =========================
+def label_cells(
+    targets: Sequence[Tuple[int, int]],
+    radius: int = CLUSTER_RADIUS
+) -> np.ndarray:
+    """
+    Connected-component label per target on the occupancy grid.
+    Cells up to `radius` cells apart (Chebyshev) share a label.
+    """
+    import cv2
+
+    cells = np.asarray(targets, dtype=np.intp).reshape(-1, 2)
+    grid = occupancy_grid(cells).astype(np.uint8)
+
+    # Dilating by a radius x radius square makes cells up to `radius`
+    # apart touch, so 8-connectivity then merges them.
+    if radius > 1:
+        grid = cv2.dilate(grid, np.ones((radius, radius), dtype=np.uint8))
+
+    _, labels = cv2.connectedComponents(grid, connectivity=8)
+
+    return labels[cells[:, 1], cells[:, 0]]
+
+
+def sweep_order(cells: np.ndarray) -> np.ndarray:
+    """
+    Serpentine order inside a patch: row by row, alternating direction.
+    """
+
+    cells = np.asarray(cells).reshape(-1, 2)
+    rows = cells[:, 1]
+    # Flip x on odd rows so consecutive rows are swept back and forth
+    x_key = np.where(rows % 2 == 0, cells[:, 0], -cells[:, 0])
+
+    return cells[np.lexsort((x_key, rows))]
+
+
+def cluster_cells(
+    targets: Sequence[Tuple[int, int]],
+    radius: int = CLUSTER_RADIUS,
+    max_patch_cells: int = MAX_PATCH_CELLS
+) -> List[np.ndarray]:
+    """
+    Groups targets into patches, each an (K, 2) array in sweep order.
+    """
+
+    cells = np.asarray(targets, dtype=np.int32).reshape(-1, 2)
+    if len(cells) == 0:
+        return []
+
+    labels = label_cells(cells, radius)
+
+    patches = []
+    for label in np.unique(labels):
+        patch = sweep_order(cells[labels == label])
+
+        for start in range(0, len(patch), max_patch_cells):
+            patches.append(patch[start:start + max_patch_cells])
+
+    return patches
+
+# =========================
+# TIMING / VOLUME ESTIMATES
+# =========================
+def final_dwell(num_cells: int, dose: float = 1.0) -> float:
+    """
+    Spray time on the last cell of a sweep.
+    `dose` scales spray times (e.g. a lighter dose for one weed class).
+    """
+    return (SPRAY_DURATION if num_cells == 1 else SWEEP_DWELL_PER_CELL) * dose
+
+
+def estimate_patch(
+    cells: np.ndarray,
+    from_angles: Tuple[float, float] = HOME_ANGLES,
+    dose: Union[float, np.ndarray] = 1.0
+) -> SprayPatch:
+    """
+    Time and volume for one continuous sweep over `cells`.
+    While spraying, the nozzle spends at least SWEEP_DWELL_PER_CELL on
+    each cell (scaled by that cell's dose) before moving on, longer if
+    the servos need more time to get there.
+    An isolated cell gets the normal per-weed SPRAY_DURATION.
+    """
+
+    angles = targets_to_angles(cells.tolist())
+    dose = np.broadcast_to(np.asarray(dose, dtype=np.float64), len(cells))
+
+    dwell = SWEEP_DWELL_PER_CELL * dose[:-1]
+    slews = angle_distance(angles[1:], angles[:-1]) / SERVO_SPEED_DEG_PER_S
+    spray_time = final_dwell(len(cells), dose[-1]) + float(np.maximum(slews, dwell).sum())
+
+    return SprayPatch(
+        cells=cells,
+        move_time=move_time(from_angles, tuple(angles[0])),
+        spray_time=spray_time,
+        volume_ml=spray_time * NOZZLE_FLOW_ML_PER_S,
+        dose=dose.copy()
+    )
+
+
+def plan_patches(
+    targets: Sequence[Tuple[int, int]],
+    start_angles: Tuple[float, float] = HOME_ANGLES,
+    radius: int = CLUSTER_RADIUS,
+    max_patch_cells: int = MAX_PATCH_CELLS,
+    dose: Union[float, Sequence[float]] = 1.0
+) -> List[SprayPatch]:
+    """
+    Clusters targets and orders the patches for minimum servo travel.
+    `dose` is one scale for all targets or one per target, so cells of
+    different weed classes share patches and one tour.
+    """
+
+    patches = cluster_cells(targets, radius, max_patch_cells)
+    if not patches:
+        return []
+
+    # Per-cell dose lookup (a repeated cell keeps its largest dose)
+    cell_dose = {}
+    doses = np.broadcast_to(np.asarray(dose, dtype=np.float64), len(targets))
+    for cell, value in zip(map(tuple, np.asarray(targets).reshape(-1, 2).tolist()), doses.tolist()):
+        cell_dose[cell] = max(value, cell_dose.get(cell, 0.0))
+
+    # Order patches by their entry cell
+    entries = [tuple(patch[0]) for patch in patches]
+    by_entry = {entry: patch for entry, patch in zip(entries, patches)}
+
+    planned = []
+    angles = start_angles
+    for entry in schedule_targets(entries, start_angles=start_angles):
+        cells = by_entry[entry]
+        patch = estimate_patch(cells, angles, [cell_dose[tuple(c)] for c in cells.tolist()])
+        planned.append(patch)
+        angles = tuple(targets_to_angles([tuple(patch.cells[-1])])[0])
+
+    return planned
+
+
+def baseline_estimate(
+    targets: Sequence[Tuple[int, int]],
+    start_angles: Tuple[float, float] = HOME_ANGLES
+) -> Tuple[float, float]:
+    """
+    (seconds, ml) for the per-cell move → spray cycle, same target order.
+    """
+
+    if len(targets) == 0:
+        return 0.0, 0.0
+
+    angles = targets_to_angles(list(targets))
+    path = np.vstack([start_angles, angles])
+    moves = angle_distance(path[1:], path[:-1]) / SERVO_SPEED_DEG_PER_S
+
+    move_total = float(moves.sum()) + len(angles) * SERVO_SETTLE_TIME
+    spray_total = len(angles) * SPRAY_DURATION
+
+    return move_total + spray_total, spray_total * NOZZLE_FLOW_ML_PER_S
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Spray Clustering")
+
+    test_targets = [
+        (10, 10), (11, 10), (12, 11), (11, 12),
+        (100, 50), (101, 51),
+        (200, 200)
+    ]
+
+    patches = plan_patches(test_targets)
+
+    for idx, patch in enumerate(patches):
+        print(
+            f"[PATCH {idx + 1}] {len(patch.cells)} cell(s) "
+            f"{patch.duration:.2f} s {patch.volume_ml:.2f} ml"
+        )
+
+    sweep_time = sum(patch.duration for patch in patches)
+    sweep_volume = sum(patch.volume_ml for patch in patches)
+    base_time, base_volume = baseline_estimate(schedule_targets(test_targets))
+
+    print(f"\nSweep:    {sweep_time:.2f} s {sweep_volume:.2f} ml")
+    print(f"Per-cell: {base_time:.2f} s {base_volume:.2f} ml")
+
+    print("\n[DONE] Clustering test complete")
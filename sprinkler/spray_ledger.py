@@ -0,0 +1,228 @@
+"""
+FarmX - Spray Ledger
+Author: Parth Vishwakarma
+
+Purpose:
+- Remember which field cells have already been sprayed during a mission
+- Filter each new frame's targets against it before actuation
+- Persist incrementally to disk so a restarted mission does not re-spray
+- Claim a queued frame's cells until its spraying succeeds or fails, so
+  overlapping frames waiting in the actuation queue are not sprayed twice
+"""
+
+import os
+import threading
+from collections import Counter
+from typing import Optional, Tuple
+
+import numpy as np
+
+from drone_logic.georeference import GRID_SIZE, HOVER_ALTITUDE, camera_footprint, cells_to_field
+
+# =========================
+# CONFIG
+# =========================
+LEDGER_CELL_M = 0.02        # field cell size (≈ spray spot diameter)
+LEDGER_PATH = "ai_model/inference/spray_ledger.bin"
+
+_KEY_OFFSET = 1 << 31       # shifts signed cell indexes into uint32 range
+
+# =========================
+# FIELD CELL KEYS
+# =========================
+def field_keys(field_xy: np.ndarray, cell_size_m: float = LEDGER_CELL_M) -> np.ndarray:
+    """
+    Packs (N, 2) field positions (east, north meters) into int64 cell keys.
+    """
+
+    field_xy = np.asarray(field_xy, dtype=np.float64).reshape(-1, 2)
+    idx = np.floor(field_xy / cell_size_m).astype(np.int64) + _KEY_OFFSET
+
+    return (idx[:, 0] << 32) | idx[:, 1]
+
+# =========================
+# LEDGER
+# =========================
+class SprayLedger:
+    """
+    Sorted array of sprayed field-cell keys, backed by an append-only file.
+
+    Each mark() appends only the new keys (8 bytes each) to the file, so
+    saving stays cheap during a mission and a restart just reloads it.
+
+    Cells claimed by a queued (not yet sprayed) frame count as sprayed for
+    later frames until release(). Thread-safe: the actuation worker marks
+    while the mission thread filters.
+    """
+
+    def __init__(self, path: Optional[str] = LEDGER_PATH, cell_size_m: float = LEDGER_CELL_M):
+        self.path = path
+        self.cell_size_m = cell_size_m
+        self.lock = threading.Lock()
+        self._keys = np.empty(0, dtype=np.int64)
+        self._claimed: Counter = Counter()
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ---- persistence ----
+    def _load(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        # A crash mid-append can leave a partial trailing record
+        raw = np.frombuffer(data[:len(data) // 8 * 8], dtype="<i8")
+        self._keys = np.unique(raw.astype(np.int64))
+        print(f"[INFO] Spray ledger loaded: {len(self._keys)} sprayed cell(s)")
+
+    def _append(self, keys: np.ndarray):
+        if not self.path:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(keys.astype("<i8").tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ---- queries ----
+    def _contains_keys(self, keys: np.ndarray) -> np.ndarray:
+        sprayed = self._keys
+        if len(sprayed) == 0:
+            found = np.zeros(len(keys), dtype=bool)
+        else:
+            pos = np.searchsorted(sprayed, keys)
+            pos[pos == len(sprayed)] = 0
+            found = sprayed[pos] == keys
+
+        if self._claimed:
+            found |= np.fromiter((k in self._claimed for k in keys.tolist()), dtype=bool, count=len(keys))
+        return found
+
+    def contains(self, field_xy: np.ndarray) -> np.ndarray:
+        """
+        Bool mask: True where the field position is already sprayed
+        (or claimed by a frame still waiting to be sprayed).
+        """
+
+        keys = field_keys(field_xy, self.cell_size_m)
+        with self.lock:
+            return self._contains_keys(keys)
+
+    def mark(self, field_xy: np.ndarray) -> int:
+        """
+        Records field positions as sprayed. Returns the number of new cells.
+        """
+
+        keys = np.unique(field_keys(field_xy, self.cell_size_m))
+        with self.lock:
+            new = keys[~np.isin(keys, self._keys, assume_unique=True)]
+
+            if len(new):
+                self._keys = np.union1d(self._keys, new)
+                self._append(new)
+
+        return len(new)
+
+    def claim(self, field_xy: np.ndarray) -> np.ndarray:
+        """
+        Atomically keeps the positions not yet sprayed or claimed and claims
+        them. Returns the keep mask; release() the kept positions once the
+        frame has been sprayed (after mark()) or abandoned.
+        """
+
+        keys = field_keys(field_xy, self.cell_size_m)
+        with self.lock:
+            keep = ~self._contains_keys(keys)
+            # A cell can repeat within one frame: claim and spray it once
+            _, first = np.unique(keys, return_index=True)
+            unique = np.zeros(len(keys), dtype=bool)
+            unique[first] = True
+            keep &= unique
+            self._claimed.update(keys[keep].tolist())
+        return keep
+
+    def release(self, field_xy: np.ndarray):
+        """
+        Drops the claim on positions returned by claim().
+        """
+
+        keys = field_keys(field_xy, self.cell_size_m)
+        with self.lock:
+            self._claimed.subtract(keys.tolist())
+            self._claimed += Counter()      # drop keys whose count reached zero
+
+    def compact(self):
+        """
+        Rewrites the file without duplicate keys (e.g. after a crash mid-write).
+        """
+
+        if not self.path:
+            return
+
+        tmp = self.path + ".tmp"
+        with self.lock:
+            self._keys.astype("<i8").tofile(tmp)
+        os.replace(tmp, self.path)
+
+    # ---- per-frame helpers ----
+    def filter_frame(
+        self,
+        cells: np.ndarray,
+        center_local: Tuple[float, float],
+        altitude_m: float = HOVER_ALTITUDE,
+        heading_deg: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Drops frame cells already sprayed from an earlier (overlapping) frame.
+        Returns (remaining cells, their field positions).
+        """
+
+        cells = np.asarray(cells).reshape(-1, 2)
+        field_xy = cells_to_field(cells, center_local, altitude_m, heading_deg)
+
+        keep = ~self.contains(field_xy)
+        return cells[keep], field_xy[keep]
+
+    def claim_frame(
+        self,
+        cells: np.ndarray,
+        center_local: Tuple[float, float],
+        altitude_m: float = HOVER_ALTITUDE,
+        heading_deg: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        filter_frame for a frame queued for later spraying: the remaining
+        cells are claimed. Returns (keep mask, field positions of the kept
+        cells); mark() and release() those positions once sprayed.
+        """
+
+        cells = np.asarray(cells).reshape(-1, 2)
+        field_xy = cells_to_field(cells, center_local, altitude_m, heading_deg)
+
+        keep = self.claim(field_xy)
+        return keep, field_xy[keep]
+
+# =========================
+# TEST RUN
+# =========================
+if __name__ == "__main__":
+    print("[TEST] Spray Ledger")
+
+    ledger = SprayLedger(path=None)
+
+    frame_a = np.array([(120, 80), (121, 80), (200, 140)])
+    remaining, field_xy = ledger.filter_frame(frame_a, (0.0, 0.0))
+    ledger.mark(field_xy)
+    print(f"Frame A: {len(remaining)} to spray")
+
+    # Next waypoint 0.3 m east: the same weeds appear 0.3 m further left
+    shift = round(0.3 / camera_footprint()[0] * GRID_SIZE)
+    frame_b = frame_a - np.array([shift, 0])
+    remaining, field_xy = ledger.filter_frame(frame_b, (0.3, 0.0))
+    print(f"Frame B: {len(remaining)} to spray (rest already sprayed)")
+
+    print("[DONE] Ledger test complete")
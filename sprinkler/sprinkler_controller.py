@@ -6,24 +6,34 @@ Purpose:
 - High-level control of herbicide spraying
 - Uses servo logic to aim nozzle
 - Handles safety, timing, and multi-target spraying
+- Orders targets for minimum servo travel
+- Sweeps clusters of adjacent weed cells with spray kept ON
+- Non-blocking hand-off to a background actuation engine
+- Skips field cells already sprayed from an overlapping frame
+- Per-cell spray time (dose) for different weed classes
 """
 
-import time
-from typing import List, Tuple
+from concurrent.futures import Future
+from functools import partial
+from typing import List, Optional, Sequence, Tuple, Union
 
-from sprinkler.servo_logic import (
-    grid_to_servo_angles,
-    move_servo,
-    spray_on,
-    spray_off
-)
+import numpy as np
+
+from sprinkler.actuation_engine import ActuationEngine
+from sprinkler.actuators import ActuatorBackend, ServoBackend
+from sprinkler.servo_logic import grid_to_servo_angles
+from sprinkler.spray_clustering import SWEEP_DWELL_PER_CELL, SprayPatch, final_dwell, plan_patches
+from sprinkler.spray_ledger import SprayLedger
+from sprinkler.target_scheduler import move_time, schedule_targets, slew_time
 
 # =========================
 # CONFIG
 # =========================
-SPRAY_DELAY = 0.2        # delay after servo movement
 SPRAY_DURATION = 0.4     # seconds per weed
 MAX_TARGETS_PER_HOVER = 20
+SWEEP_MODE = True        # spray clusters of adjacent cells in one pass
+
+DEFAULT_BACKEND = ServoBackend()
 
 # =========================
 # SAFETY CHECKS
@@ -46,53 +56,235 @@ def safety_check(targets: List[Tuple[int, int]]) -> bool:
 # =========================
 # SINGLE TARGET SPRAY
 # =========================
-def spray_target(grid_x: int, grid_y: int):
+def spray_target(
+    grid_x: int,
+    grid_y: int,
+    from_angles: Optional[Tuple[float, float]] = None,
+    backend: ActuatorBackend = DEFAULT_BACKEND,
+    spray_time: float = SPRAY_DURATION
+) -> Tuple[float, float]:
     """
     Spray herbicide at a single grid coordinate.
+    Waits only as long as the servos need to travel from `from_angles`
+    (default: the backend's last commanded pose).
+    Returns the new servo angles.
     """
 
+    from_angles = backend.pose if from_angles is None else from_angles
     pan, tilt = grid_to_servo_angles(grid_x, grid_y)
 
     print(f"[TARGET] Grid ({grid_x},{grid_y}) → Servo ({pan}°, {tilt}°)")
 
-    move_servo(pan, tilt)
-    time.sleep(SPRAY_DELAY)
+    backend.move_servo(pan, tilt)
+    backend.wait(move_time(from_angles, (pan, tilt)))
 
-    spray_on()
-    time.sleep(SPRAY_DURATION)
-    spray_off()
+    backend.spray_on()
+    try:
+        backend.wait(spray_time)
+    finally:
+        backend.spray_off()
+
+    return pan, tilt
+
+# =========================
+# PATCH SWEEP
+# =========================
+def spray_patch(
+    patch: SprayPatch,
+    from_angles: Optional[Tuple[float, float]] = None,
+    backend: ActuatorBackend = DEFAULT_BACKEND
+) -> Tuple[float, float]:
+    """
+    Sweep the nozzle over all cells of a patch with spray kept ON.
+    The patch's per-cell dose scales each dwell. The first move is timed from
+    `from_angles` (default: the backend's last commanded pose).
+    Returns the final servo angles.
+    """
+
+    from_angles = backend.pose if from_angles is None else from_angles
+    cells = patch.cells.tolist()
+    print(f"[PATCH] {len(cells)} cell(s) from Grid ({cells[0][0]},{cells[0][1]})")
+
+    pan, tilt = grid_to_servo_angles(*cells[0])
+    backend.move_servo(pan, tilt)
+    backend.wait(move_time(from_angles, (pan, tilt)))
+
+    dose = patch.dose.tolist()
+
+    backend.spray_on()
+    try:
+        # Dwell on each cell (its own dose) before moving to the next
+        for (x, y), cell_dose in zip(cells[1:], dose):
+            previous = (pan, tilt)
+            pan, tilt = grid_to_servo_angles(x, y)
+            backend.move_servo(pan, tilt)
+            backend.wait(max(slew_time(previous, (pan, tilt)), SWEEP_DWELL_PER_CELL * cell_dose))
+
+        backend.wait(final_dwell(len(cells), dose[-1]))
+    finally:
+        backend.spray_off()
+
+    return pan, tilt
 
 # =========================
 # MULTI-TARGET HANDLER
 # =========================
-def spray_targets(targets: List[Tuple[int, int]]):
+def spray_targets(
+    targets: List[Tuple[int, int]],
+    backend: ActuatorBackend = DEFAULT_BACKEND,
+    spray_time: Union[float, Sequence[float]] = SPRAY_DURATION
+) -> List[SprayPatch]:
     """
-    Spray all detected weed targets in sequence.
+    Spray all detected weed targets, ordered for minimum servo travel.
+    In SWEEP_MODE adjacent cells are merged into patches; the planned
+    patches (with timing and volume estimates) are returned.
+    `spray_time` is the per-weed time, one value or one per target
+    (weed classes with different doses share one tour); sweep dwells
+    scale with it.
     """
 
     if not safety_check(targets):
-        return
+        return []
 
     print(f"[INFO] Spraying {len(targets)} target(s)")
 
-    for idx, (x, y) in enumerate(targets):
-        print(f"\n[SPRAY {idx + 1}/{len(targets)}]")
-        spray_target(x, y)
+    # The servos are still where the previous job left them
+    angles = backend.pose
+    spray_time = np.broadcast_to(np.asarray(spray_time, dtype=np.float64), len(targets))
+
+    if SWEEP_MODE:
+        patches = plan_patches(targets, start_angles=angles, dose=spray_time / SPRAY_DURATION)
+
+        for idx, patch in enumerate(patches):
+            print(
+                f"\n[SPRAY {idx + 1}/{len(patches)}] "
+                f"est. {patch.duration:.2f} s, {patch.volume_ml:.2f} ml"
+            )
+            angles = spray_patch(patch, from_angles=angles, backend=backend)
+
+        print("\n[INFO] Spraying complete for this hover cycle")
+        return patches
+
+    times = {}
+    for cell, seconds in zip(map(tuple, targets), spray_time.tolist()):
+        times[cell] = max(seconds, times.get(cell, 0.0))
+
+    ordered = schedule_targets(targets, start_angles=angles)
+
+    for idx, (x, y) in enumerate(ordered):
+        print(f"\n[SPRAY {idx + 1}/{len(ordered)}]")
+        angles = spray_target(x, y, from_angles=angles, backend=backend, spray_time=times[(x, y)])
 
     print("\n[INFO] Spraying complete for this hover cycle")
+    return []
 
 # =========================
 # MISSION HOOK
 # =========================
-def execute_sprinkler_cycle(weed_coordinates: List[Tuple[int, int]]):
+def execute_sprinkler_cycle(
+    weed_coordinates: List[Tuple[int, int]],
+    ledger: Optional[SprayLedger] = None,
+    center_local: Optional[Tuple[float, float]] = None
+):
     """
     Entry point called from mission loop.
+
+    With a ledger and the frame center in field coordinates, cells already
+    sprayed from an overlapping frame are skipped and the newly sprayed
+    ones are recorded.
     """
 
     print("[START] Sprinkler cycle")
-    spray_targets(weed_coordinates)
+
+    if ledger is not None and center_local is not None:
+        cells, field_xy = ledger.filter_frame(weed_coordinates, center_local)
+        skipped = len(weed_coordinates) - len(cells)
+        if skipped:
+            print(f"[INFO] Skipping {skipped} already sprayed cell(s)")
+
+        spray_targets([tuple(cell) for cell in cells.tolist()])
+        ledger.mark(field_xy)
+    else:
+        spray_targets(weed_coordinates)
+
     print("[END] Sprinkler cycle")
 
+# =========================
+# NON-BLOCKING HAND-OFF
+# =========================
+_engine: Optional[ActuationEngine] = None
+
+
+def get_engine(backend: ActuatorBackend = DEFAULT_BACKEND) -> ActuationEngine:
+    """
+    Shared background actuation engine (started on first use).
+    """
+
+    global _engine
+    if _engine is None:
+        _engine = ActuationEngine(spray_targets, backend).start()
+    return _engine
+
+
+def _settle_claim(ledger: SprayLedger, field_xy: np.ndarray, future: Future):
+    """
+    Records a frame's cells once its job succeeded, then drops the claim.
+    """
+    try:
+        if not future.cancelled() and future.exception() is None:
+            ledger.mark(field_xy)
+    finally:
+        ledger.release(field_xy)
+
+
+def send_to_sprinkler(
+    targets: List[Tuple[int, int]],
+    spray_time: Union[float, Sequence[float]] = SPRAY_DURATION,
+    ledger: Optional[SprayLedger] = None,
+    center_local: Optional[Tuple[float, float]] = None,
+    heading_deg: float = 0.0
+) -> Future:
+    """
+    Queues one frame's targets and returns immediately, so detection of
+    the next frame overlaps with spraying this one. Blocks only when the
+    engine's queue is full; raises if an earlier frame's spraying failed.
+
+    With a ledger and the frame center in field coordinates, cells already
+    sprayed (or queued) from an overlapping frame are dropped; the rest
+    are recorded in the ledger once this frame's job succeeds.
+    """
+
+    if ledger is None or center_local is None:
+        return get_engine().submit(targets, spray_time=spray_time)
+
+    cells = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+    spray_time = np.broadcast_to(np.asarray(spray_time, dtype=np.float64), len(cells))
+
+    keep, field_xy = ledger.claim_frame(cells, center_local, heading_deg=heading_deg)
+    skipped = len(cells) - int(keep.sum())
+    if skipped:
+        print(f"[INFO] Skipping {skipped} already sprayed cell(s)")
+
+    try:
+        future = get_engine().submit(
+            [tuple(cell) for cell in cells[keep].tolist()], spray_time=spray_time[keep]
+        )
+    except BaseException:
+        ledger.release(field_xy)
+        raise
+
+    future.add_done_callback(partial(_settle_claim, ledger, field_xy))
+    return future
+
+
+def wait_for_sprinkler():
+    """
+    Blocks until every queued frame has been sprayed.
+    Raises the first spray / hardware failure of a queued frame.
+    """
+    if _engine is not None:
+        _engine.join()
+
 # =========================
 # TEST RUN
 # =========================
@@ -5,10 +5,13 @@ Author: Parth Vishwakarma
 Purpose:
 - Compensate spray target coordinates based on wind speed & direction
 - Improve spraying accuracy under light wind conditions
+- Compensate whole target arrays (or a per-target wind field) in one step
+- Update compensation from a live stream of wind readings
 """
 
-import math
-from typing import Tuple
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
 
 # =========================
 # CONFIG
@@ -19,6 +22,118 @@ GRID_SIZE = 256
 # Higher value = stronger compensation
 COMPENSATION_FACTOR = 0.8
 
+# Weight of the newest reading when smoothing a wind stream (0..1]
+WIND_SMOOTHING = 0.3
+
+# =========================
+# VECTORIZED WIND MODEL
+# =========================
+def wind_offsets(wind_speed_mps, wind_direction_deg) -> np.ndarray:
+    """
+    Grid-cell drift offsets for scalar wind or a per-target wind field.
+    Returns shape (2,) for scalars, (N, 2) for (N,) speed/direction arrays.
+
+    wind_direction_deg:
+    - Direction FROM which wind is coming (meteorological standard)
+    - 0° = North, 90° = East
+    """
+
+    theta = np.radians(wind_direction_deg)
+    offset = np.asarray(wind_speed_mps, dtype=np.float64) * COMPENSATION_FACTOR
+
+    return np.stack([offset * np.sin(theta), offset * np.cos(theta)], axis=-1)
+
+
+def apply_offsets(
+    targets: np.ndarray,
+    offsets: np.ndarray,
+    subcell: bool = False
+) -> np.ndarray:
+    """
+    Shifts targets against the drift and clamps them to the grid.
+
+    subcell=False truncates to int cells (original behaviour);
+    subcell=True keeps float positions inside the grid.
+    """
+
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+    compensated = targets - offsets
+
+    if not subcell:
+        compensated = np.trunc(compensated)
+
+    np.clip(compensated, 0, GRID_SIZE - 1, out=compensated)
+
+    return compensated if subcell else compensated.astype(np.int32)
+
+
+def compensate_targets(
+    targets: np.ndarray,
+    wind_speed_mps,
+    wind_direction_deg,
+    subcell: bool = False
+) -> np.ndarray:
+    """
+    Compensates an (N, 2) target array in one NumPy operation.
+    Wind may be a single reading or (N,) arrays (per-target wind field).
+    """
+    return apply_offsets(targets, wind_offsets(wind_speed_mps, wind_direction_deg), subcell)
+
+# =========================
+# STREAMING COMPENSATION
+# =========================
+class WindCompensator:
+    """
+    Keeps a hover's targets and re-compensates them as wind readings arrive.
+
+    Readings are smoothed as wind vectors (not angles, which wrap at 360°)
+    with an exponential moving average.
+    """
+
+    def __init__(
+        self,
+        targets: np.ndarray,
+        smoothing: float = WIND_SMOOTHING,
+        subcell: bool = False
+    ):
+        self.targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+        self.smoothing = smoothing
+        self.subcell = subcell
+        self.offsets: Optional[np.ndarray] = None
+
+    def update(self, wind_speed_mps: float, wind_direction_deg: float) -> np.ndarray:
+        """
+        Adds one wind reading and returns the newly compensated targets.
+        """
+
+        reading = wind_offsets(wind_speed_mps, wind_direction_deg)
+
+        if self.offsets is None:
+            self.offsets = reading
+        else:
+            self.offsets = self.offsets + self.smoothing * (reading - self.offsets)
+
+        return self.current()
+
+    def current(self) -> np.ndarray:
+        offsets = self.offsets if self.offsets is not None else np.zeros(2)
+        return apply_offsets(self.targets, offsets, self.subcell)
+
+
+def stream_compensation(
+    targets: np.ndarray,
+    readings: Iterable[Tuple[float, float]],
+    smoothing: float = WIND_SMOOTHING,
+    subcell: bool = False
+) -> Iterator[np.ndarray]:
+    """
+    Yields compensated targets for each (speed, direction) wind reading.
+    """
+
+    compensator = WindCompensator(targets, smoothing, subcell)
+    for wind_speed, wind_direction in readings:
+        yield compensator.update(wind_speed, wind_direction)
+
 # =========================
 # WIND MODEL
 # =========================
@@ -36,25 +151,11 @@ def compensate_coordinates(
     - 0° = North, 90° = East
     """
 
-    # Convert direction to radians
-    theta = math.radians(wind_direction_deg)
-
-    # Calculate offset magnitude (scaled)
-    offset = wind_speed_mps * COMPENSATION_FACTOR
+    compensated_x, compensated_y = compensate_targets(
+        [(grid_x, grid_y)], wind_speed_mps, wind_direction_deg
+    )[0]
 
-    # Decompose into x & y components
-    offset_x = offset * math.sin(theta)
-    offset_y = offset * math.cos(theta)
-
-    # Apply inverse offset (spray against wind)
-    compensated_x = int(grid_x - offset_x)
-    compensated_y = int(grid_y - offset_y)
-
-    # Clamp to grid bounds
-    compensated_x = max(0, min(GRID_SIZE - 1, compensated_x))
-    compensated_y = max(0, min(GRID_SIZE - 1, compensated_y))
-
-    return compensated_x, compensated_y
+    return int(compensated_x), int(compensated_y)
 
 # =========================
 # BATCH HANDLER
@@ -68,15 +169,9 @@ def compensate_multiple_targets(
     Applies wind compensation to multiple spray targets.
     """
 
-    compensated_targets = []
+    compensated = compensate_targets(targets, wind_speed_mps, wind_direction_deg)
 
-    for x, y in targets:
-        cx, cy = compensate_coordinates(
-            x, y, wind_speed_mps, wind_direction_deg
-        )
-        compensated_targets.append((cx, cy))
-
-    return compensated_targets
+    return [tuple(target) for target in compensated.tolist()]
 
 # =========================
 # TEST RUN
@@ -97,4 +192,8 @@ if __name__ == "__main__":
     print("Original Targets:     ", original_targets)
     print("Compensated Targets:  ", compensated)
 
+    readings = [(3.0, 90.0), (4.0, 100.0), (2.0, 80.0)]
+    for idx, live in enumerate(stream_compensation(original_targets, readings, subcell=True)):
+        print(f"Live update {idx + 1}:      ", np.round(live, 2).tolist())
+
     print("\n[DONE] Wind compensation test complete")